@@ -9,6 +9,11 @@ from app.models.users import User
 from app.models.questions import Question
 from app.models.answers import Answer
 from app.models.responses import Response
+from app.models.user_scores import UserCategoryScore
+from app.models.daily_stats import DailyUserCategoryStat
+from app.models.catalog_version import CatalogVersion
+from app.models.exam_sessions import ExamSession
+from app.models.user_mastery import UserMastery
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -0,0 +1,45 @@
+"""add exam_sessions with packed question and answer arrays
+
+Revision ID: 2f7a9c1d4e68
+Revises: 5b0c3e9d7f12
+Create Date: 2026-10-19 17:52:08.319027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f7a9c1d4e68'
+down_revision: Union[str, Sequence[str], None] = '5b0c3e9d7f12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('exam_sessions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=False),
+    sa.Column('question_set', sa.String(length=100), nullable=True),
+    sa.Column('attempt', sa.Integer(), nullable=False),
+    sa.Column('question_ids', sa.LargeBinary(), nullable=False),
+    sa.Column('selected_ids', sa.LargeBinary(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('answered', sa.Integer(), nullable=True),
+    sa.Column('correct', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_exam_sessions_user_set', 'exam_sessions', ['user_id', 'category', 'question_set'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_exam_sessions_user_set', table_name='exam_sessions')
+    op.drop_table('exam_sessions')
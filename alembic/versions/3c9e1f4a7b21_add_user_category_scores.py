@@ -0,0 +1,48 @@
+"""add user_category_scores rollup for leaderboards
+
+Revision ID: 3c9e1f4a7b21
+Revises: bfcb0e742b83
+Create Date: 2026-10-19 09:12:04.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1f4a7b21'
+down_revision: Union[str, Sequence[str], None] = 'bfcb0e742b83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_category_scores',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=False),
+    sa.Column('answered', sa.Integer(), nullable=False),
+    sa.Column('correct', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'category')
+    )
+
+    # Backfill the rollup from the existing response history
+    op.execute("""
+        INSERT INTO user_category_scores (user_id, category, answered, correct)
+        SELECT r.user_id,
+               COALESCE(q.category, ''),
+               COUNT(*),
+               SUM(CASE WHEN r.is_correct THEN 1 ELSE 0 END)
+        FROM responses r
+        JOIN questions q ON q.id = r.question_id
+        GROUP BY r.user_id, COALESCE(q.category, '')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_category_scores')
@@ -0,0 +1,32 @@
+"""drop responses (user_id, question_id, answered_at) index
+
+Revision ID: 4a7c2e9b1d03
+Revises: 8e4f1a6b2c57
+Create Date: 2026-10-19 11:20:41.502917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a7c2e9b1d03'
+down_revision: Union[str, Sequence[str], None] = '8e4f1a6b2c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The unanswered/incorrect catalog filters read the user_mastery bitsets now;
+    # nothing else used this index, and every response insert paid for it on each partition
+    op.drop_index('ix_responses_user_question', table_name='responses')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_responses_user_question', 'responses', ['user_id', 'question_id', 'answered_at'],
+        unique=False, postgresql_include=['is_correct']
+    )
@@ -0,0 +1,70 @@
+"""add catalog_version counter and bump triggers
+
+Revision ID: 5b0c3e9d7f12
+Revises: e4a81f6c2d37
+Create Date: 2026-10-19 16:40:52.731145
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b0c3e9d7f12'
+down_revision: Union[str, Sequence[str], None] = 'e4a81f6c2d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('questions', 'answers')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('catalog_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO catalog_version (id, version) VALUES (1, 1)")
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # One bump (and one NOTIFY, delivered at commit) per statement that touches the catalog
+        op.execute("""
+            CREATE OR REPLACE FUNCTION catalog_version_bump() RETURNS trigger LANGUAGE plpgsql AS $$
+            DECLARE new_version bigint;
+            BEGIN
+                UPDATE catalog_version SET version = version + 1, updated_at = now() WHERE id = 1
+                RETURNING version INTO new_version;
+                PERFORM pg_notify('catalog_version', new_version::text);
+                RETURN NULL;
+            END
+            $$
+        """)
+        for table in TABLES:
+            op.execute(
+                f"CREATE TRIGGER {table}_catalog_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+                "FOR EACH STATEMENT EXECUTE FUNCTION catalog_version_bump()"
+            )
+    elif op.get_bind().dialect.name == 'sqlite':
+        for table in TABLES:
+            for operation in ('INSERT', 'UPDATE', 'DELETE'):
+                op.execute(
+                    f"CREATE TRIGGER {table}_catalog_version_{operation.lower()} AFTER {operation} ON {table} "
+                    "BEGIN UPDATE catalog_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1; END"
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        for table in TABLES:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_catalog_version ON {table}")
+        op.execute("DROP FUNCTION IF EXISTS catalog_version_bump()")
+    elif op.get_bind().dialect.name == 'sqlite':
+        for table in TABLES:
+            for operation in ('insert', 'update', 'delete'):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_catalog_version_{operation}")
+    op.drop_table('catalog_version')
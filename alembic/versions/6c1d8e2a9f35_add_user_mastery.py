@@ -0,0 +1,98 @@
+"""add user_mastery bitsets
+
+Revision ID: 6c1d8e2a9f35
+Revises: 2f7a9c1d4e68
+Create Date: 2026-10-19 18:37:44.905163
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1d8e2a9f35'
+down_revision: Union[str, Sequence[str], None] = '2f7a9c1d4e68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Question ids at or above this are not tracked (MASTERY_MAX_ORDINAL's default)
+MAX_ORDINAL = 1 << 22
+BATCH_SIZE = 1000
+
+
+def _set_bit(buffer: bytearray, n: int, value: bool):
+    if n >= len(buffer) * 8:
+        if not value:
+            return
+        buffer.extend(bytes(n // 8 + 1 - len(buffer)))
+    if value:
+        buffer[n >> 3] |= 1 << (n & 7)
+    else:
+        buffer[n >> 3] &= ~(1 << (n & 7)) & 0xFF
+
+
+def _backfill(conn):
+    """
+    Build every user's bitsets from their responses, oldest first, the way
+    app.services.mastery_service records answers (kept here so later changes
+    to the app do not change what this revision writes).
+    """
+    user_mastery = sa.table(
+        'user_mastery',
+        sa.column('user_id', sa.Integer()),
+        sa.column('answered', sa.LargeBinary()),
+        sa.column('correct', sa.LargeBinary()),
+        sa.column('updated_at', sa.DateTime()),
+    )
+    rows = conn.execution_options(stream_results=True, yield_per=10000).execute(sa.text(
+        "SELECT user_id, question_id, is_correct FROM responses ORDER BY user_id, answered_at, id"
+    ))
+    insert = user_mastery.insert().values(updated_at=sa.func.now())
+    batch = []
+    current, answered, correct = None, bytearray(), bytearray()
+
+    def flush_user():
+        if current is not None:
+            batch.append({
+                'user_id': current, 'answered': bytes(answered).rstrip(b"\0"),
+                'correct': bytes(correct).rstrip(b"\0")
+            })
+
+    for user_id, question_id, is_correct in rows:
+        if user_id != current:
+            flush_user()
+            if len(batch) >= BATCH_SIZE:
+                conn.execute(insert, batch)
+                batch = []
+            current, answered, correct = user_id, bytearray(), bytearray()
+        if 0 <= question_id < MAX_ORDINAL:
+            _set_bit(answered, question_id, True)
+            _set_bit(correct, question_id, bool(is_correct))
+    flush_user()
+    if batch:
+        conn.execute(insert, batch)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_mastery',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('answered', sa.LargeBinary(), nullable=False),
+    sa.Column('correct', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Backfill from the existing response history: the app reads a missing row as "nothing answered"
+    if context.is_offline_mode():
+        op.execute("-- user_mastery is backfilled from responses only when migrating on a live connection")
+    else:
+        _backfill(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_mastery')
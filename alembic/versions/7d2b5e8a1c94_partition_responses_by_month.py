@@ -0,0 +1,124 @@
+"""partition responses by month of answered_at
+
+Revision ID: 7d2b5e8a1c94
+Revises: 3c9e1f4a7b21
+Create Date: 2026-10-19 14:02:37.512904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2b5e8a1c94'
+down_revision: Union[str, Sequence[str], None] = '3c9e1f4a7b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly partitions created ahead of the current month
+MONTHS_AHEAD = 3
+
+# Creates the monthly partitions from `from_month` through `months_ahead` months
+# past the current one. Rows that already landed in responses_default for a new
+# month are moved into it before it is attached, so ATTACH never conflicts.
+ENSURE_PARTITIONS = """
+CREATE OR REPLACE FUNCTION responses_ensure_partitions(from_month date, months_ahead integer)
+RETURNS integer LANGUAGE plpgsql AS $$
+DECLARE
+    month date := date_trunc('month', from_month)::date;
+    last_month date := (date_trunc('month', now()) + make_interval(months => months_ahead))::date;
+    next_month date;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    WHILE month <= last_month LOOP
+        next_month := (month + interval '1 month')::date;
+        partition_name := 'responses_' || to_char(month, 'YYYY_MM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format('CREATE TABLE %I (LIKE responses INCLUDING DEFAULTS)', partition_name);
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM responses_default WHERE answered_at >= %L AND answered_at < %L RETURNING *) '
+                'INSERT INTO %I SELECT * FROM moved',
+                month, next_month, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE responses ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, month, next_month
+            );
+            created := created + 1;
+        END IF;
+        month := next_month;
+    END LOOP;
+    RETURN created;
+END
+$$
+"""
+
+
+def _swap_in(new_table_sql: str) -> None:
+    """Move `responses` aside as responses_old and create its replacement with `new_table_sql`."""
+    # created_at was dropped in bfcb0e742b83; rows that never got answered_at are stamped now
+    op.execute("UPDATE responses SET answered_at = now() WHERE answered_at IS NULL")
+    op.rename_table('responses', 'responses_old')
+    op.execute(new_table_sql)
+
+
+def _finish_swap(primary_key: str) -> None:
+    """Copy the rows over, drop the old table (keeping its id sequence) and recreate keys and indexes."""
+    op.execute("INSERT INTO responses SELECT * FROM responses_old")
+    op.execute("""
+        DO $$
+        BEGIN
+            EXECUTE format('ALTER SEQUENCE %s OWNED BY responses.id', pg_get_serial_sequence('responses_old', 'id'));
+        END
+        $$
+    """)
+    op.drop_table('responses_old')
+    # Added to a partitioned table, keys and indexes cascade to every partition, including future ones
+    op.execute(f"ALTER TABLE responses ADD CONSTRAINT responses_pkey PRIMARY KEY ({primary_key})")
+    # Same keys as bfcb0e742b83 created (no ON DELETE), so responses are never deleted implicitly
+    op.create_foreign_key('responses_user_id_fkey', 'responses', 'users', ['user_id'], ['id'])
+    op.create_foreign_key('responses_question_id_fkey', 'responses', 'questions', ['question_id'], ['id'])
+    op.create_foreign_key('fk_responses_selected_option', 'responses', 'answers', ['selected_option_id'], ['id'])
+    op.create_index('ix_responses_id', 'responses', ['id'], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite and friends stay unpartitioned; the per-user index is all they get
+        op.create_index('ix_responses_user_answered', 'responses', ['user_id', 'answered_at'], unique=False)
+        return
+
+    # The partition key has to be part of the primary key and may not be NULL
+    _swap_in("""
+        CREATE TABLE responses (LIKE responses_old INCLUDING DEFAULTS)
+        PARTITION BY RANGE (answered_at)
+    """)
+    op.execute("ALTER TABLE responses ALTER COLUMN answered_at SET NOT NULL, ALTER COLUMN answered_at SET DEFAULT now()")
+    # Catches rows outside every monthly partition instead of failing the insert
+    op.execute("CREATE TABLE responses_default PARTITION OF responses DEFAULT")
+    op.execute(ENSURE_PARTITIONS)
+    op.execute(sa.text(
+        "SELECT responses_ensure_partitions(COALESCE((SELECT MIN(answered_at) FROM responses_old), now())::date, :ahead)"
+    ).bindparams(ahead=MONTHS_AHEAD))
+    _finish_swap("id, answered_at")
+    # Covers the dashboard aggregate, so each partition is read index-only
+    op.create_index(
+        'ix_responses_user_answered', 'responses', ['user_id', 'answered_at'],
+        unique=False, postgresql_include=['question_id', 'is_correct']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        op.drop_index('ix_responses_user_answered', table_name='responses')
+        return
+
+    _swap_in("CREATE TABLE responses (LIKE responses_old INCLUDING DEFAULTS)")
+    op.execute("ALTER TABLE responses ALTER COLUMN answered_at DROP NOT NULL, ALTER COLUMN answered_at DROP DEFAULT")
+    _finish_swap("id")
+    op.execute("DROP FUNCTION IF EXISTS responses_ensure_partitions(date, integer)")
@@ -0,0 +1,32 @@
+"""add responses (user_id, question_id, answered_at) index
+
+Revision ID: 8e4f1a6b2c57
+Revises: 6c1d8e2a9f35
+Create Date: 2026-10-19 19:52:10.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4f1a6b2c57'
+down_revision: Union[str, Sequence[str], None] = '6c1d8e2a9f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Backs the unanswered/incorrect catalog filters; on Postgres it cascades to every
+    # monthly partition and INCLUDE keeps the latest-answer lookup index-only
+    op.create_index(
+        'ix_responses_user_question', 'responses', ['user_id', 'question_id', 'answered_at'],
+        unique=False, postgresql_include=['is_correct']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_responses_user_question', table_name='responses')
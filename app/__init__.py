@@ -0,0 +1,10 @@
+# app/__init__.py
+import time
+
+# Start of the first `import app...`; app.main reports its import time from here
+IMPORT_STARTED = time.perf_counter()
+
+from app.settings import load_env  # noqa: E402
+
+# Read .env once, before any module picks up its os.getenv defaults
+load_env()
@@ -1,4 +1,6 @@
 # app/api/dependencies/auth.py
+import os
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -8,6 +10,15 @@ from app.services import auth_service
 from app.models.users import User
 
 security = HTTPBearer()
+# For routes that work anonymously and only need the user for some requests
+optional_security = HTTPBearer(auto_error=False)
+
+# Comma-separated list of emails allowed to use admin-only endpoints
+ADMIN_EMAILS = {
+    email.strip().lower()
+    for email in os.getenv("ADMIN_EMAILS", "").split(",")
+    if email.strip()
+}
 
 
 def get_current_user(
@@ -23,6 +34,22 @@ def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found.
     """
+    return user_from_credentials(credentials, db)
+
+
+def user_from_credentials(credentials: Optional[HTTPAuthorizationCredentials], db: Session) -> User:
+    """
+    Resolve bearer credentials to a User, raising 401 if they are missing or invalid.
+
+    Routes that accept anonymous requests take `optional_security` and call
+    this only when the request actually needs the user.
+    """
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     token = credentials.credentials
 
     # Decode the token
@@ -44,3 +71,24 @@ def get_current_user(
         )
 
     return user
+
+
+def is_admin(user: User) -> bool:
+    """Whether `user` is an administrator, i.e. their email is listed in ADMIN_EMAILS."""
+    return user.user_email.lower() in ADMIN_EMAILS
+
+
+def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """
+    Dependency to require an administrator (see is_admin).
+
+    Raises:
+        HTTPException: If the current user is not an administrator.
+    """
+    if not is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator privileges required",
+        )
+
+    return current_user
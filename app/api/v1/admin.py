@@ -0,0 +1,130 @@
+# app/api/v1/admin.py
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from app.api.dependencies.auth import get_current_admin
+from app.db import slow_query_log
+from app.schemas.admin import (
+    AllocationReport, MemorySummary, ProfilingArm, ProfilingStatus, SlowQueryLogOut,
+    SnapshotCreate, SnapshotInfo, TracemallocStart, TracemallocStatus
+)
+from app.utils import memory, profiling
+
+# Every admin route requires an administrator (see ADMIN_EMAILS)
+router = APIRouter(dependencies=[Depends(get_current_admin)])
+
+
+@router.get("/slow-queries", response_model=SlowQueryLogOut)
+def get_slow_queries(limit: int = Query(50, ge=1, le=1000)):
+    """
+    Get the most recent slow statements, newest first, with their route and query plan.
+
+    The plan is filled in by a background thread and may still be null for
+    the newest entries.
+    """
+    return {
+        'threshold_ms': slow_query_log.SLOW_QUERY_THRESHOLD_MS,
+        'entries': slow_query_log.slow_query_log.entries(limit)
+    }
+
+
+@router.delete("/slow-queries", status_code=204)
+def clear_slow_queries():
+    """Empty the slow-query ring buffer."""
+    slow_query_log.slow_query_log.clear()
+
+
+def _profiling_status():
+    return {
+        'header_enabled': bool(profiling.PROFILE_SECRET),
+        'sample_rate': profiling.PROFILE_SAMPLE_RATE,
+        'armed': profiling.control.armed(),
+        'files': profiling.store.list()
+    }
+
+
+@router.get("/profiles", response_model=ProfilingStatus)
+def get_profiling_status():
+    """Get the enabled profiling triggers and the stored profiles, newest first."""
+    return _profiling_status()
+
+
+@router.post("/profiles/arm", response_model=ProfilingStatus)
+def arm_profiling(request: ProfilingArm):
+    """
+    Profile the next `requests` requests whose path starts with `path_prefix`.
+
+    Arming a prefix with 0 requests disarms it.
+    """
+    profiling.control.arm(request.path_prefix, request.requests)
+    return _profiling_status()
+
+
+@router.get("/profiles/{name}")
+def download_profile(name: str):
+    """Download one collapsed-stack file (flamegraph.pl / speedscope input)."""
+    path = profiling.store.path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=name)
+
+
+@router.get("/memory", response_model=MemorySummary)
+def get_memory_summary():
+    """
+    Get this worker's RSS, gc generation stats, live ORM objects per model,
+    catalog cache size and tracemalloc state.
+    """
+    return memory.summary()
+
+
+@router.post("/memory/tracemalloc/start", response_model=TracemallocStatus)
+def start_tracemalloc(request: TracemallocStart):
+    """
+    Start tracemalloc with `frames` frames per allocation.
+
+    Tracing stops by itself after MEMORY_TRACE_MAX_SECONDS.
+    """
+    return memory.tracer.start(request.frames)
+
+
+@router.post("/memory/tracemalloc/stop", response_model=TracemallocStatus)
+def stop_tracemalloc():
+    """Stop tracemalloc; snapshots already taken are kept."""
+    return memory.tracer.stop()
+
+
+@router.post("/memory/snapshots", response_model=SnapshotInfo, status_code=201)
+def take_snapshot(request: SnapshotCreate):
+    """Take a tracemalloc snapshot (requires tracemalloc to be running)."""
+    try:
+        return memory.tracer.take_snapshot(request.label)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/memory/snapshots/{snapshot_id}", response_model=AllocationReport)
+def get_snapshot_top(
+    snapshot_id: int,
+    key_type: Literal["lineno", "filename", "traceback"] = "lineno",
+    limit: int = Query(25, ge=1, le=500)
+):
+    """Get the largest allocation sites of a snapshot."""
+    sites = memory.tracer.top(snapshot_id, key_type, limit)
+    if sites is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return {'key_type': key_type, 'sites': sites}
+
+
+@router.get("/memory/snapshots/{snapshot_id}/diff/{base_id}", response_model=AllocationReport)
+def get_snapshot_diff(
+    snapshot_id: int,
+    base_id: int,
+    key_type: Literal["lineno", "filename", "traceback"] = "lineno",
+    limit: int = Query(25, ge=1, le=500)
+):
+    """Get the allocation sites that changed most from snapshot `base_id` to `snapshot_id`."""
+    sites = memory.tracer.diff(base_id, snapshot_id, key_type, limit)
+    if sites is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return {'key_type': key_type, 'sites': sites}
@@ -4,11 +4,12 @@ from sqlalchemy.orm import Session
 from app.schemas.auth import RegisterRequest, LoginRequest, TokenResponse
 from app.services import auth_service
 from app.db.session import get_db
+from app.db.query_budget import QueryBudget
 
 router = APIRouter()
 
 
-@router.post("/register", response_model=TokenResponse, status_code=201)
+@router.post("/register", response_model=TokenResponse, status_code=201, dependencies=[Depends(QueryBudget(3))])
 def register(request: RegisterRequest, db: Session = Depends(get_db)):
     """
     Register a new user.
@@ -18,7 +19,7 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
     return auth_service.register_user(db, request)
 
 
-@router.post("/login", response_model=TokenResponse)
+@router.post("/login", response_model=TokenResponse, dependencies=[Depends(QueryBudget(1))])
 def login(request: LoginRequest, db: Session = Depends(get_db)):
     """
     Login with email and password.
@@ -0,0 +1,71 @@
+# app/api/v1/exam.py
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+from app.schemas.exam import ExamAnswer, ExamProgress, ExamResult, ExamSessionOut, ExamStart
+from app.services import exam_service
+from app.db.session import get_db
+from app.db.replicas import pin_to_primary
+from app.api.dependencies.auth import get_current_user
+from app.utils.serialization import fast_response
+from app.models.users import User
+from app.db.query_budget import QueryBudget
+
+router = APIRouter()
+
+# Sessions are read and written on the primary: resuming right after an answer must see it
+
+
+@router.post("/", response_model=ExamSessionOut, status_code=201, dependencies=[Depends(QueryBudget(5))])
+def start_exam(
+    data: ExamStart,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Start a new attempt at a question set.
+    Requires authentication.
+    """
+    return fast_response(ExamSessionOut, exam_service.start_session(db, current_user.id, data), status_code=201)
+
+
+@router.get("/{session_id}", response_model=ExamSessionOut, dependencies=[Depends(QueryBudget(2))])
+def resume_exam(
+    session_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a session's question order and the answers given so far.
+    Requires authentication.
+    """
+    return fast_response(ExamSessionOut, exam_service.get_session(db, current_user.id, session_id))
+
+
+@router.post("/{session_id}/answers", response_model=ExamProgress, dependencies=[Depends(QueryBudget(4))])
+def answer_question(
+    session_id: int,
+    answer: ExamAnswer,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Answer (or re-answer) one question of an open session.
+    Requires authentication.
+    """
+    return exam_service.record_answer(db, current_user.id, session_id, answer.question_id, answer.selected_option_id)
+
+
+# Scoring, the bulk response insert with its leaderboard rollups, and the session update
+@router.post("/{session_id}/finish", response_model=ExamResult, dependencies=[Depends(QueryBudget(13))])
+def finish_exam(
+    session_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Score the session and record its answers as responses.
+    Requires authentication.
+    """
+    pin_to_primary(request, current_user.user_email)
+    return exam_service.finish_session(db, current_user.id, session_id)
@@ -0,0 +1,37 @@
+# app/api/v1/leaderboard.py
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Literal
+from app.schemas.leaderboard import LeaderboardOut, UserRank
+from app.services import leaderboard_service
+from app.db.session import get_db
+from app.api.dependencies.auth import get_current_user
+from app.models.users import User
+from app.utils.serialization import fast_response
+from app.db.query_budget import QueryBudget
+
+router = APIRouter()
+
+
+@router.get("/", response_model=LeaderboardOut, dependencies=[Depends(QueryBudget(1))])
+def get_leaderboard(
+    category: str | None = None,
+    metric: Literal["correct", "accuracy"] = "correct",
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the top users globally, or within a category when one is given.
+
+    The accuracy board only lists users with the minimum number of attempts.
+    """
+    return fast_response(LeaderboardOut, leaderboard_service.get_leaderboard(db, category, metric, limit))
+
+
+@router.get("/me", response_model=UserRank, dependencies=[Depends(QueryBudget(1))])
+def get_my_rank(category: str | None = None, current_user: User = Depends(get_current_user)):
+    """
+    Get the current user's rank globally, or within a category when one is given.
+    Requires authentication.
+    """
+    return fast_response(UserRank, leaderboard_service.get_user_rank(current_user.id, category))
@@ -1,51 +1,202 @@
 # app/api/v1/question.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from typing import List
-from app.schemas.question import CategoryOut, CategoryWithSetsOut, QuestionWithAnswers
+from typing import FrozenSet, List, Literal, Optional
+from urllib.parse import parse_qs
+from app.repository.question_repo import OPTIONAL_FIELDS
+from app.schemas.question import (
+    CategoryOut, CategoryWithSetsOut, QuestionBatchOut, QuestionBatchRequest, QuestionExplanation,
+    QuestionWithAnswers, sparse_batch_type, sparse_question_type
+)
 from app.services import question_service
+from app.db.replicas import get_read_db
 from app.db.session import get_db
+from app.utils.payload_cache import catalog_cache
+from app.db.query_budget import QueryBudget
+from app.api.dependencies.auth import optional_security, user_from_credentials
+from app.utils.serialization import fast_response
 
 router = APIRouter()
 
+# Catalog routes are served from catalog_cache: each payload is validated,
+# serialized and compressed once, then reused until the entry expires.
+# Misses are filled from the primary (`get_db`, which only connects on a
+# miss): a lagging replica right after a catalog version bump would
+# otherwise cache pre-change data for a whole TTL.
+# Question lists filtered by the caller's progress (?filter=unanswered or
+# incorrect) are per-user: they need a bearer token and skip the cache, and
+# the user's answers are read from their mastery row on the primary, so a
+# submit through any worker shows up at once.
+# Question lists take ?fields=, a comma-separated subset of OPTIONAL_FIELDS
+# (explanation, is_correct, image_url) to send; the others are not even
+# selected. Each subset is cached separately.
 
-@router.get("/categories", response_model=List[CategoryOut])
-def get_categories(db: Session = Depends(get_db)):
+ProgressFilter = Literal["all", "unanswered", "incorrect"]
+
+
+def parse_fields(fields: Optional[str]) -> FrozenSet[str]:
+    """The optional fields named by ?fields= (all of them when it is absent)."""
+    if fields is None:
+        return OPTIONAL_FIELDS
+    names = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    unknown = names - OPTIONAL_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))} (choose from {', '.join(sorted(OPTIONAL_FIELDS))})"
+        )
+    return names
+
+
+def _with_fields(key: tuple, fields: FrozenSet[str]) -> tuple:
+    return key if fields >= OPTIONAL_FIELDS else key + (tuple(sorted(fields)),)
+
+
+def cache_key(path: str, query_string: bytes = b"") -> Optional[tuple]:
+    """catalog_cache key of a request below this router (e.g. `/by-category/AWS`, `fields=`), or None."""
+    query = parse_qs(query_string.decode("latin-1"), keep_blank_values=True)
+    if query.get("filter", ["all"])[-1] != "all":
+        return None
+    try:
+        fields = parse_fields(query["fields"][-1] if "fields" in query else None)
+    except HTTPException:
+        return None
+
+    parts = path.strip("/").split("/")
+    if parts in (["categories"], ["categories-with-sets"]):
+        return (parts[0],)
+    if len(parts) == 2 and parts[0] == "by-category":
+        return _with_fields(("by-category", parts[1]), fields)
+    if len(parts) == 4 and parts[0] == "by-category" and parts[2] == "set":
+        return _with_fields(("by-set", parts[1], parts[3]), fields)
+    if len(parts) == 2 and parts[1] == "explanation" and parts[0].isdigit():
+        return ("explanation", int(parts[0]))
+    return None
+
+
+def prime_catalog_cache(db: Session):
+    """Cache the category listings every client loads first (startup warmup)."""
+    catalog_cache.prime(("categories",), lambda: question_service.get_categories_with_counts(db), List[CategoryOut])
+    catalog_cache.prime(("categories-with-sets",), lambda: question_service.get_categories_with_sets(db), List[CategoryWithSetsOut])
+
+
+@router.get("/categories", response_model=List[CategoryOut], dependencies=[Depends(QueryBudget(1))])
+def get_categories(request: Request, db: Session = Depends(get_db)):
     """
     Get all unique question categories with their question counts.
     """
-    return question_service.get_categories_with_counts(db)
+    return catalog_cache.respond(
+        request,
+        ("categories",),
+        lambda: question_service.get_categories_with_counts(db),
+        List[CategoryOut]
+    )
 
 
-@router.get("/categories-with-sets", response_model=List[CategoryWithSetsOut])
-def get_categories_with_sets(db: Session = Depends(get_db)):
+@router.get("/categories-with-sets", response_model=List[CategoryWithSetsOut], dependencies=[Depends(QueryBudget(1))])
+def get_categories_with_sets(request: Request, db: Session = Depends(get_db)):
     """
     Get all categories with their question sets/dumps.
     """
-    return question_service.get_categories_with_sets(db)
+    return catalog_cache.respond(
+        request,
+        ("categories-with-sets",),
+        lambda: question_service.get_categories_with_sets(db),
+        List[CategoryWithSetsOut]
+    )
 
 
-@router.get("/by-category/{category}", response_model=List[QuestionWithAnswers])
-def get_questions_by_category(category: str, db: Session = Depends(get_db)):
+# Filtered requests also look up the user and read their mastery row on the primary
+@router.get("/by-category/{category}", response_model=List[QuestionWithAnswers], dependencies=[Depends(QueryBudget(4))])
+def get_questions_by_category(
+    category: str,
+    request: Request,
+    filter: ProgressFilter = "all",
+    fields: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: Session = Depends(get_read_db),
+    primary: Session = Depends(get_db)
+):
     """
     Get all questions with answers for a specific category.
+    With `filter=unanswered|incorrect`, only the questions the authenticated
+    user has not answered yet, or last answered wrong.
     """
-    questions = question_service.get_questions_by_category(db, category)
+    included = parse_fields(fields)
+    response_type = List[sparse_question_type(included)]
+    if filter != "all":
+        user = user_from_credentials(credentials, db)
+        questions = question_service.get_questions_by_category(db, category, user.id, filter, included, mastery_db=primary)
+        return fast_response(response_type, questions, trusted=False)
+
+    def load():
+        questions = question_service.get_questions_by_category(primary, category, fields=included)
 
-    if not questions:
-        raise HTTPException(status_code=404, detail=f"No questions found for category: {category}")
+        if not questions:
+            raise HTTPException(status_code=404, detail=f"No questions found for category: {category}")
 
-    return questions
+        return questions
 
+    return catalog_cache.respond(request, _with_fields(("by-category", category), included), load, response_type)
 
-@router.get("/by-category/{category}/set/{question_set}", response_model=List[QuestionWithAnswers])
-def get_questions_by_category_and_set(category: str, question_set: str, db: Session = Depends(get_db)):
+
+@router.get("/by-category/{category}/set/{question_set}", response_model=List[QuestionWithAnswers], dependencies=[Depends(QueryBudget(4))])
+def get_questions_by_category_and_set(
+    category: str,
+    question_set: str,
+    request: Request,
+    filter: ProgressFilter = "all",
+    fields: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: Session = Depends(get_read_db),
+    primary: Session = Depends(get_db)
+):
     """
     Get all questions with answers for a specific category and question set.
+    `filter` and `fields` work as for the whole category.
     """
-    questions = question_service.get_questions_by_category_and_set(db, category, question_set)
+    included = parse_fields(fields)
+    response_type = List[sparse_question_type(included)]
+    if filter != "all":
+        user = user_from_credentials(credentials, db)
+        questions = question_service.get_questions_by_category_and_set(
+            db, category, question_set, user.id, filter, included, mastery_db=primary
+        )
+        return fast_response(response_type, questions, trusted=False)
+
+    def load():
+        questions = question_service.get_questions_by_category_and_set(primary, category, question_set, fields=included)
+
+        if not questions:
+            raise HTTPException(status_code=404, detail=f"No questions found for category: {category}, set: {question_set}")
 
-    if not questions:
-        raise HTTPException(status_code=404, detail=f"No questions found for category: {category}, set: {question_set}")
+        return questions
 
-    return questions
+    return catalog_cache.respond(request, _with_fields(("by-set", category, question_set), included), load, response_type)
+
+
+# Questions, then all their answers: the same two queries however many sets are asked for
+@router.post("/batch", response_model=QuestionBatchOut, dependencies=[Depends(QueryBudget(2))])
+def get_questions_batch(data: QuestionBatchRequest, fields: Optional[str] = None, db: Session = Depends(get_read_db)):
+    """
+    Get the questions with answers of several sets and/or individual question ids at once.
+    Questions are returned once each, grouped by the set they belong to.
+    """
+    included = parse_fields(fields)
+    return fast_response(sparse_batch_type(included), question_service.get_questions_batch(db, data, included))
+
+
+@router.get("/{question_id}/explanation", response_model=QuestionExplanation, dependencies=[Depends(QueryBudget(1))])
+def get_question_explanation(question_id: int, request: Request, db: Session = Depends(get_db)):
+    """
+    Get which answers of a question are correct, with their explanations.
+    Meant to be fetched after answering, by clients that load questions with
+    `fields=` leaving out explanations (and correctness).
+    """
+    return catalog_cache.respond(
+        request,
+        ("explanation", question_id),
+        lambda: question_service.get_question_explanation(db, question_id),
+        QuestionExplanation
+    )
@@ -1,19 +1,26 @@
 # app/api/v1/response.py
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List
-from app.schemas.response import DashboardData, ResponseCreate, ResponseBulkCreate, ResponseOut
-from app.services import response_service
-from app.db.session import get_db
-from app.api.dependencies.auth import get_current_user
+from datetime import datetime
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
+from typing import List, Literal
+from app.schemas.response import DashboardData, ResponseCreate, ResponseBulkCreate, ResponseOut, SetProgress
+from app.services import response_service, export_service
+from app.db.session import get_db, get_session_factory
+from app.db.replicas import get_read_db, pin_to_primary
+from app.api.dependencies.auth import get_current_user, is_admin
+from app.utils.serialization import fast_response
 from app.models.users import User
+from app.db.query_budget import QueryBudget
 
 router = APIRouter()
 
 
-@router.post("/submit", response_model=ResponseOut)
+# A user's first submit also inserts their empty mastery row and reads it back locked
+@router.post("/submit", response_model=ResponseOut, dependencies=[Depends(QueryBudget(10))])
 def submit_response(
     response_data: ResponseCreate,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -21,12 +28,15 @@ def submit_response(
     Submit a single quiz response.
     Requires authentication.
     """
+    # Pinned before the write, so no read can reach a replica between the commit and the pin
+    pin_to_primary(request, current_user.user_email)
     return response_service.submit_response(db, current_user.id, response_data)
 
 
-@router.post("/submit-bulk", response_model=List[ResponseOut])
+@router.post("/submit-bulk", response_model=List[ResponseOut], dependencies=[Depends(QueryBudget(10))])
 def submit_responses_bulk(
     bulk_data: ResponseBulkCreate,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -34,16 +44,75 @@ def submit_responses_bulk(
     Submit multiple quiz responses at once.
     Requires authentication.
     """
+    pin_to_primary(request, current_user.user_email)
     return response_service.submit_responses_bulk(db, current_user.id, bulk_data.responses)
 
 
-@router.get("/dashboard", response_model=DashboardData)
+# One extra query when the user has no answers inside the recent-activity window
+@router.get("/dashboard", response_model=DashboardData, dependencies=[Depends(QueryBudget(3))])
 def get_dashboard(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get user's dashboard data including statistics and recent activity.
     Requires authentication.
     """
-    return response_service.get_user_dashboard_data(db, current_user.id)
+    return fast_response(DashboardData, response_service.get_user_dashboard_data(db, current_user.id))
+
+
+# Served from the mastery bitsets; the queries only run on a cache miss (row, then set
+# masks, which are read from the primary like the catalog cache's misses)
+@router.get("/progress", response_model=List[SetProgress], dependencies=[Depends(QueryBudget(3))])
+def get_progress(
+    category: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    primary: Session = Depends(get_db)
+):
+    """
+    Get how many questions of each set in a category the user has answered, and how many correctly.
+    Requires authentication.
+    """
+    progress = response_service.get_set_progress(db, current_user.id, category, catalog_db=primary)
+    return fast_response(List[SetProgress], progress)
+
+
+@router.get("/export")
+def export_responses(
+    format: Literal["csv", "ndjson"] = "csv",
+    gzip: bool = False,
+    user_id: int | None = None,
+    category: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    current_user: User = Depends(get_current_user),
+    sessions: sessionmaker = Depends(get_session_factory)
+):
+    """
+    Stream response history as CSV or NDJSON, optionally gzip-compressed.
+
+    Administrators may export any user (or all users); everyone else only
+    gets their own responses. `start` is inclusive and `end` exclusive.
+    Requires authentication.
+    """
+    if not is_admin(current_user):
+        user_id = current_user.id
+
+    # The stream outlives the request's session, so it opens its own from `sessions`
+    chunks = export_service.stream_export(
+        sessions,
+        format,
+        compress=gzip,
+        user_id=user_id,
+        category=category,
+        start=start,
+        end=end
+    )
+    filename = export_service.export_filename(format, gzip)
+
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if gzip else export_service.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
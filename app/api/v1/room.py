@@ -0,0 +1,98 @@
+# app/api/v1/room.py
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from sqlalchemy.orm import Session
+from app.schemas.room import RoomCreate, RoomOut
+from app.services import auth_service, room_service
+from app.services.room_service import CLOSE_POLICY, CLOSE_TRY_AGAIN, Member, RoomError
+from app.db.session import get_db
+from app.api.dependencies.auth import get_current_user
+from app.models.users import User
+from app.utils.security import decode_access_token
+from app.utils.serialization import fast_response
+from app.db.query_budget import QueryBudget
+
+router = APIRouter()
+
+# Messages are JSON objects with a "type". Members send {"type": "answer",
+# "question_id", "selected_option_id"}; the host also sends "next", "close"
+# and "end". The server sends "room" (on join), "question", "tally", "ack",
+# "results", "error" and "ended".
+
+
+# The user lookup, then the set's questions and answers
+@router.post("/", response_model=RoomOut, status_code=201, dependencies=[Depends(QueryBudget(3))])
+def create_room(
+    data: RoomCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Open a quiz room over a question set, hosted by the current user.
+    Requires authentication.
+    """
+    room = room_service.create_room(db, current_user.id, data.category, data.question_set)
+    return fast_response(RoomOut, room.info(), status_code=201)
+
+
+@router.get("/{code}", response_model=RoomOut)
+def get_room(code: str):
+    """
+    Get a room's set, position and member count.
+    """
+    room = room_service.rooms.get(code)
+    if room is None:
+        raise HTTPException(status_code=404, detail="Quiz room not found")
+    return fast_response(RoomOut, room.info())
+
+
+def _user_id(db: Session, token: Optional[str]) -> Optional[int]:
+    email = decode_access_token(token) if token else None
+    user = auth_service.get_user_by_email(db, email) if email else None
+    # Connections last long: hand the connection back to the pool right away
+    db.close()
+    return user.id if user is not None else None
+
+
+@router.websocket("/{code}/ws")
+async def room_socket(websocket: WebSocket, code: str, token: Optional[str] = None, db: Session = Depends(get_db)):
+    """
+    Join a room. Browsers cannot set headers on WebSockets, so the access
+    token comes in `?token=` (an `Authorization: Bearer` header works too).
+    """
+    header = websocket.headers.get("authorization", "")
+    if token is None and header.lower().startswith("bearer "):
+        token = header[7:]
+    user_id = await asyncio.to_thread(_user_id, db, token)
+    room = room_service.rooms.get(code)
+    if user_id is None or room is None:
+        await websocket.close(code=CLOSE_POLICY)
+        return
+
+    await websocket.accept()
+    member = Member(user_id, websocket.send_text, lambda code: websocket.close(code=code))
+    if not room.join(member):
+        await websocket.close(code=CLOSE_TRY_AGAIN)
+        return
+
+    sender = asyncio.ensure_future(member.run_sender())
+    try:
+        while not member.closed:
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+            except ValueError:
+                member.send("error", room_service.error_message("Messages must be JSON objects"))
+                continue
+            try:
+                await room.handle(member, message, db)
+            except RoomError as exc:
+                member.send("error", room_service.error_message(str(exc)))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        room.leave(member)
+        await member.close()
+        sender.cancel()
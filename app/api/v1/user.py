@@ -3,14 +3,14 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.schemas.user import UserOut
 from app.services import user_service
-from app.db.session import get_db
+from app.db.replicas import get_read_db
 from app.api.dependencies.auth import get_current_user
 from app.models.users import User
 
 router = APIRouter()
 
 @router.get("/", response_model=list[UserOut])
-def read_users(db: Session = Depends(get_db)):
+def read_users(db: Session = Depends(get_read_db)):
     """Get all users (public endpoint)."""
     users = user_service.list_users(db)
     return users
@@ -21,7 +21,7 @@ def read_current_user(current_user: User = Depends(get_current_user)):
     return current_user
 
 @router.get("/{user_id}", response_model=UserOut)
-def read_user(user_id: int, db: Session = Depends(get_db)):
+def read_user(user_id: int, db: Session = Depends(get_read_db)):
     """Get user by ID (public endpoint)."""
     user = user_service.get_user(db, user_id)
     if not user:
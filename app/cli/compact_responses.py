@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Compact old responses into daily per-user, per-category totals.
+
+Meant to run from cron; safe to interrupt and re-run.
+
+Usage:
+    python -m app.cli.compact_responses --days 180
+    python -m app.cli.compact_responses --before 2025-06-01 --archive-dir /var/backups/responses --pause 0.1
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from app.db.session import SessionLocal
+from app.services import retention_service
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Compact old responses into daily totals')
+    horizon = parser.add_mutually_exclusive_group()
+    horizon.add_argument('--days', type=int, default=retention_service.RESPONSE_RETENTION_DAYS,
+                         help=f'Keep raw responses for this many days (default: {retention_service.RESPONSE_RETENTION_DAYS})')
+    horizon.add_argument('--before', type=datetime.fromisoformat, help='Compact responses answered before this date/time instead')
+    parser.add_argument('--batch-size', type=int, default=retention_service.COMPACTION_BATCH_SIZE,
+                        help=f'Responses per transaction (default: {retention_service.COMPACTION_BATCH_SIZE})')
+    parser.add_argument('--archive-dir', help='Write the raw rows here (gzipped NDJSON) before deleting them')
+    parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between batches (default: 0)')
+    parser.add_argument('--max-batches', type=int, help='Stop after this many batches')
+
+    args = parser.parse_args()
+
+    cutoff = args.before or retention_service.retention_cutoff(args.days)
+    print(f"Compacting responses answered before {cutoff.isoformat()}", file=sys.stderr)
+
+    def progress(stats):
+        if stats.batches % 20 == 0:
+            print(f"  {stats.rows:,} rows in {stats.batches} batches, {stats.rows / stats.elapsed:,.0f} rows/s", file=sys.stderr)
+
+    db = SessionLocal()
+    try:
+        stats = retention_service.compact_responses(
+            db,
+            cutoff=cutoff,
+            batch_size=args.batch_size,
+            archive_dir=args.archive_dir,
+            pause=args.pause,
+            max_batches=args.max_batches,
+            progress=progress
+        )
+    finally:
+        db.close()
+
+    archived = f", {len(stats.archived_files)} archive files" if args.archive_dir else ""
+    print(f"✓ Compacted {stats.rows:,} responses in {stats.batches} batches ({stats.elapsed:.1f}s){archived}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
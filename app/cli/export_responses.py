@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Export response history to CSV or NDJSON.
+
+Usage:
+    python -m app.cli.export_responses --format ndjson --gzip -o responses.ndjson.gz
+    python -m app.cli.export_responses --user-id 42 --start 2025-01-01 --end 2025-02-01
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from app.db.session import SessionLocal
+from app.services import export_service
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Export response history')
+    parser.add_argument('--format', choices=export_service.FORMATS, default='csv', help='Output format (default: csv)')
+    parser.add_argument('--gzip', action='store_true', help='Gzip the output on the fly')
+    parser.add_argument('--user-id', type=int, help='Only export this user')
+    parser.add_argument('--category', help='Only export this category')
+    parser.add_argument('--start', type=datetime.fromisoformat, help='Answered at or after (ISO date/time)')
+    parser.add_argument('--end', type=datetime.fromisoformat, help='Answered before (ISO date/time)')
+    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    parser.add_argument('--progress-every', type=float, default=5.0, help='Seconds between progress lines (default: 5)')
+
+    args = parser.parse_args()
+
+    stats = export_service.ExportStats()
+    chunks = export_service.stream_export(
+        SessionLocal,
+        args.format,
+        compress=args.gzip,
+        stats=stats,
+        user_id=args.user_id,
+        category=args.category,
+        start=args.start,
+        end=args.end
+    )
+
+    out = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    next_report = time.perf_counter() + args.progress_every
+
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+            if time.perf_counter() >= next_report:
+                print(f"  {stats.rows:,} rows, {stats.rows_per_second:,.0f} rows/s", file=sys.stderr)
+                next_report = time.perf_counter() + args.progress_every
+    finally:
+        if args.output:
+            out.close()
+        else:
+            out.flush()
+
+    print(
+        f"✓ Exported {stats.rows:,} rows ({stats.bytes_written:,} bytes) "
+        f"in {stats.elapsed:.1f}s, {stats.rows_per_second:,.0f} rows/s",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
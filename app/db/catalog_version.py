@@ -0,0 +1,148 @@
+# app/db/catalog_version.py
+"""
+Per-worker watcher for the catalog version.
+
+Triggers bump `catalog_version.version` on every write to questions or
+answers (including the CSV importer and ad-hoc SQL). Each worker runs one
+watcher thread that learns about new versions and calls its subscribers,
+so in-process caches drop stale entries without checking the database on
+every request:
+
+- Postgres: LISTEN on the `catalog_version` channel the trigger NOTIFYs,
+  plus a poll every CATALOG_VERSION_POLL_SECONDS in case a notification was
+  missed while reconnecting;
+- other databases: the poll alone.
+
+Workers therefore converge within CATALOG_VERSION_POLL_SECONDS at worst.
+"""
+import logging
+import os
+import select
+import threading
+from typing import Callable, List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.db.session import get_engine
+from app.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_POLL_SECONDS = float(os.getenv("CATALOG_VERSION_POLL_SECONDS", "5"))
+CHANNEL = "catalog_version"
+
+
+class CatalogVersionWatcher:
+    """Tracks the catalog version in one process and calls subscribers when it moves."""
+
+    def __init__(self, engine: Optional[Engine] = None, poll_interval: float = CATALOG_VERSION_POLL_SECONDS):
+        self._engine = engine
+        self.poll_interval = poll_interval
+        self.version: Optional[int] = None
+        self._subscribers: List[Callable[[int], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def engine(self) -> Engine:
+        """The engine given, or the app's primary engine (created on first use)."""
+        return self._engine if self._engine is not None else get_engine()
+
+    def subscribe(self, callback: Callable[[int], None]):
+        """Call `callback(new_version)` whenever the version changes after the first read."""
+        self._subscribers.append(callback)
+
+    def read(self) -> Optional[int]:
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT version FROM catalog_version WHERE id = 1")).scalar()
+
+    def poll(self) -> Optional[int]:
+        """Read the version now and notify subscribers if it moved."""
+        version = self.read()
+        if version is not None:
+            self.observe(version)
+        return self.version
+
+    def observe(self, version: int):
+        """Record a version seen by a poll or a notification; older or equal versions are ignored."""
+        with self._lock:
+            previous = self.version
+            if previous is not None and version <= previous:
+                return
+            self.version = version
+        if previous is None:
+            return
+        logger.info("catalog version %d -> %d", previous, version)
+        for callback in self._subscribers:
+            try:
+                callback(version)
+            except Exception:
+                logger.exception("catalog version subscriber failed")
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        target = self._listen if self.engine.dialect.name == "postgresql" else self._poll_loop
+        self._thread = threading.Thread(target=target, name="catalog-version", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _safe_poll(self):
+        try:
+            self.poll()
+        except Exception as exc:
+            logger.warning("catalog version poll failed: %s", exc)
+
+    def _poll_loop(self):
+        self._safe_poll()
+        while not self._stop.wait(self.poll_interval):
+            self._safe_poll()
+
+    def _listen(self):
+        while not self._stop.is_set():
+            try:
+                self._listen_once()
+            except Exception as exc:
+                logger.warning("catalog version listener lost its connection: %s", exc)
+                self._stop.wait(self.poll_interval)
+
+    def _listen_once(self):
+        # A dedicated autocommit connection; NOTIFYs arrive on it between polls
+        conn = self.engine.raw_connection()
+        try:
+            dbapi = conn.driver_connection
+            dbapi.autocommit = True
+            with dbapi.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            # Anything committed before LISTEN took effect is caught by this poll
+            self._safe_poll()
+            while not self._stop.is_set():
+                ready, _, _ = select.select([dbapi], [], [], self.poll_interval)
+                if not ready:
+                    self._safe_poll()
+                    continue
+                dbapi.poll()
+                while dbapi.notifies:
+                    notification = dbapi.notifies.pop(0)
+                    try:
+                        self.observe(int(notification.payload))
+                    except ValueError:
+                        self._safe_poll()
+        finally:
+            conn.invalidate()
+
+
+watcher = CatalogVersionWatcher()
+
+registry.function(
+    "catalog_version",
+    "Catalog version this worker has seen.",
+    (),
+    lambda: {(): watcher.version} if watcher.version is not None else {}
+)
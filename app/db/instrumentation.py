@@ -0,0 +1,50 @@
+# app/db/instrumentation.py
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.db import slow_query_log
+from app.utils import request_stats
+from app.utils.metrics import registry
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = request_stats.current()
+    if stats is not None:
+        stats.query_count += 1
+        stats.db_seconds += elapsed
+        stats.statements[statement] = stats.statements.get(statement, 0) + 1
+    slow_query_log.maybe_record(conn, context, statement, parameters, executemany, elapsed)
+
+
+def _handle_error(context):
+    # after_cursor_execute does not fire for failed statements
+    if context.connection is not None and context.connection.info.get("query_started"):
+        context.connection.info["query_started"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute statement counts and SQL time to the request that issued them, and log slow statements."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+    pool = engine.pool
+    if hasattr(pool, "checkedout"):
+        # A pool pinned at size + overflow means requests are queueing for connections
+        registry.function(
+            "db_pool_connections",
+            "Connections in the SQLAlchemy pool by state.",
+            ("state",),
+            lambda: {
+                ("checked_out",): pool.checkedout(),
+                ("checked_in",): pool.checkedin(),
+                ("overflow",): max(pool.overflow(), 0),
+            }
+        )
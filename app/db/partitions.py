@@ -0,0 +1,61 @@
+# app/db/partitions.py
+"""
+Upkeep for the monthly `responses` partitions on Postgres.
+
+The partitioning migration installs `responses_ensure_partitions()`; this
+module calls it at startup and once a day so the next months' partitions
+always exist before the first answer lands in them. Other databases keep
+an ordinary table and every call here is a no-op.
+"""
+import asyncio
+import logging
+import os
+from datetime import date
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_PARTITIONS_AHEAD = int(os.getenv("RESPONSE_PARTITIONS_AHEAD", "3"))
+RESPONSE_PARTITIONS_CHECK_SECONDS = float(os.getenv("RESPONSE_PARTITIONS_CHECK_SECONDS", "86400"))
+
+
+def is_partitioned(db: Session) -> bool:
+    """True when `responses` is a partitioned table with the upkeep function installed."""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return db.execute(text(
+        "SELECT to_regprocedure('responses_ensure_partitions(date, integer)') IS NOT NULL"
+    )).scalar()
+
+
+def ensure_response_partitions(db: Session, months_ahead: int = RESPONSE_PARTITIONS_AHEAD) -> int:
+    """Create any missing partitions from this month to `months_ahead`; returns how many were created."""
+    if not is_partitioned(db):
+        return 0
+    created = db.execute(
+        text("SELECT responses_ensure_partitions(:from_month, :ahead)"),
+        {'from_month': date.today(), 'ahead': months_ahead}
+    ).scalar()
+    db.commit()
+    if created:
+        logger.info("Created %d responses partition(s)", created)
+    return created
+
+
+async def maintain_partitions(session_factory, interval: float = RESPONSE_PARTITIONS_CHECK_SECONDS):
+    """Background task for the app lifespan: re-check the partitions every `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(_ensure_with_session, session_factory)
+        except Exception:
+            logger.exception("Partition upkeep failed")
+
+
+def _ensure_with_session(session_factory) -> int:
+    db = session_factory()
+    try:
+        return ensure_response_partitions(db)
+    finally:
+        db.close()
@@ -0,0 +1,146 @@
+# app/db/query_budget.py
+"""
+Per-request (or per-block) SQL query budgets and an N+1 detector.
+
+Statements are counted by the cursor hooks in app.db.instrumentation. A
+budget fails when a scope runs more statements than it declared, or when
+one statement shape runs more than `max_repeats` times, which is what a
+query inside a loop looks like.
+"""
+import logging
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+from fastapi import Request
+from app.utils import request_stats
+from app.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# "log" in production, "raise" in tests so a regression fails the suite
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "log").lower()
+# The same statement shape may run this many times in one scope before it is reported as N+1
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "3"))
+
+VIOLATIONS = registry.counter(
+    "query_budget_violations_total",
+    "Query budget violations by scope and kind (budget or repeat).",
+    ("scope", "kind")
+)
+
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)"
+_PLACEHOLDER_GROUP = re.compile(r"\(\s*" + _PLACEHOLDER + r"(?:\s*,\s*" + _PLACEHOLDER + r")*\s*\)")
+_REPEATED_GROUPS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised (in "raise" mode) when a scope breaks its query budget."""
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a SQL string so executions that differ only in list lengths compare equal.
+
+    `IN (?, ?, ?)` and multi-row `VALUES (?, ?), (?, ?)` collapse to `(...)`.
+    """
+    shape = _PLACEHOLDER_GROUP.sub("(...)", statement)
+    shape = _REPEATED_GROUPS.sub("(...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def repeated_shapes(statements: Dict[str, int], max_repeats: int) -> List[Tuple[str, int]]:
+    """Statement shapes executed more than `max_repeats` times, most frequent first."""
+    shapes: Dict[str, int] = {}
+    for statement, count in statements.items():
+        shape = statement_shape(statement)
+        shapes[shape] = shapes.get(shape, 0) + count
+    return sorted(
+        ((shape, count) for shape, count in shapes.items() if count > max_repeats),
+        key=lambda item: -item[1]
+    )
+
+
+class QueryBudget:
+    """
+    Declare how many SQL statements a route (or a block of code) may run.
+
+    As a route dependency:
+
+        @router.get("/categories", dependencies=[Depends(QueryBudget(1))])
+
+    or around any block, e.g. in a test or a CLI:
+
+        with QueryBudget(2, name="load questions"):
+            question_repo.get_questions_by_category(db, category)
+    """
+
+    def __init__(self, max_queries: int, max_repeats: Optional[int] = None, name: Optional[str] = None, mode: Optional[str] = None):
+        self.max_queries = max_queries
+        self.max_repeats = QUERY_REPEAT_THRESHOLD if max_repeats is None else max_repeats
+        self.name = name
+        self.mode = mode
+        self._scopes: List[tuple] = []
+
+    def __enter__(self) -> "QueryBudget":
+        self._scopes.append(self._begin())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        scope = self._scopes.pop()
+        self._end(scope, self.name or "block", check=exc_type is None)
+        return False
+
+    async def __call__(self, request: Request):
+        scope = self._begin()
+        try:
+            yield
+        except Exception:
+            self._end(scope, self._route_name(request), check=False)
+            raise
+        self._end(scope, self._route_name(request), check=True)
+
+    def _route_name(self, request: Request) -> str:
+        route = request.scope.get("route")
+        return self.name or getattr(route, "path_format", None) or request.url.path
+
+    def _begin(self) -> tuple:
+        stats = request_stats.current()
+        token = None
+        if stats is None:
+            token = request_stats.start()
+            stats = request_stats.current()
+        return stats, token, stats.query_count, dict(stats.statements)
+
+    def _end(self, scope: tuple, name: str, check: bool):
+        stats, token, count_before, statements_before = scope
+        if token is not None:
+            request_stats.reset(token)
+        if not check:
+            return
+
+        count = stats.query_count - count_before
+        statements = {
+            statement: executed - statements_before.get(statement, 0)
+            for statement, executed in stats.statements.items()
+            if executed > statements_before.get(statement, 0)
+        }
+        self.check(name, count, statements)
+
+    def check(self, name: str, count: int, statements: Dict[str, int]):
+        """Report a budget violation for a finished scope."""
+        problems = []
+        if count > self.max_queries:
+            VIOLATIONS.inc((name, "budget"))
+            problems.append(f"{count} queries (budget {self.max_queries})")
+        for shape, executed in repeated_shapes(statements, self.max_repeats):
+            VIOLATIONS.inc((name, "repeat"))
+            problems.append(f"possible N+1: executed {executed}x: {shape[:200]}")
+
+        if not problems:
+            return
+
+        message = f"Query budget exceeded in {name}: " + "; ".join(problems)
+        if (self.mode or QUERY_BUDGET_MODE) == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,242 @@
+# app/db/replicas.py
+"""
+Read-replica routing.
+
+Read-only routes take their session from `get_read_db`, which hands out a
+session on a healthy replica (round-robin over DATABASE_REPLICA_URLS) and
+falls back to the primary when:
+
+- no replicas are configured, or none is currently healthy;
+- the caller submitted answers within the last READ_YOUR_WRITES_SECONDS,
+  so they never see a dashboard that lags behind their own writes.
+
+Replica health is re-checked lazily, at most every
+REPLICA_HEALTH_INTERVAL_SECONDS, by whichever request notices the check is
+due; a disconnect seen on a replica marks it unhealthy immediately. On
+Postgres a replica whose replay lags more than REPLICA_MAX_LAG_SECONDS is
+also treated as unhealthy.
+
+Pins are kept per process. With several workers behind a load balancer,
+a user can land on a worker that has not seen their write; run one worker
+per sticky session, or keep READ_YOUR_WRITES_SECONDS above the replica lag.
+
+The settings come from `Settings`: `create_app()` builds each app its own
+ReplicaRouter and keeps it in `app.state.replica_router`.
+"""
+import itertools
+import logging
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional, Sequence
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.db.instrumentation import instrument_engine
+from app.db.session import get_db
+from app.settings import Settings
+from app.utils.metrics import registry
+from app.utils.security import decode_access_token
+
+logger = logging.getLogger(__name__)
+
+READS = registry.counter(
+    "db_reads_total",
+    "Sessions handed out by get_read_db, by target and reason.",
+    ("target", "reason")
+)
+
+_LAG_SQL = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) ELSE 0 END"
+)
+
+
+class Replica:
+    """One replica engine and its last known health."""
+
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self.sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.healthy = True
+        self.checked_at = float("-inf")
+        self.error: Optional[str] = None
+        self._checking = threading.Lock()
+        event.listen(engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        if context.is_disconnect:
+            self.mark_unhealthy(str(context.original_exception))
+
+    def mark_unhealthy(self, error: str):
+        if self.healthy:
+            logger.warning("replica %s marked unhealthy: %s", self.name, error)
+        self.healthy = False
+        self.error = error
+        self.checked_at = time.monotonic()
+
+    def check(self, max_lag: float = 10.0) -> bool:
+        """Run the health check now: the replica answers and, on Postgres, is not too far behind."""
+        try:
+            with self.engine.connect() as conn:
+                if self.engine.dialect.name == "postgresql":
+                    lag = float(conn.execute(_LAG_SQL).scalar() or 0)
+                    if lag > max_lag:
+                        self.mark_unhealthy(f"replication lag {lag:.1f}s")
+                        return False
+                else:
+                    conn.execute(text("SELECT 1"))
+        except Exception as exc:
+            self.mark_unhealthy(str(exc))
+            return False
+
+        if not self.healthy:
+            logger.info("replica %s is healthy again", self.name)
+        self.healthy = True
+        self.error = None
+        self.checked_at = time.monotonic()
+        return True
+
+    def refresh(self, interval: float, max_lag: float = 10.0):
+        """Re-check if the last check is older than `interval`; concurrent callers skip it."""
+        if time.monotonic() - self.checked_at < interval:
+            return
+        if self._checking.acquire(blocking=False):
+            try:
+                self.check(max_lag)
+            finally:
+                self._checking.release()
+
+    def status(self) -> dict:
+        return {'name': self.name, 'healthy': self.healthy, 'error': self.error}
+
+
+class ReplicaRouter:
+    """Picks the engine a read-only request runs on."""
+
+    def __init__(self, replicas: List[Replica], pin_seconds: float = 10.0,
+                 health_interval: float = 5.0, max_lag: float = 10.0):
+        self.replicas = replicas
+        self.pin_seconds = pin_seconds
+        self.health_interval = health_interval
+        self.max_lag = max_lag
+        self._next = itertools.count()
+        self._pins: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        _routers.add(self)
+
+    @classmethod
+    def from_urls(cls, urls: Sequence[str], **kwargs) -> "ReplicaRouter":
+        replicas = []
+        for i, url in enumerate(urls):
+            engine = create_engine(url, pool_pre_ping=True)
+            instrument_engine(engine)
+            replicas.append(Replica(f"replica{i}", engine))
+        return cls(replicas, **kwargs)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ReplicaRouter":
+        """Engines are created, not connected: the first health check connects."""
+        return cls.from_urls(
+            settings.database_replica_urls,
+            pin_seconds=settings.read_your_writes_seconds,
+            health_interval=settings.replica_health_interval_seconds,
+            max_lag=settings.replica_max_lag_seconds
+        )
+
+    def pin(self, key: str):
+        """Send `key`'s reads to the primary for the next `pin_seconds`."""
+        if not self.replicas or self.pin_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._pins[key] = now + self.pin_seconds
+            if len(self._pins) > 10_000:
+                self._pins = {k: until for k, until in self._pins.items() if until > now}
+
+    def is_pinned(self, key: Optional[str]) -> bool:
+        if key is None:
+            return False
+        until = self._pins.get(key)
+        return until is not None and until > time.monotonic()
+
+    def pick(self) -> Optional[Replica]:
+        """A healthy replica (round-robin), or None to use the primary."""
+        count = len(self.replicas)
+        start = next(self._next)
+        for offset in range(count):
+            replica = self.replicas[(start + offset) % count]
+            replica.refresh(self.health_interval, self.max_lag)
+            if replica.healthy:
+                return replica
+        return None
+
+    def status(self) -> List[dict]:
+        return [replica.status() for replica in self.replicas]
+
+    def dispose(self):
+        for replica in self.replicas:
+            replica.engine.dispose()
+
+
+# Every live router, so the gauge covers each app built in the process
+_routers: "weakref.WeakSet[ReplicaRouter]" = weakref.WeakSet()
+
+registry.function(
+    "db_replica_healthy",
+    "1 while a read replica passes its health check.",
+    ("replica",),
+    lambda: {(replica.name,): int(replica.healthy) for router in list(_routers) for replica in router.replicas}
+)
+
+
+def get_router(request: Request) -> Optional[ReplicaRouter]:
+    """The router of the app serving `request` (None for apps built without one)."""
+    return getattr(request.app.state, "replica_router", None)
+
+
+def _bearer_subject(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return decode_access_token(token)
+
+
+def pin_to_primary(request: Request, user_email: str):
+    """Call after a write so the user's next reads see it."""
+    router = get_router(request)
+    if router is not None:
+        router.pin(user_email)
+
+
+def get_read_db(request: Request, primary: Session = Depends(get_db)):
+    """
+    Session for read-only routes: a healthy replica unless the caller is pinned to the primary.
+
+    The primary session comes from get_db, so it is only used (and only
+    connects) when the read falls back to it.
+    """
+    router = get_router(request)
+    if router is None or not router.replicas:
+        yield primary
+        return
+
+    if router.is_pinned(_bearer_subject(request)):
+        READS.inc(("primary", "pinned"))
+        yield primary
+        return
+
+    replica = router.pick()
+    if replica is None:
+        READS.inc(("primary", "no_healthy_replica"))
+        yield primary
+        return
+
+    READS.inc(("replica", "ok"))
+    db = replica.sessions()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,15 +1,80 @@
-import os
-from dotenv import load_dotenv  
+# app/db/session.py
+"""
+Primary database engine and session factory.
+
+The engine is created on first use (the first `SessionLocal()` or
+`get_engine()`), not at import, so importing the app needs no database
+and the pool is sized from the settings `create_app()` was given.
+"""
+import threading
+from typing import Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from app.db.instrumentation import instrument_engine
+from app.settings import Settings, get_settings
 
-load_dotenv()  # load file .env
+Base = declarative_base()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+_settings: Optional[Settings] = None
+_engine: Optional[Engine] = None
+_lock = threading.Lock()
+
+
+def _create_engine(settings: Settings) -> Engine:
+    if not settings.database_url:
+        raise RuntimeError("DATABASE_URL is not set; cannot connect to the database")
+    kwargs = {}
+    if not settings.database_url.startswith("sqlite"):
+        kwargs.update(pool_size=settings.database_pool_size, max_overflow=settings.database_max_overflow)
+    engine = create_engine(settings.database_url, echo=settings.database_echo, **kwargs)
+    instrument_engine(engine)
+    return engine
+
+
+def configure(settings: Settings):
+    """Build the engine from `settings` from now on; an engine made from other settings is disposed."""
+    global _settings, _engine
+    with _lock:
+        if settings == _settings:
+            return
+        _settings = settings
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+            SessionLocal.configure(bind=None)
+
+
+def get_engine() -> Engine:
+    """The primary engine, created on the first call."""
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                engine = _create_engine(_settings or get_settings())
+                SessionLocal.configure(bind=engine)
+                _engine = engine
+    return _engine
+
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that creates the primary engine when the first session is made."""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
+
+
+def __getattr__(name):
+    # `from app.db.session import engine` still works; it creates the engine at that point
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-engine = create_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
 
 # Dependency cho FastAPI
 def get_db():
@@ -17,4 +82,12 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_session_factory() -> sessionmaker:
+    """
+    Dependency for routes that open their own sessions, e.g. streaming
+    responses that outlive the request's get_db session.
+    """
+    return SessionLocal
@@ -0,0 +1,214 @@
+# app/db/slow_query_log.py
+"""
+Slow-query recorder.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are kept in a bounded ring
+buffer with the route that issued them and their (redacted) bind
+parameters, and logged as one JSON line each. The query plan is captured
+by a background thread on its own connection, so the request that hit
+the slow query never waits for the EXPLAIN.
+"""
+import datetime
+import decimal
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+from sqlalchemy.engine import Engine
+from app.db.query_budget import statement_shape
+from app.utils import request_stats
+from app.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+# EXPLAIN ANALYZE runs the statement a second time; only ever done for SELECTs
+SLOW_QUERY_EXPLAIN_ANALYZE = os.getenv("SLOW_QUERY_EXPLAIN_ANALYZE", "false").lower() == "true"
+# The same statement shape is explained at most once per interval
+SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS", "300"))
+
+# Named string parameters that are safe to log verbatim; every other string is redacted
+SAFE_STRING_PARAMS = ("category", "question_set", "metric", "kind", "format")
+
+SLOW_QUERIES = registry.counter(
+    "db_slow_queries_total",
+    "Statements slower than SLOW_QUERY_THRESHOLD_MS, by route.",
+    ("route",)
+)
+
+# Execution option that keeps the recorder's own EXPLAIN statements out of the log
+SKIP_OPTION = "skip_slow_query_log"
+
+
+def _redact_value(name: Optional[str], value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, decimal.Decimal)):
+        return value
+    if isinstance(value, (datetime.date, datetime.time, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, str) and name and name.rstrip("_0123456789").lower().endswith(SAFE_STRING_PARAMS):
+        return value[:100]
+    if isinstance(value, (str, bytes)):
+        return f"<redacted {type(value).__name__} len={len(value)}>"
+    return f"<redacted {type(value).__name__}>"
+
+
+def _parameter_names(context, parameters: Any) -> Optional[List[str]]:
+    """Bind names for positional (`?`, `%s`) parameters, taken from the compiled statement."""
+    compiled = getattr(context, "compiled", None)
+    positiontup = getattr(compiled, "positiontup", None)
+    if not positiontup or not isinstance(parameters, (list, tuple)):
+        return None
+
+    # IN-lists are expanded at execution time: `ids_1` becomes `ids_1_1`, `ids_1_2`, ...
+    expanded = getattr(context, "_expanded_parameters", None) or {}
+    names: List[str] = []
+    for name in positiontup:
+        names.extend(expanded.get(name, (name,)))
+    return names if len(names) == len(parameters) else None
+
+
+def redact_parameters(parameters: Any, names: Optional[List[str]] = None) -> Any:
+    """Keep numbers, dates and known-safe names; replace other values with a type/length marker."""
+    if names is not None:
+        parameters = dict(zip(names, parameters))
+    if isinstance(parameters, dict):
+        return {name: _redact_value(name, value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(None, value) for value in parameters]
+    return _redact_value(None, parameters)
+
+
+def _explain_sql(dialect: str, statement: str, analyze: bool) -> Optional[str]:
+    if dialect == "postgresql":
+        return ("EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN ") + statement
+    if dialect == "sqlite":
+        return "EXPLAIN QUERY PLAN " + statement
+    if dialect in ("mysql", "mariadb"):
+        return ("EXPLAIN ANALYZE " if analyze else "EXPLAIN ") + statement
+    return None
+
+
+class SlowQueryLog:
+    """Bounded ring buffer of slow statements plus the worker that explains them."""
+
+    def __init__(self, max_entries: int = SLOW_QUERY_LOG_SIZE, explain: bool = SLOW_QUERY_EXPLAIN, analyze: bool = SLOW_QUERY_EXPLAIN_ANALYZE):
+        self.explain = explain
+        self.analyze = analyze
+        self._entries: deque = deque(maxlen=max_entries)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._last_explained: Dict[str, float] = {}
+        self._queue: "queue.Queue" = queue.Queue(maxsize=100)
+        self._worker: Optional[threading.Thread] = None
+
+    def record(self, engine: Engine, statement: str, parameters: Any, executemany: bool, seconds: float, context=None) -> dict:
+        """Store one slow statement and schedule its EXPLAIN (called from the cursor hook)."""
+        stats = request_stats.current()
+        route = stats.route if stats is not None else None
+        sample = parameters[0] if executemany and parameters else parameters
+
+        entry = {
+            'id': next(self._ids),
+            'at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'duration_ms': round(seconds * 1000, 2),
+            'route': route,
+            'statement': statement,
+            'parameters': redact_parameters(sample, _parameter_names(context, sample)),
+            'executemany': len(parameters) if executemany and parameters else None,
+            'plan': None,
+            'plan_error': None,
+        }
+        with self._lock:
+            self._entries.append(entry)
+
+        SLOW_QUERIES.inc((route or "<none>",))
+        logger.warning("slow_query %s", json.dumps(entry, default=str))
+
+        if self.explain and self._should_explain(statement):
+            try:
+                self._queue.put_nowait((engine, entry, statement, sample))
+                self._ensure_worker()
+            except queue.Full:
+                entry['plan_error'] = "explain queue full"
+        return entry
+
+    def entries(self, limit: Optional[int] = None) -> List[dict]:
+        """Recorded statements, newest first."""
+        with self._lock:
+            entries = list(self._entries)
+        entries.reverse()
+        return entries[:limit] if limit else entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._last_explained.clear()
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """Block until queued EXPLAINs are done (for tests and the CLI)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return not self._queue.unfinished_tasks
+
+    def _should_explain(self, statement: str) -> bool:
+        shape = statement_shape(statement)
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_explained.get(shape)
+            if last is not None and now - last < SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS:
+                return False
+            self._last_explained[shape] = now
+            return True
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="slow-query-explain", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            engine, entry, statement, parameters = self._queue.get()
+            try:
+                self._explain(engine, entry, statement, parameters)
+            except Exception as exc:
+                entry['plan_error'] = str(exc)
+            finally:
+                self._queue.task_done()
+
+    def _explain(self, engine: Engine, entry: dict, statement: str, parameters: Any):
+        analyze = self.analyze and statement.lstrip().upper().startswith("SELECT")
+        sql = _explain_sql(engine.dialect.name, statement, analyze)
+        if sql is None:
+            entry['plan_error'] = f"EXPLAIN is not supported for {engine.dialect.name}"
+            return
+
+        with engine.connect() as conn:
+            conn = conn.execution_options(**{SKIP_OPTION: True})
+            rows = conn.exec_driver_sql(sql, parameters if parameters is not None else ()).all()
+            conn.rollback()
+
+        entry['plan'] = "\n".join(" | ".join(str(value) for value in row) for row in rows)
+        logger.warning("slow_query_plan %s", json.dumps({'id': entry['id'], 'plan': entry['plan']}))
+
+
+slow_query_log = SlowQueryLog()
+
+
+def maybe_record(conn, context, statement: str, parameters: Any, executemany: bool, seconds: float):
+    """Cursor-hook entry point: record the statement if it crossed the threshold."""
+    if seconds * 1000 < SLOW_QUERY_THRESHOLD_MS:
+        return
+    if context is not None and context.execution_options.get(SKIP_OPTION):
+        return
+    slow_query_log.record(conn.engine, statement, parameters, executemany, seconds, context)
@@ -1,11 +1,7 @@
-import os
-from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from app.db.session import get_engine
 
-load_dotenv()  # load file .env
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-engine = create_engine(DATABASE_URL, echo=True)
+engine = get_engine()
 
 try:
     with engine.connect() as conn:
@@ -1,36 +1,122 @@
 # app/main.py
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1 import user, auth, question, response
-
-app = FastAPI(
-    title="My FastAPI Project",
-    version="1.0.0"
-)
-
-# CORS configuration for frontend
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://localhost:5174"],  # Vite dev server ports
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Đăng ký router từ folder api/v1
-app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
-app.include_router(user.router, prefix="/api/v1/users", tags=["users"])
-app.include_router(question.router, prefix="/api/v1/questions", tags=["questions"])
-app.include_router(response.router, prefix="/api/v1/responses", tags=["responses"])
-
-@app.get("/")
-def root():
-    return {"message": "Welcome to My FastAPI Project"}
-
-@app.get("/api/v1/health")
-def health_check():
-    return {
-        "status": "healthy",
-        "service": "quiz-api",
-        "version": "1.0.0"
-    }
+from app import startup
+from app.api import metrics
+from app.api.v1 import user, auth, question, response, exam, leaderboard, admin, room
+from app.db import catalog_version, partitions, replicas, session
+from app.db.session import SessionLocal
+from app.middleware import admission
+from app.middleware.admission import AdmissionMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.startup import FirstRequestMiddleware
+from app.services import leaderboard_service, mastery_service
+from app.settings import Settings, get_settings
+from app.utils.payload_cache import catalog_cache
+
+# Every worker drops its cached catalog payloads when questions or answers change
+catalog_version.watcher.subscribe(catalog_cache.invalidate)
+catalog_version.watcher.subscribe(mastery_service.invalidate_set_masks)
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """
+    Build the application.
+
+    Nothing connects to the database here: the engine is created from
+    `settings` on first use, which is the lifespan's warmup when it is on.
+    The replica router and admission limiters belong to this app alone.
+    """
+    settings = settings or get_settings()
+    session.configure(settings)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Pay for mappers, pool connections, schemas and catalog payloads before the first request does
+        if settings.warmup:
+            startup.warm_up(app, session.get_engine(), SessionLocal, settings.warmup_connections)
+
+        # Load the in-memory leaderboards from the rollup table before serving traffic
+        db = SessionLocal()
+        try:
+            leaderboard_service.rebuild(db)
+            # Make sure the coming months' responses partitions exist (Postgres only)
+            partitions.ensure_response_partitions(db)
+        finally:
+            db.close()
+        upkeep = asyncio.create_task(partitions.maintain_partitions(SessionLocal))
+        catalog_version.watcher.start()
+        startup.record_since_import("ready")
+        try:
+            yield
+        finally:
+            upkeep.cancel()
+            catalog_version.watcher.stop()
+            app.state.replica_router.dispose()
+
+    app = FastAPI(
+        title="My FastAPI Project",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+    app.state.replica_router = replicas.ReplicaRouter.from_settings(settings)
+
+    # Innermost: limit concurrency per route class and shed with 503 (CORS headers still apply)
+    app.add_middleware(
+        AdmissionMiddleware, limiters=admission.limiters_for(settings), enabled=settings.admission_control
+    )
+
+    # CORS configuration for frontend
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=list(settings.cors_origins),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Compress JSON responses for clients that accept gzip (or br/zstd when installed)
+    app.add_middleware(CompressionMiddleware)
+
+    # Wraps CORS and compression, so latency and phase timings include them
+    app.add_middleware(MetricsMiddleware)
+
+    # Opt-in request profiling (signed X-Profile header, admin toggle or PROFILE_SAMPLE_RATE)
+    app.add_middleware(ProfilingMiddleware)
+
+    # Outermost: time to the first served request, reported as app_startup_seconds{phase="first_request"}
+    app.add_middleware(FirstRequestMiddleware)
+
+    # Đăng ký router từ folder api/v1
+    app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
+    app.include_router(user.router, prefix="/api/v1/users", tags=["users"])
+    app.include_router(question.router, prefix="/api/v1/questions", tags=["questions"])
+    app.include_router(response.router, prefix="/api/v1/responses", tags=["responses"])
+    app.include_router(exam.router, prefix="/api/v1/exams", tags=["exams"])
+    app.include_router(leaderboard.router, prefix="/api/v1/leaderboard", tags=["leaderboard"])
+    app.include_router(room.router, prefix="/api/v1/rooms", tags=["rooms"])
+    app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
+    app.include_router(metrics.router)
+
+    @app.get("/")
+    def root():
+        return {"message": "Welcome to My FastAPI Project"}
+
+    @app.get("/api/v1/health")
+    def health_check():
+        return {
+            "status": "healthy",
+            "service": "quiz-api",
+            "version": "1.0.0"
+        }
+
+    return app
+
+
+app = create_app()
+startup.record_since_import("import")
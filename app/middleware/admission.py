@@ -0,0 +1,292 @@
+# app/middleware/admission.py
+"""
+Admission control: bounded concurrency per route class, with fast shedding.
+
+Without it, a spike queues requests on the SQLAlchemy pool until
+`pool_timeout` and they fail with 500s half a minute later. Instead each
+route class (auth, catalog, submissions including exam sessions,
+dashboard, exports) runs at most ADMISSION_<CLASS>_CONCURRENCY requests at
+once; the rest wait in a bounded queue. By default the classes split the
+pool's connections (pool size plus overflow) between them, so admitted
+requests never wait on the pool; limits set in the environment that add
+up to more than the pool are logged as a warning at startup. A request is
+rejected right away with `503` and `Retry-After` when
+
+- the queue is full (`queue_full`);
+- the estimated wait (requests ahead of it times the class's average
+  service time, divided by its concurrency) exceeds
+  ADMISSION_QUEUE_TIMEOUT_SECONDS (`deadline`);
+
+and after queueing that long without a slot (`timeout`). Catalog reads
+whose payload is already cached are served ahead of everything else
+waiting in the catalog queue. Paths that use no database connection
+(health, metrics, WebSockets) are never limited.
+
+The limits come from `Settings`; each app built by `create_app()` has its
+own limiters.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+import weakref
+from typing import Dict, List, Optional, Tuple
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.api.v1 import question
+from app.settings import Settings, get_settings
+from app.utils.metrics import registry
+from app.utils.payload_cache import catalog_cache
+
+logger = logging.getLogger(__name__)
+
+CATALOG_PREFIX = "/api/v1/questions"
+
+# First matching prefix wins; None leaves the path unlimited
+ROUTE_CLASSES: Tuple[Tuple[str, Optional[str]], ...] = (
+    ("/api/v1/auth/", "auth"),
+    (CATALOG_PREFIX + "/", "catalog"),
+    # Opening a room loads its question set
+    ("/api/v1/rooms", "catalog"),
+    ("/api/v1/responses/submit", "submissions"),
+    ("/api/v1/exams", "submissions"),
+    # Streaming exports run for minutes: in the dashboard class they would pin
+    # its slots and inflate its average service time, shedding dashboards long afterwards
+    ("/api/v1/responses/export", "exports"),
+    ("/api/v1/responses/", "dashboard"),
+    ("/api/v1/leaderboard", "dashboard"),
+    ("/api/v1/users", "dashboard"),
+    ("/api/v1/admin/", "dashboard"),
+)
+
+# Each class's share of the pool's connections beyond the one every class gets;
+# exports stay at one connection however large the pool
+POOL_SHARES: Tuple[Tuple[str, int], ...] = (
+    ("auth", 4),
+    ("catalog", 16),
+    ("submissions", 6),
+    ("dashboard", 4),
+    ("exports", 0),
+)
+# Queued requests per admitted one
+QUEUE_PER_SLOT = 4
+
+# Cached catalog payloads first, then everything else
+PRIORITY_CHEAP = 0
+PRIORITY_NORMAL = 1
+
+SHED = registry.counter(
+    "admission_shed_total",
+    "Requests rejected with 503 by admission control, by route class and reason.",
+    ("route_class", "reason")
+)
+QUEUED = registry.counter(
+    "admission_queued_total",
+    "Requests that waited for a slot, by route class.",
+    ("route_class",)
+)
+QUEUE_SECONDS = registry.histogram(
+    "admission_queue_wait_seconds",
+    "Time admitted requests spent waiting for a slot.",
+    ("route_class",)
+)
+
+
+def pool_split(connections: int) -> Dict[str, int]:
+    """
+    Default concurrency per class: one connection each, the rest split by
+    POOL_SHARES (largest remainders first), so the total is the pool's size
+    whenever it has at least one connection per class.
+    """
+    spare = max(connections - len(POOL_SHARES), 0)
+    total = sum(share for _, share in POOL_SHARES)
+    exact = {name: spare * share / total for name, share in POOL_SHARES}
+    split = {name: 1 + int(value) for name, value in exact.items()}
+    left = spare - sum(int(value) for value in exact.values())
+    for name in sorted(exact, key=lambda n: int(exact[n]) - exact[n])[:left]:
+        split[name] += 1
+    return split
+
+
+class Limiter:
+    """
+    Concurrency limit plus a bounded priority queue for one route class.
+
+    Runs on the event loop only. A released slot goes straight to the best
+    waiter (lowest priority value, then arrival order).
+    """
+
+    def __init__(self, name: str, concurrency: int, queue_size: int,
+                 timeout: float = 5.0, initial_service_time: float = 0.05):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        # Exponentially weighted average of how long an admitted request holds its slot
+        self.service_time = initial_service_time
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        _limiters.add(self)
+
+    def estimated_wait(self, ahead: int) -> float:
+        return (ahead + 1) * self.service_time / max(self.concurrency, 1)
+
+    def _ahead_of(self, priority: int) -> int:
+        return sum(1 for p, _, waiter in self._heap if p <= priority and not waiter.done())
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL) -> Optional[str]:
+        """Wait for a slot; returns None once admitted, or the reason the request is shed."""
+        if self.active < self.concurrency and self.waiting == 0:
+            self.active += 1
+            return None
+        if self.waiting >= self.queue_size:
+            return "queue_full"
+        if self.estimated_wait(self._ahead_of(priority)) > self.timeout:
+            return "deadline"
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (priority, next(self._seq), waiter))
+        self.waiting += 1
+        try:
+            await asyncio.wait((waiter,), timeout=self.timeout)
+        except asyncio.CancelledError:
+            # The client went away; pass on a slot we were handed meanwhile
+            if not waiter.cancel():
+                self.release()
+            raise
+        finally:
+            self.waiting -= 1
+        # cancel() only fails when release() already handed this waiter the slot
+        return "timeout" if waiter.cancel() else None
+
+    def release(self, held: Optional[float] = None):
+        """Free a slot (handing it to the next waiter); `held` updates the service time average."""
+        if held is not None:
+            self.service_time += 0.2 * (held - self.service_time)
+        while self._heap:
+            _, _, waiter = heapq.heappop(self._heap)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.estimated_wait(self.waiting)))
+
+    def status(self) -> dict:
+        return {'active': self.active, 'waiting': self.waiting, 'service_time': self.service_time}
+
+
+def default_limiters(connections: int, timeout: float = 5.0, concurrency: Optional[Dict[str, int]] = None,
+                     queue: Optional[Dict[str, int]] = None) -> Dict[str, Limiter]:
+    """
+    Limiters for a pool of `connections`, with `concurrency` and `queue`
+    overriding the pool split per class; warns when the limits admit more
+    requests than the pool holds.
+    """
+    concurrency = {**pool_split(connections), **(concurrency or {})}
+    queue = queue or {}
+    limiters = {
+        name: Limiter(name, limit, queue.get(name, limit * QUEUE_PER_SLOT), timeout=timeout)
+        for name, limit in concurrency.items()
+    }
+    admitted = sum(limiter.concurrency for limiter in limiters.values())
+    if admitted > connections:
+        logger.warning(
+            "admission limits admit %d concurrent requests but the database pool holds %d connections; "
+            "the excess will wait on the pool and may fail with pool timeouts", admitted, connections
+        )
+    return limiters
+
+
+def limiters_for(settings: Settings) -> Dict[str, Limiter]:
+    """The limiters an app built from `settings` uses, sized to its pool."""
+    return default_limiters(
+        settings.database_pool_size + settings.database_max_overflow,
+        timeout=settings.admission_queue_timeout_seconds,
+        concurrency=dict(settings.admission_concurrency),
+        queue=dict(settings.admission_queue)
+    )
+
+
+# Every live limiter, so the gauges cover each app built in the process
+_limiters: "weakref.WeakSet[Limiter]" = weakref.WeakSet()
+
+
+def _by_class(value) -> Dict[Tuple[str], int]:
+    totals: Dict[Tuple[str], int] = {}
+    for limiter in list(_limiters):
+        totals[(limiter.name,)] = totals.get((limiter.name,), 0) + value(limiter)
+    return totals
+
+
+registry.function(
+    "admission_in_flight",
+    "Requests holding an admission slot, by route class.",
+    ("route_class",),
+    lambda: _by_class(lambda limiter: limiter.active)
+)
+registry.function(
+    "admission_queue_depth",
+    "Requests waiting for an admission slot, by route class.",
+    ("route_class",),
+    lambda: _by_class(lambda limiter: limiter.waiting)
+)
+
+
+def route_class(path: str) -> Optional[str]:
+    for prefix, name in ROUTE_CLASSES:
+        if path.startswith(prefix):
+            return name
+    return None
+
+
+def priority(name: str, path: str, query_string: bytes = b"") -> int:
+    """Catalog reads that will be answered from catalog_cache go first."""
+    if name == "catalog":
+        key = question.cache_key(path[len(CATALOG_PREFIX):], query_string)
+        if key is not None and catalog_cache.get(key) is not None:
+            return PRIORITY_CHEAP
+    return PRIORITY_NORMAL
+
+
+class AdmissionMiddleware:
+    """Admit, queue or shed each request according to its route class's Limiter."""
+
+    def __init__(self, app: ASGIApp, limiters: Optional[Dict[str, Limiter]] = None, enabled: bool = True):
+        self.app = app
+        self.limiters = limiters if limiters is not None else limiters_for(get_settings())
+        self.enabled = enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        name = route_class(scope["path"]) if self.enabled and scope["type"] == "http" else None
+        limiter = self.limiters.get(name) if name else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        queued = limiter.active >= limiter.concurrency or limiter.waiting > 0
+        started = time.perf_counter()
+        reason = await limiter.acquire(priority(name, scope["path"], scope.get("query_string", b"")))
+        if reason is not None:
+            SHED.inc((name, reason))
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(limiter.retry_after())}
+            )
+            await response(scope, receive, send)
+            return
+
+        admitted = time.perf_counter()
+        if queued:
+            QUEUED.inc((name,))
+            QUEUE_SECONDS.observe((name,), admitted - started)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - admitted)
@@ -0,0 +1,65 @@
+# app/middleware/compression.py
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils import compression
+
+
+class CompressionMiddleware:
+    """
+    Compress complete response bodies with the best encoding the client accepts.
+
+    Responses that already carry a Content-Encoding (such as precompressed
+    catalog payloads), streamed responses, non-text types and bodies below
+    `minimum_size` are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = compression.COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = compression.negotiate(Headers(scope=scope).get("accept-encoding"))
+        start_message: Message | None = None
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message
+
+            if message["type"] == "http.response.start":
+                # Hold the headers back until we know whether the body gets compressed
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=list(start["headers"]))
+            start["headers"] = headers.raw
+            body = message.get("body", b"")
+
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or not compression.is_compressible(headers.get("content-type"))
+                or len(body) < self.minimum_size
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            compression.add_vary(headers)
+            if encoding is not None:
+                body = compression.compress(body, encoding)
+                headers["content-encoding"] = encoding
+                headers["content-length"] = str(len(body))
+                message = {"type": "http.response.body", "body": body, "more_body": False}
+
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
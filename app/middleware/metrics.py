@@ -0,0 +1,84 @@
+# app/middleware/metrics.py
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils import request_stats
+from app.utils.metrics import registry
+
+REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template.",
+    ("method", "route")
+)
+REQUESTS = registry.counter(
+    "http_requests_total",
+    "Requests by route template and status code.",
+    ("method", "route", "status")
+)
+IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight",
+    "Requests currently being served."
+)
+DB_SECONDS = registry.histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per request.",
+    ("route",)
+)
+DB_QUERIES = registry.histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request.",
+    ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+)
+PHASE_SECONDS = registry.histogram(
+    "http_request_phase_seconds",
+    "Time spent in named phases (serialize, password_hash, ...) per request.",
+    ("route", "phase")
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Record latency, status, in-flight count and the SQL/phase breakdown of each request.
+
+    Routes are labelled by their template (`/by-category/{category}`), taken
+    from the matched route after routing, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+        token = request_stats.start(scope)
+        stats = request_stats.current()
+        IN_FLIGHT.inc()
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            request_stats.reset(token)
+
+            route = stats.route or UNMATCHED_ROUTE
+            method = scope["method"]
+
+            REQUEST_SECONDS.observe((method, route), elapsed)
+            REQUESTS.inc((method, route, str(status_code)))
+            DB_SECONDS.observe((route,), stats.db_seconds)
+            DB_QUERIES.observe((route,), stats.query_count)
+            for phase, seconds in stats.phases.items():
+                PHASE_SECONDS.observe((route, phase), seconds)
@@ -0,0 +1,51 @@
+# app/middleware/profiling.py
+import random
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils import profiling
+
+_HEADER = profiling.PROFILE_HEADER.encode()
+
+
+class ProfilingMiddleware:
+    """
+    Profile single requests with the sampling profiler and store their flame-graph stacks.
+
+    A request is profiled when it carries a valid signed X-Profile header,
+    when an admin armed its path, or at random with PROFILE_SAMPLE_RATE.
+    Otherwise the request passes straight through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def _wants_profile(self, scope: Scope) -> bool:
+        if profiling.PROFILE_SECRET:
+            for name, value in scope["headers"]:
+                if name == _HEADER:
+                    if profiling.verify_token(profiling.PROFILE_SECRET, value.decode("latin-1")):
+                        return True
+                    break
+        if profiling.control.take(scope["path"]):
+            return True
+        return profiling.PROFILE_SAMPLE_RATE > 0 and random.random() < profiling.PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        name = profiling.store.filename(scope["method"], scope["path"])
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-File"] = name
+            await send(message)
+
+        profile = profiling.RequestProfile(self.__call__.__code__)
+        profile.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.stop()
+            profiling.store.write(name, profile.collapsed())
@@ -0,0 +1,23 @@
+# app/middleware/startup.py
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app import startup
+
+
+class FirstRequestMiddleware:
+    """Record the time from the first `import app` to the end of the first HTTP request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.pending = True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if not self.pending or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if self.pending:
+                self.pending = False
+                startup.record_since_import("first_request")
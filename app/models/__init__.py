@@ -2,4 +2,9 @@
 from .users import User
 from .responses import Response
 from .questions import Question
-from .answers import Answer
\ No newline at end of file
+from .answers import Answer
+from .user_scores import UserCategoryScore
+from .daily_stats import DailyUserCategoryStat
+from .catalog_version import CatalogVersion
+from .exam_sessions import ExamSession
+from .user_mastery import UserMastery
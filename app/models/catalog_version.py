@@ -0,0 +1,59 @@
+from sqlalchemy import BigInteger, Column, Integer, TIMESTAMP, event, inspect, text
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class CatalogVersion(Base):
+    """Single-row counter that database triggers bump on every write to questions or answers."""
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=1)
+    updated_at = Column(TIMESTAMP, server_default=func.now())
+
+
+# Kept in step with the catalog_version migration
+POSTGRES_TRIGGERS = [
+    "INSERT INTO catalog_version (id, version) VALUES (1, 1) ON CONFLICT DO NOTHING",
+    """
+    CREATE OR REPLACE FUNCTION catalog_version_bump() RETURNS trigger LANGUAGE plpgsql AS $$
+    DECLARE new_version bigint;
+    BEGIN
+        UPDATE catalog_version SET version = version + 1, updated_at = now() WHERE id = 1
+        RETURNING version INTO new_version;
+        PERFORM pg_notify('catalog_version', new_version::text);
+        RETURN NULL;
+    END
+    $$
+    """,
+    *(
+        statement
+        for table in ("questions", "answers")
+        for statement in (
+            f"DROP TRIGGER IF EXISTS {table}_catalog_version ON {table}",
+            f"CREATE TRIGGER {table}_catalog_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION catalog_version_bump()"
+        )
+    ),
+]
+
+# SQLite has no statement-level triggers; one bump per changed row is fine for local databases
+SQLITE_TRIGGERS = [
+    "INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 1)",
+    *(
+        f"CREATE TRIGGER IF NOT EXISTS {table}_catalog_version_{operation.lower()} AFTER {operation} ON {table} "
+        "BEGIN UPDATE catalog_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1; END"
+        for table in ("questions", "answers")
+        for operation in ("INSERT", "UPDATE", "DELETE")
+    ),
+]
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_triggers(metadata, connection, **kw):
+    """Seed the version row and install the bump triggers when create_all builds the schema."""
+    statements = {"postgresql": POSTGRES_TRIGGERS, "sqlite": SQLITE_TRIGGERS}.get(connection.dialect.name, [])
+    inspector = inspect(connection)
+    if not all(inspector.has_table(name) for name in ("catalog_version", "questions", "answers")):
+        return
+    for statement in statements:
+        connection.execute(text(statement))
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey
+from app.db.base import Base
+
+class DailyUserCategoryStat(Base):
+    """Per-user, per-category, per-day totals for responses compacted out of `responses`."""
+    __tablename__ = "daily_user_category_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    category = Column(String(100), primary_key=True)  # "" for questions without a category
+    day = Column(Date, primary_key=True)
+    answered = Column(Integer, nullable=False, default=0)
+    correct = Column(Integer, nullable=False, default=0)
+    last_answered_at = Column(DateTime, nullable=True)
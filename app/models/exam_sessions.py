@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.db.base import Base
+from app.models.types import PackedIntArray
+
+class ExamSession(Base):
+    """
+    One attempt at a question set.
+
+    The question order and the answers given so far live in two packed
+    arrays on this row, so resuming is a single primary-key read. Responses
+    are only written, in bulk, when the session is finished.
+    """
+    __tablename__ = "exam_sessions"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category = Column(String(100), nullable=False)
+    question_set = Column(String(100), nullable=True)  # None for the "Default" set
+    attempt = Column(Integer, nullable=False)  # 1 for the user's first session on this set
+    question_ids = Column(PackedIntArray, nullable=False)  # in the order they are asked
+    selected_ids = Column(PackedIntArray, nullable=False)  # answer id per position, 0 = not answered yet
+    started_at = Column(DateTime, nullable=False, server_default=func.now())
+    updated_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # Set when the session is finished
+    answered = Column(Integer, nullable=True)
+    correct = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index('ix_exam_sessions_user_set', 'user_id', 'category', 'question_set'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Boolean, ForeignKey, TIMESTAMP, DateTime, Text
+from sqlalchemy import Column, Integer, Boolean, ForeignKey, TIMESTAMP, DateTime, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -11,8 +11,14 @@ class Response(Base):
     question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
     selected_option_id = Column(Integer, ForeignKey("answers.id"), nullable=False)
     is_correct = Column(Boolean, nullable=False)
-    answered_at = Column(DateTime, server_default=func.now())
+    # Partition key on Postgres (monthly ranges), so it is always set
+    answered_at = Column(DateTime, nullable=False, server_default=func.now())
 
     user = relationship("User", back_populates="responses")
     question = relationship("Question")
     selected_option = relationship("Answer")
+
+    __table_args__ = (
+        # Per-user history in time order; INCLUDE makes the dashboard aggregate index-only on Postgres
+        Index('ix_responses_user_answered', 'user_id', 'answered_at', postgresql_include=['question_id', 'is_correct']),
+    )
@@ -0,0 +1,35 @@
+# app/models/types.py
+import sys
+from array import array
+from typing import Iterable, List
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+
+def pack_ints(values: Iterable[int]) -> bytes:
+    """Pack ints as little-endian int32s, 4 bytes each."""
+    packed = array('i', values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_ints(data: bytes) -> List[int]:
+    packed = array('i')
+    packed.frombytes(data)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tolist()
+
+
+class PackedIntArray(TypeDecorator):
+    """A list of ints stored as one binary value (4 bytes per item) instead of a row per item."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else pack_ints(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else unpack_ints(value)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, LargeBinary, DateTime, ForeignKey
+from app.db.base import Base
+
+class UserMastery(Base):
+    """
+    Per-user bitsets over question ordinals (the question id): bit n of
+    `answered` is set once question n was answered, bit n of `correct`
+    holds whether the latest answer to it was correct. Little-endian bytes.
+    """
+    __tablename__ = "user_mastery"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    answered = Column(LargeBinary, nullable=False)
+    correct = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime, nullable=True)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, TIMESTAMP
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class UserCategoryScore(Base):
+    """Running per-user, per-category totals used to rebuild the leaderboards."""
+    __tablename__ = "user_category_scores"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    category = Column(String(100), primary_key=True)  # "" for questions without a category
+    answered = Column(Integer, nullable=False, default=0)
+    correct = Column(Integer, nullable=False, default=0)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
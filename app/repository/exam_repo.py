@@ -0,0 +1,66 @@
+# app/repository/exam_repo.py
+from typing import List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.answers import Answer
+from app.models.exam_sessions import ExamSession
+from app.models.questions import Question
+
+
+def get_question_ids(db: Session, category: str, question_set: Optional[str]) -> List[int]:
+    """Ids of the live questions in a set (None = the "Default" set), in id order."""
+    in_set = Question.question_set.is_(None) if question_set is None else Question.question_set == question_set
+    rows = db.query(Question.id).filter(
+        Question.category == category,
+        in_set,
+        Question.deleted_at.is_(None)
+    ).order_by(Question.id).all()
+    return [row.id for row in rows]
+
+
+def count_attempts(db: Session, user_id: int, category: str, question_set: Optional[str]) -> int:
+    in_set = ExamSession.question_set.is_(None) if question_set is None else ExamSession.question_set == question_set
+    return db.query(func.count(ExamSession.id)).filter(
+        ExamSession.user_id == user_id,
+        ExamSession.category == category,
+        in_set
+    ).scalar()
+
+
+def create_session(db: Session, user_id: int, category: str, question_set: Optional[str],
+                   attempt: int, question_ids: List[int]) -> ExamSession:
+    session = ExamSession(
+        user_id=user_id,
+        category=category,
+        question_set=question_set,
+        attempt=attempt,
+        question_ids=question_ids,
+        selected_ids=[0] * len(question_ids)
+    )
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+    return session
+
+
+def get_session(db: Session, session_id: int, for_update: bool = False) -> Optional[ExamSession]:
+    """Load a session by primary key; `for_update` locks the row until commit (Postgres)."""
+    if for_update:
+        return db.query(ExamSession).filter(ExamSession.id == session_id).with_for_update().one_or_none()
+    return db.get(ExamSession, session_id)
+
+
+def get_answer_question_id(db: Session, answer_id: int) -> Optional[int]:
+    """The question a live answer option belongs to, or None."""
+    return db.query(Answer.question_id).filter(
+        Answer.id == answer_id,
+        Answer.deleted_at.is_(None)
+    ).scalar()
+
+
+def get_correct_answer_ids(db: Session, answer_ids: List[int]) -> set:
+    """The subset of `answer_ids` that are correct options."""
+    if not answer_ids:
+        return set()
+    rows = db.query(Answer.id).filter(Answer.id.in_(set(answer_ids)), Answer.is_correct == True).all()
+    return {row.id for row in rows}
@@ -0,0 +1,66 @@
+# app/repository/export_repo.py
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.models.responses import Response
+from app.models.questions import Question
+from app.models.answers import Answer
+
+EXPORT_COLUMNS = [
+    'response_id',
+    'user_id',
+    'question_id',
+    'category',
+    'question_set',
+    'selected_option_id',
+    'selected_option',
+    'is_correct',
+    'answered_at',
+]
+
+
+def iter_responses(
+    db: Session,
+    user_id: int | None = None,
+    category: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    min_id: int | None = None,
+    max_id: int | None = None,
+    batch_size: int = 1000
+):
+    """
+    Stream response rows joined to their question and selected answer.
+
+    Rows are fetched `batch_size` at a time through a server-side cursor,
+    so memory stays flat regardless of how many rows match.
+    """
+    query = db.query(
+        Response.id.label('response_id'),
+        Response.user_id,
+        Response.question_id,
+        Question.category,
+        Question.question_set,
+        Response.selected_option_id,
+        Answer.content.label('selected_option'),
+        Response.is_correct,
+        Response.answered_at
+    ).join(
+        Question, Response.question_id == Question.id
+    ).outerjoin(
+        Answer, Response.selected_option_id == Answer.id
+    )
+
+    if user_id is not None:
+        query = query.filter(Response.user_id == user_id)
+    if category is not None:
+        query = query.filter(Question.category == category)
+    if start is not None:
+        query = query.filter(Response.answered_at >= start)
+    if end is not None:
+        query = query.filter(Response.answered_at < end)
+    if min_id is not None:
+        query = query.filter(Response.id >= min_id)
+    if max_id is not None:
+        query = query.filter(Response.id <= max_id)
+
+    return query.order_by(Response.id).yield_per(batch_size)
@@ -0,0 +1,81 @@
+# app/repository/leaderboard_repo.py
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Dict, Iterable, List, Tuple
+from app.models.questions import Question
+from app.models.user_scores import UserCategoryScore
+from app.models.users import User
+
+
+def _insert(db: Session):
+    """Return the dialect-specific INSERT construct that supports ON CONFLICT."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(UserCategoryScore)
+    return sqlite.insert(UserCategoryScore)
+
+
+def get_question_categories(db: Session, question_ids: Iterable[int]) -> Dict[int, str]:
+    """Map question ids to their category ("" when the question has none)."""
+    rows = db.query(Question.id, Question.category).filter(
+        Question.id.in_(set(question_ids))
+    ).all()
+
+    return {row.id: row.category or "" for row in rows}
+
+
+def apply_score_deltas(db: Session, user_id: int, deltas: Dict[str, Tuple[int, int]]):
+    """Add (answered, correct) deltas to the user's per-category rollup rows (no commit)."""
+    apply_score_deltas_for_users(db, {user_id: deltas})
+
+
+def apply_score_deltas_for_users(db: Session, deltas_by_user: Dict[int, Dict[str, Tuple[int, int]]]):
+    """apply_score_deltas for several users in one multi-row upsert (no commit)."""
+    values = [
+        {'user_id': user_id, 'category': category, 'answered': answered, 'correct': correct}
+        for user_id, deltas in deltas_by_user.items()
+        for category, (answered, correct) in deltas.items()
+    ]
+    if not values:
+        return
+
+    stmt = _insert(db).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserCategoryScore.user_id, UserCategoryScore.category],
+        set_={
+            'answered': UserCategoryScore.answered + stmt.excluded.answered,
+            'correct': UserCategoryScore.correct + stmt.excluded.correct,
+        }
+    )
+    db.execute(stmt)
+
+
+def get_user_scores(db: Session, user_id: int) -> List[UserCategoryScore]:
+    """Get all rollup rows for a user."""
+    return db.query(UserCategoryScore).filter(UserCategoryScore.user_id == user_id).all()
+
+
+def get_scores_for_users(db: Session, user_ids: Iterable[int]) -> List[UserCategoryScore]:
+    """Get the rollup rows of several users in one query."""
+    return db.query(UserCategoryScore).filter(UserCategoryScore.user_id.in_(set(user_ids))).all()
+
+
+def iter_all_scores(db: Session, batch_size: int = 1000):
+    """Stream every rollup row ordered by user so totals can be folded per user."""
+    return db.query(
+        UserCategoryScore.user_id,
+        UserCategoryScore.category,
+        UserCategoryScore.answered,
+        UserCategoryScore.correct
+    ).order_by(
+        UserCategoryScore.user_id
+    ).yield_per(batch_size)
+
+
+def get_account_names(db: Session, user_ids: Iterable[int]) -> Dict[int, str]:
+    """Map user ids to account names."""
+    ids = set(user_ids)
+    if not ids:
+        return {}
+
+    rows = db.query(User.id, User.account_name).filter(User.id.in_(ids)).all()
+    return {row.id: row.account_name for row in rows}
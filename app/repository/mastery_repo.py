@@ -0,0 +1,77 @@
+# app/repository/mastery_repo.py
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.questions import Question
+from app.models.responses import Response
+from app.models.user_mastery import UserMastery
+
+
+def get_mastery(db: Session, user_id: int, for_update: bool = False) -> Optional[UserMastery]:
+    """The user's bitset row; `for_update` locks it until commit (Postgres)."""
+    query = db.query(UserMastery).filter(UserMastery.user_id == user_id)
+    if for_update:
+        query = query.with_for_update()
+    return query.one_or_none()
+
+
+def get_masteries(db: Session, user_ids: Iterable[int], for_update: bool = False) -> Dict[int, UserMastery]:
+    """The bitset rows of several users that have one, by user id; `for_update` as above."""
+    query = db.query(UserMastery).filter(UserMastery.user_id.in_(set(user_ids))).order_by(UserMastery.user_id)
+    if for_update:
+        query = query.with_for_update()
+    return {row.user_id: row for row in query}
+
+
+def create_empty_masteries(db: Session, user_ids: Iterable[int]):
+    """
+    Insert empty bitset rows for users that have none (no commit).
+
+    On Postgres a concurrent insert of the same user waits for the other
+    transaction and then does nothing, so a following FOR UPDATE read
+    sees, and locks, whichever row won.
+    """
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    db.execute(insert(UserMastery).values([
+        {'user_id': user_id, 'answered': b"", 'correct': b"", 'updated_at': func.now()} for user_id in user_ids
+    ]).on_conflict_do_nothing(index_elements=[UserMastery.user_id]))
+
+
+def save_mastery(db: Session, user_id: int, answered: bytes, correct: bytes):
+    """Insert or overwrite the user's bitsets (no commit)."""
+    save_masteries(db, {user_id: (answered, correct)})
+
+
+def save_masteries(db: Session, bitsets_by_user: Dict[int, Tuple[bytes, bytes]]):
+    """Insert or overwrite several users' (answered, correct) bitsets in one statement (no commit)."""
+    if not bitsets_by_user:
+        return
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    stmt = insert(UserMastery).values([
+        {'user_id': user_id, 'answered': answered, 'correct': correct, 'updated_at': func.now()}
+        for user_id, (answered, correct) in bitsets_by_user.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserMastery.user_id],
+        set_={'answered': stmt.excluded.answered, 'correct': stmt.excluded.correct, 'updated_at': stmt.excluded.updated_at}
+    )
+    db.execute(stmt)
+
+
+def iter_answer_histories(db: Session):
+    """(user_id, question_id, is_correct) of every raw response, by user and oldest first."""
+    return db.query(Response.user_id, Response.question_id, Response.is_correct).order_by(
+        Response.user_id, Response.answered_at, Response.id
+    ).yield_per(5000)
+
+
+def get_set_question_ids(db: Session, category: str) -> List[tuple]:
+    """(question_set, question_id) of every live question in a category."""
+    return db.query(Question.question_set, Question.id).filter(
+        Question.category == category,
+        Question.deleted_at.is_(None)
+    ).all()
@@ -1,9 +1,13 @@
 # app/repository/question_repo.py
+from typing import Callable, FrozenSet, Iterable, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, func, or_
 from app.models.questions import Question
 from app.models.answers import Answer
 
+# Fields a client can leave out of question payloads with ?fields= (everything else is always sent)
+OPTIONAL_FIELDS: FrozenSet[str] = frozenset({"explanation", "is_correct", "image_url"})
+
 
 def get_all_categories(db: Session):
     """Get all unique categories from questions table."""
@@ -23,6 +27,49 @@ def count_questions_by_category(db: Session, category: str):
     ).count()
 
 
+def count_questions_per_category(db: Session):
+    """Count questions in every category with a single GROUP BY."""
+    rows = db.query(
+        Question.category,
+        func.count(Question.id).label('question_count')
+    ).filter(
+        Question.category.isnot(None),
+        Question.category != "",
+        Question.deleted_at.is_(None)
+    ).group_by(Question.category).order_by(Question.category).all()
+
+    return [(row.category, row.question_count) for row in rows]
+
+
+def _set_info(row) -> dict:
+    return {
+        'question_set': row.question_set or "Default",
+        'question_count': row.question_count,
+        'question_range': f"{row.min_id}-{row.max_id}"
+    }
+
+
+def get_question_sets_per_category(db: Session):
+    """Get the question sets of every category with a single GROUP BY."""
+    rows = db.query(
+        Question.category,
+        Question.question_set,
+        func.count(Question.id).label('question_count'),
+        func.min(Question.id).label('min_id'),
+        func.max(Question.id).label('max_id')
+    ).filter(
+        Question.category.isnot(None),
+        Question.category != "",
+        Question.deleted_at.is_(None)
+    ).group_by(Question.category, Question.question_set).order_by(Question.category).all()
+
+    sets_by_category = {}
+    for row in rows:
+        sets_by_category.setdefault(row.category, []).append(_set_info(row))
+
+    return sets_by_category
+
+
 def get_question_sets_by_category(db: Session, category: str):
     """Get all question sets/dumps for a specific category with their details."""
     # Get all questions in this category grouped by question_set
@@ -36,92 +83,112 @@ def get_question_sets_by_category(db: Session, category: str):
         Question.deleted_at.is_(None)
     ).group_by(Question.question_set).all()
 
-    sets_info = []
-    for result in results:
-        question_set = result.question_set or "Default"
-        question_range = f"{result.min_id}-{result.max_id}"
+    return [_set_info(result) for result in results]
+
+
+def _questions_with_answers(db: Session, *criteria, fields: FrozenSet[str] = OPTIONAL_FIELDS, with_set: bool = False,
+                            keep: Optional[Callable[[int], bool]] = None):
+    """
+    Load the questions matching `criteria` plus all of their answers.
+
+    Always two statements: answers are fetched by joining back to the same
+    question filter rather than one query per question. Only the columns
+    the payload needs are selected: of the optional ones, those in `fields`.
+    `with_set` adds each question's `question_set` ("Default" when it has none).
+    `keep`, given a question id, drops the questions it returns False for
+    (their answers are not fetched).
+    """
+    criteria = criteria + (Question.deleted_at.is_(None),)
+    columns = [Question.id, Question.content]
+    if "image_url" in fields:
+        columns.append(Question.image_url)
+    columns.append(Question.category)
+    if with_set:
+        columns.append(Question.question_set)
+    questions = db.query(*columns).filter(*criteria).order_by(Question.id).all()
+    if keep is not None:
+        kept = [question for question in questions if keep(question.id)]
+        if len(kept) < len(questions):
+            criteria += (Question.id.in_([question.id for question in kept]),)
+        questions = kept
+    if not questions:
+        return []
+
+    columns = [Answer.question_id, Answer.id, Answer.content]
+    if "is_correct" in fields:
+        columns.append(Answer.is_correct)
+    if "explanation" in fields:
+        columns.append(Answer.explanation)
+    answers = db.query(*columns).join(
+        Question, Answer.question_id == Question.id
+    ).filter(
+        *criteria,
+        Answer.deleted_at.is_(None)
+    ).order_by(Answer.question_id, Answer.id).all()
+
+    answers_by_question = {}
+    for answer in answers:
+        answer = answer._asdict()
+        answers_by_question.setdefault(answer.pop('question_id'), []).append(answer)
 
-        sets_info.append({
-            'question_set': question_set,
-            'question_count': result.question_count,
-            'question_range': question_range
-        })
+    results = []
+    for question in questions:
+        result = question._asdict()
+        if with_set:
+            result['question_set'] = result['question_set'] or "Default"
+        result['answers'] = answers_by_question.get(question.id, [])
+        results.append(result)
+    return results
 
-    return sets_info
 
+def get_questions_by_category(db: Session, category: str, fields: FrozenSet[str] = OPTIONAL_FIELDS,
+                              keep: Optional[Callable[[int], bool]] = None):
+    """Get all questions with answers for a specific category (only those `keep` accepts, when given)."""
+    return _questions_with_answers(db, Question.category == category, fields=fields, keep=keep)
 
-def get_questions_by_category(db: Session, category: str):
-    """Get all questions with answers for a specific category."""
-    questions = db.query(Question).filter(
-        Question.category == category,
-        Question.deleted_at.is_(None)
-    ).all()
 
-    result = []
-    for question in questions:
-        # Get all answers for this question
-        answers = db.query(Answer).filter(
-            Answer.question_id == question.id,
-            Answer.deleted_at.is_(None)
-        ).all()
-
-        result.append({
-            'id': question.id,
-            'content': question.content,
-            'image_url': question.image_url,
-            'category': question.category,
-            'answers': [
-                {
-                    'id': answer.id,
-                    'content': answer.content,
-                    'is_correct': answer.is_correct,
-                    'explanation': answer.explanation
-                }
-                for answer in answers
-            ]
-        })
-
-    return result
-
-
-def get_questions_by_category_and_set(db: Session, category: str, question_set: str):
-    """Get all questions with answers for a specific category and question set."""
+def _in_set(category: str, question_set: str):
     # Handle "Default" as NULL/None in database
     if question_set == "Default":
-        questions = db.query(Question).filter(
-            Question.category == category,
-            Question.question_set.is_(None),
-            Question.deleted_at.is_(None)
-        ).all()
-    else:
-        questions = db.query(Question).filter(
-            Question.category == category,
-            Question.question_set == question_set,
-            Question.deleted_at.is_(None)
-        ).all()
-
-    result = []
-    for question in questions:
-        # Get all answers for this question
-        answers = db.query(Answer).filter(
-            Answer.question_id == question.id,
-            Answer.deleted_at.is_(None)
-        ).all()
-
-        result.append({
-            'id': question.id,
-            'content': question.content,
-            'image_url': question.image_url,
-            'category': question.category,
-            'answers': [
-                {
-                    'id': answer.id,
-                    'content': answer.content,
-                    'is_correct': answer.is_correct,
-                    'explanation': answer.explanation
-                }
-                for answer in answers
-            ]
-        })
-
-    return result
+        return and_(Question.category == category, Question.question_set.is_(None))
+    return and_(Question.category == category, Question.question_set == question_set)
+
+
+def get_questions_by_category_and_set(db: Session, category: str, question_set: str,
+                                      fields: FrozenSet[str] = OPTIONAL_FIELDS,
+                                      keep: Optional[Callable[[int], bool]] = None):
+    """Get all questions with answers for a specific category and question set (filtered by `keep` as above)."""
+    return _questions_with_answers(db, _in_set(category, question_set), fields=fields, keep=keep)
+
+
+def get_questions_in_sets_or_ids(db: Session, sets: Iterable[Tuple[str, str]], question_ids: List[int],
+                                 fields: FrozenSet[str] = OPTIONAL_FIELDS):
+    """
+    Questions (with answers and their set) belonging to any of the (category,
+    set) pairs or listed in `question_ids`; each question once, in id order.
+    """
+    criteria = [_in_set(category, question_set) for category, question_set in sets]
+    if question_ids:
+        criteria.append(Question.id.in_(question_ids))
+    if not criteria:
+        return []
+    return _questions_with_answers(db, or_(*criteria), fields=fields, with_set=True)
+
+
+def get_question_explanation(db: Session, question_id: int):
+    """
+    Correctness and explanation of each answer of a live question in one
+    query, or None when there is no such question.
+    """
+    rows = db.query(Answer.id, Answer.is_correct, Answer.explanation).select_from(Question).outerjoin(
+        Answer, and_(Answer.question_id == Question.id, Answer.deleted_at.is_(None))
+    ).filter(
+        Question.id == question_id,
+        Question.deleted_at.is_(None)
+    ).order_by(Answer.id).all()
+    if not rows:
+        return None
+    return {
+        'question_id': question_id,
+        'answers': [row._asdict() for row in rows if row.id is not None]
+    }
@@ -1,7 +1,10 @@
 # app/repository/response_repo.py
+from datetime import datetime
+from functools import lru_cache
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
+from sqlalchemy import func, insert, select, literal, cast, null, union_all, case, bindparam, Boolean, DateTime, Integer, Text
+from typing import Dict, List, Optional
+from app.models.daily_stats import DailyUserCategoryStat
 from app.models.responses import Response
 from app.models.questions import Question
 from app.models.users import User
@@ -24,26 +27,50 @@ def create_response(db: Session, user_id: int, response_data: ResponseCreate) ->
 
 def create_responses_bulk(db: Session, user_id: int, responses: List[ResponseCreate]) -> List[Response]:
     """Create multiple response records at once."""
-    db_responses = [
-        Response(
-            user_id=user_id,
-            question_id=r.question_id,
-            selected_option_id=r.selected_option_id,
-            is_correct=r.is_correct
-        )
+    if not responses:
+        return []
+
+    # One multi-row INSERT ... RETURNING, then one SELECT to load the committed rows
+    result = db.execute(
+        insert(Response).returning(Response.id),
+        [
+            {
+                'user_id': user_id,
+                'question_id': r.question_id,
+                'selected_option_id': r.selected_option_id,
+                'is_correct': r.is_correct
+            }
+            for r in responses
+        ]
+    )
+    ids = list(result.scalars())
+    db.commit()
+    return db.query(Response).filter(Response.id.in_(ids)).order_by(Response.id).all()
+
+
+def create_responses_for_users(db: Session, responses_by_user: Dict[int, List[ResponseCreate]]):
+    """Insert several users' responses in one executemany INSERT (no commit, rows not loaded back)."""
+    rows = [
+        {
+            'user_id': user_id,
+            'question_id': r.question_id,
+            'selected_option_id': r.selected_option_id,
+            'is_correct': r.is_correct
+        }
+        for user_id, responses in responses_by_user.items()
         for r in responses
     ]
-    db.add_all(db_responses)
-    db.commit()
-    for r in db_responses:
-        db.refresh(r)
-    return db_responses
+    if rows:
+        db.execute(insert(Response), rows)
 
 
 def get_user_statistics(db: Session, user_id: int):
-    """Get user's quiz statistics grouped by category."""
-    from sqlalchemy import Integer, case
+    """
+    Get user's quiz statistics grouped by category.
 
+    Raw responses are combined with the daily rollups of compacted history,
+    so the totals do not change when old responses are compacted.
+    """
     stats = db.query(
         Question.category,
         func.count(Response.id).label('total_answered'),
@@ -58,22 +85,41 @@ def get_user_statistics(db: Session, user_id: int):
         Question.category
     ).all()
 
+    rollups = db.query(
+        DailyUserCategoryStat.category,
+        func.sum(DailyUserCategoryStat.answered),
+        func.sum(DailyUserCategoryStat.correct),
+        func.max(DailyUserCategoryStat.last_answered_at)
+    ).filter(
+        DailyUserCategoryStat.user_id == user_id
+    ).group_by(
+        DailyUserCategoryStat.category
+    ).all()
+
+    totals = {}
+    for category, answered, correct, last_attempt in [*stats, *((c or None, a, k, l) for c, a, k, l in rollups)]:
+        total = totals.setdefault(category, [0, 0, None])
+        total[0] += answered
+        total[1] += correct or 0
+        if last_attempt is not None and (total[2] is None or last_attempt > total[2]):
+            total[2] = last_attempt
+
     return [
         {
-            'category': stat[0],
-            'total_answered': stat[1],
-            'correct_answers': stat[2] or 0,
-            'wrong_answers': stat[1] - (stat[2] or 0),
-            'accuracy': round((stat[2] or 0) / stat[1] * 100, 1) if stat[1] > 0 else 0,
-            'last_attempt': stat[3].isoformat() if stat[3] else None
+            'category': category,
+            'total_answered': answered,
+            'correct_answers': correct,
+            'wrong_answers': answered - correct,
+            'accuracy': round(correct / answered * 100, 1) if answered > 0 else 0,
+            'last_attempt': last_attempt.isoformat() if last_attempt else None
         }
-        for stat in stats
+        for category, (answered, correct, last_attempt) in totals.items()
     ]
 
 
-def get_user_recent_activity(db: Session, user_id: int, limit: int = 10):
-    """Get user's recent quiz activity."""
-    activities = db.query(
+def get_user_recent_activity(db: Session, user_id: int, limit: int = 10, since: Optional[datetime] = None):
+    """Get user's recent quiz activity (answered at or after `since`, when given)."""
+    query = db.query(
         Response.id,
         Question.category,
         Question.content,
@@ -84,7 +130,10 @@ def get_user_recent_activity(db: Session, user_id: int, limit: int = 10):
     ).filter(
         Response.user_id == user_id,
         Question.deleted_at.is_(None)
-    ).order_by(
+    )
+    if since is not None:
+        query = query.filter(Response.answered_at >= since)
+    activities = query.order_by(
         Response.answered_at.desc()
     ).limit(limit).all()
 
@@ -98,3 +147,186 @@ def get_user_recent_activity(db: Session, user_id: int, limit: int = 10):
         }
         for activity in activities
     ]
+
+
+@lru_cache(maxsize=None)
+def _dashboard_statement(dialect_name: str, windowed: bool = False):
+    """
+    Build the dashboard statement once per dialect.
+
+    Per-category rows and the overall total combine raw responses with the
+    daily rollups of compacted history, summed with a ROLLUP on Postgres
+    (a UNION ALL over the per-category rows elsewhere); recent activity
+    previews are truncated in SQL so full question texts never leave the
+    database. Inputs are bind parameters, so the construct is reusable.
+
+    `windowed` bounds the recent-activity rows by `answered_at >= :since`,
+    which lets Postgres prune every monthly partition older than the window.
+    """
+    correct = func.sum(case((Response.is_correct == True, 1), else_=0))
+    answered_rows = select(Response.id).join(
+        Question, Response.question_id == Question.id
+    ).where(
+        Response.user_id == bindparam('user_id'),
+        Question.deleted_at.is_(None)
+    )
+
+    # Raw responses plus the daily rollups of compacted history, one row per source and category
+    raw = answered_rows.with_only_columns(
+        Question.category.label('category'),
+        func.count(Response.id).label('answered'),
+        correct.label('correct'),
+        func.max(Response.answered_at).label('last_attempt')
+    ).group_by(Question.category)
+    compacted = select(
+        func.nullif(DailyUserCategoryStat.category, "").label('category'),
+        func.sum(DailyUserCategoryStat.answered),
+        func.sum(DailyUserCategoryStat.correct),
+        func.max(DailyUserCategoryStat.last_answered_at)
+    ).where(
+        DailyUserCategoryStat.user_id == bindparam('user_id')
+    ).group_by(DailyUserCategoryStat.category)
+    history = union_all(raw, compacted).cte('history')
+    # SUM over BIGINT counts is NUMERIC on Postgres; keep the totals integers
+    history_answered = cast(func.sum(history.c.answered), Integer)
+    history_correct = cast(func.sum(history.c.correct), Integer)
+
+    if dialect_name == "postgresql":
+        stats = select(
+            history.c.category,
+            func.grouping(history.c.category).label('is_total'),
+            history_answered.label('total_answered'),
+            history_correct.label('correct_answers'),
+            func.max(history.c.last_attempt).label('last_attempt')
+        ).group_by(func.rollup(history.c.category)).cte('stats')
+    else:
+        per_category = select(
+            history.c.category,
+            history_answered.label('total_answered'),
+            history_correct.label('correct_answers'),
+            func.max(history.c.last_attempt).label('last_attempt')
+        ).group_by(history.c.category).cte('per_category')
+        # Emulate ROLLUP by folding the per-category rows rather than rescanning responses
+        total = select(
+            cast(null(), Question.category.type).label('category'),
+            literal(1).label('is_total'),
+            func.coalesce(func.sum(per_category.c.total_answered), 0).label('total_answered'),
+            func.coalesce(func.sum(per_category.c.correct_answers), 0).label('correct_answers'),
+            func.max(per_category.c.last_attempt).label('last_attempt')
+        )
+        per_category_rows = select(
+            per_category.c.category,
+            literal(0).label('is_total'),
+            per_category.c.total_answered,
+            per_category.c.correct_answers,
+            per_category.c.last_attempt
+        )
+        stats = union_all(per_category_rows, total).cte('stats')
+
+    # Pick the latest rows first and only then join back for the preview,
+    # so truncation runs on `recent_limit` rows instead of the whole history
+    latest = answered_rows.with_only_columns(
+        Response.id.label('response_id'),
+        Response.question_id.label('question_id'),
+        Response.is_correct.label('is_correct'),
+        Response.answered_at.label('answered_at')
+    )
+    if windowed:
+        latest = latest.where(Response.answered_at >= bindparam('since'))
+    latest = latest.order_by(
+        Response.answered_at.desc(), Response.id.desc()
+    ).limit(bindparam('recent_limit')).cte('latest')
+    preview = case(
+        (
+            func.length(Question.content) > bindparam('preview_length'),
+            func.substr(Question.content, 1, bindparam('preview_length')) + '...'
+        ),
+        else_=Question.content
+    )
+    recent = select(
+        latest.c.response_id,
+        Question.category.label('category'),
+        preview.label('question_preview'),
+        latest.c.is_correct,
+        latest.c.answered_at
+    ).join(
+        Question, latest.c.question_id == Question.id
+    ).cte('recent')
+
+    # Both CTEs share one result set; `kind` tells the rows apart
+    return union_all(
+        select(
+            literal('stats').label('kind'),
+            stats.c.category,
+            stats.c.is_total,
+            stats.c.total_answered,
+            stats.c.correct_answers,
+            stats.c.last_attempt,
+            cast(null(), Integer).label('response_id'),
+            cast(null(), Text).label('question_preview'),
+            cast(null(), Boolean).label('is_correct'),
+            cast(null(), DateTime).label('answered_at')
+        ),
+        select(
+            literal('recent').label('kind'),
+            recent.c.category,
+            cast(null(), Integer),
+            cast(null(), Integer),
+            cast(null(), Integer),
+            cast(null(), DateTime),
+            recent.c.response_id,
+            recent.c.question_preview,
+            recent.c.is_correct,
+            recent.c.answered_at
+        )
+    )
+
+
+def get_user_dashboard(db: Session, user_id: int, recent_limit: int = 10, preview_length: int = 100, since: Optional[datetime] = None):
+    """
+    Get per-category stats, overall totals and recent activity in one statement.
+
+    With `since`, recent activity only looks at answers from then on.
+    """
+    statement = _dashboard_statement(db.get_bind().dialect.name, since is not None)
+    params = {'user_id': user_id, 'recent_limit': recent_limit, 'preview_length': preview_length}
+    if since is not None:
+        params['since'] = since
+
+    overall = {'total_answered': 0, 'total_correct': 0}
+    by_category = []
+    recent_activity = []
+
+    for row in db.execute(statement, params):
+        if row.kind == 'recent':
+            recent_activity.append(row)
+        elif row.is_total:
+            overall = {'total_answered': row.total_answered or 0, 'total_correct': row.correct_answers or 0}
+        else:
+            correct_answers = row.correct_answers or 0
+            by_category.append({
+                'category': row.category,
+                'total_answered': row.total_answered,
+                'correct_answers': correct_answers,
+                'wrong_answers': row.total_answered - correct_answers,
+                'accuracy': round(correct_answers / row.total_answered * 100, 1) if row.total_answered > 0 else 0,
+                'last_attempt': row.last_attempt.isoformat() if row.last_attempt else None
+            })
+
+    # UNION ALL does not preserve the CTE's ordering
+    recent_activity.sort(key=lambda r: (r.answered_at is not None, r.answered_at, r.response_id), reverse=True)
+
+    return {
+        'overall': overall,
+        'by_category': by_category,
+        'recent_activity': [
+            {
+                'id': activity.response_id,
+                'category': activity.category,
+                'question_preview': activity.question_preview,
+                'is_correct': activity.is_correct,
+                'answered_at': activity.answered_at.isoformat() if activity.answered_at else None
+            }
+            for activity in recent_activity
+        ]
+    }
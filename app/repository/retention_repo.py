@@ -0,0 +1,66 @@
+# app/repository/retention_repo.py
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import and_, case, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.daily_stats import DailyUserCategoryStat
+from app.models.questions import Question
+from app.models.responses import Response
+
+
+def _batch(cutoff: datetime, first_id: int, last_id: int):
+    """The rows of one compaction batch: old enough, inside an id range."""
+    return and_(Response.answered_at < cutoff, Response.id.between(first_id, last_id))
+
+
+def next_batch(db: Session, cutoff: datetime, after_id: int, batch_size: int) -> Optional[tuple]:
+    """(first_id, last_id) of the next `batch_size` responses answered before `cutoff`, or None when done."""
+    ids = select(Response.id).where(
+        Response.answered_at < cutoff, Response.id > after_id
+    ).order_by(Response.id).limit(batch_size).subquery()
+    first_id, last_id = db.execute(select(func.min(ids.c.id), func.max(ids.c.id))).one()
+    return None if first_id is None else (first_id, last_id)
+
+
+def roll_up_batch(db: Session, cutoff: datetime, first_id: int, last_id: int) -> int:
+    """Add one batch's per-user, per-category, per-day totals to the daily stats (no commit)."""
+    category = func.coalesce(Question.category, "")
+    day = func.date(Response.answered_at)
+    totals = select(
+        Response.user_id,
+        category,
+        day,
+        func.count(Response.id),
+        func.sum(case((Response.is_correct == True, 1), else_=0)),
+        func.max(Response.answered_at)
+    ).join(
+        Question, Question.id == Response.question_id
+    ).where(
+        _batch(cutoff, first_id, last_id)
+    ).group_by(Response.user_id, category, day)
+
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    stmt = insert(DailyUserCategoryStat).from_select(
+        ['user_id', 'category', 'day', 'answered', 'correct', 'last_answered_at'], totals
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailyUserCategoryStat.user_id, DailyUserCategoryStat.category, DailyUserCategoryStat.day],
+        set_={
+            'answered': DailyUserCategoryStat.answered + stmt.excluded.answered,
+            'correct': DailyUserCategoryStat.correct + stmt.excluded.correct,
+            'last_answered_at': case(
+                (DailyUserCategoryStat.last_answered_at > stmt.excluded.last_answered_at, DailyUserCategoryStat.last_answered_at),
+                else_=stmt.excluded.last_answered_at
+            ),
+        }
+    )
+    return db.execute(stmt).rowcount
+
+
+def delete_batch(db: Session, cutoff: datetime, first_id: int, last_id: int) -> int:
+    """Delete one batch of raw responses (no commit); returns the number of rows removed."""
+    return db.execute(
+        delete(Response).where(_batch(cutoff, first_id, last_id)).execution_options(synchronize_session=False)
+    ).rowcount
+
@@ -0,0 +1,90 @@
+# app/schemas/admin.py
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal
+
+
+class SlowQuery(BaseModel):
+    """A statement that ran longer than SLOW_QUERY_THRESHOLD_MS (bind parameters redacted)"""
+    id: int
+    at: str
+    duration_ms: float
+    route: str | None
+    statement: str
+    parameters: Any
+    executemany: int | None
+    plan: str | None
+    plan_error: str | None
+
+
+class SlowQueryLogOut(BaseModel):
+    threshold_ms: float
+    entries: List[SlowQuery]
+
+
+class ProfileFile(BaseModel):
+    name: str
+    size: int
+    modified: float
+
+
+class ProfilingStatus(BaseModel):
+    """Profiling triggers that are currently enabled, and the stored collapsed-stack files"""
+    header_enabled: bool
+    sample_rate: float
+    armed: Dict[str, int]
+    files: List[ProfileFile]
+
+
+class ProfilingArm(BaseModel):
+    path_prefix: str
+    requests: int = 1
+
+
+class TracemallocStart(BaseModel):
+    frames: int = Field(1, ge=1, le=50)
+
+
+class SnapshotCreate(BaseModel):
+    label: str | None = None
+
+
+class SnapshotInfo(BaseModel):
+    id: int
+    label: str | None
+    taken_at: float
+    traced_bytes: int
+    rss_bytes: int | None
+
+
+class TracemallocStatus(BaseModel):
+    tracing: bool
+    frames: int | None
+    started_at: float | None
+    stops_at: float | None
+    traced_bytes: int
+    traced_peak_bytes: int
+    overhead_bytes: int
+    snapshots: List[SnapshotInfo]
+
+
+class AllocationSite(BaseModel):
+    """One tracemalloc statistic; the *_diff fields are only set in diffs"""
+    site: str
+    size_bytes: int
+    count: int
+    traceback: List[str] | None = None
+    size_diff_bytes: int | None = None
+    count_diff: int | None = None
+
+
+class AllocationReport(BaseModel):
+    key_type: Literal["lineno", "filename", "traceback"]
+    sites: List[AllocationSite]
+
+
+class MemorySummary(BaseModel):
+    process: Dict[str, int | None]
+    gc: Dict[str, Any]
+    orm: Dict[str, Any]
+    caches: Dict[str, Any]
+    tracemalloc: TracemallocStatus
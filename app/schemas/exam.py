@@ -0,0 +1,46 @@
+# app/schemas/exam.py
+from pydantic import BaseModel
+from typing import List
+from datetime import datetime
+
+
+class ExamStart(BaseModel):
+    category: str
+    question_set: str | None = None  # None or "Default" for questions without a set
+    shuffle: bool = False
+
+
+class ExamAnswer(BaseModel):
+    question_id: int
+    selected_option_id: int
+
+
+class ExamProgress(BaseModel):
+    session_id: int
+    answered: int
+    total: int
+
+
+class ExamSessionOut(BaseModel):
+    id: int
+    category: str
+    question_set: str | None
+    attempt: int
+    question_ids: List[int]
+    # Aligned with question_ids; None where the question is not answered yet
+    selected_option_ids: List[int | None]
+    answered: int
+    total: int
+    next_index: int | None  # first unanswered position, None when all are answered
+    started_at: datetime | None
+    finished_at: datetime | None
+    correct: int | None
+
+
+class ExamResult(BaseModel):
+    session_id: int
+    attempt: int
+    total: int
+    answered: int
+    correct: int
+    accuracy: float
@@ -0,0 +1,26 @@
+# app/schemas/leaderboard.py
+from pydantic import BaseModel
+from typing import List
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    account_name: str
+    total_answered: int
+    correct_answers: int
+    accuracy: float
+
+
+class LeaderboardOut(BaseModel):
+    category: str | None
+    metric: str
+    total_ranked: int
+    entries: List[LeaderboardEntry]
+
+
+class UserRank(BaseModel):
+    """A user's position on the correct-answers and accuracy boards (None = unranked)"""
+    correct_rank: int | None
+    accuracy_rank: int | None
+    ranked_users: int
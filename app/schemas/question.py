@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import List
+from functools import lru_cache
+from pydantic import BaseModel, Field, create_model
+from typing import FrozenSet, List, Optional
+from app.repository.question_repo import OPTIONAL_FIELDS
 
 
 class CategoryOut(BaseModel):
@@ -51,6 +53,85 @@ class QuestionWithAnswers(BaseModel):
         from_attributes = True
 
 
+def _suffix(fields: FrozenSet[str]) -> str:
+    # Model name suffix of a field combination, e.g. "ImageUrlIsCorrect"
+    return "".join(name.title().replace("_", "") for name in sorted(fields)) or "Bare"
+
+
+@lru_cache(maxsize=None)
+def sparse_question_type(fields: FrozenSet[str]):
+    """
+    QuestionWithAnswers keeping only the optional `fields` given; the full
+    model when all of them are asked for. Built once per combination.
+    """
+    if fields >= OPTIONAL_FIELDS:
+        return QuestionWithAnswers
+    suffix = _suffix(fields)
+    answer = create_model(
+        f"AnswerOut{suffix}",
+        id=(int, ...),
+        content=(str, ...),
+        **({'is_correct': (bool, ...)} if "is_correct" in fields else {}),
+        **({'explanation': (Optional[str], None)} if "explanation" in fields else {}),
+    )
+    return create_model(
+        f"QuestionWithAnswers{suffix}",
+        id=(int, ...),
+        content=(str, ...),
+        **({'image_url': (Optional[str], None)} if "image_url" in fields else {}),
+        category=(Optional[str], None),
+        answers=(List[answer], ...),
+    )
+
+
+class AnswerExplanation(BaseModel):
+    id: int
+    is_correct: bool
+    explanation: str | None = None
+
+
+class QuestionExplanation(BaseModel):
+    """Correctness and explanations of a question's answers, fetched once the user has answered"""
+    question_id: int
+    answers: List[AnswerExplanation]
+
+
+class QuestionSetRef(BaseModel):
+    """A (category, set) pair; "Default" is the set of questions without one"""
+    category: str
+    question_set: str = "Default"
+
+
+class QuestionBatchRequest(BaseModel):
+    """Question sets and/or individual questions to load in one request"""
+    sets: List[QuestionSetRef] = Field(default_factory=list, max_length=50)
+    question_ids: List[int] = Field(default_factory=list, max_length=1000)
+
+
+class QuestionSetBatch(BaseModel):
+    category: str | None = None
+    question_set: str
+    questions: List[QuestionWithAnswers]  # or the ?fields= subset of it
+
+
+class QuestionBatchOut(BaseModel):
+    """Requested questions grouped by the set they belong to"""
+    sets: List[QuestionSetBatch]
+    missing_ids: List[int]  # requested ids that do not exist (or were deleted)
+
+
+@lru_cache(maxsize=None)
+def sparse_batch_type(fields: FrozenSet[str]):
+    """QuestionBatchOut with its questions restricted like sparse_question_type."""
+    if fields >= OPTIONAL_FIELDS:
+        return QuestionBatchOut
+    suffix = _suffix(fields)
+    group = create_model(
+        f"QuestionSetBatch{suffix}", __base__=QuestionSetBatch, questions=(List[sparse_question_type(fields)], ...)
+    )
+    return create_model(f"QuestionBatchOut{suffix}", __base__=QuestionBatchOut, sets=(List[group], ...))
+
+
 class QuestionOut(BaseModel):
     id: int
     content: str
@@ -2,6 +2,7 @@
 from pydantic import BaseModel
 from typing import List
 from datetime import datetime
+from app.schemas.leaderboard import UserRank
 
 
 class ResponseCreate(BaseModel):
@@ -33,6 +34,7 @@ class CategoryStatistics(BaseModel):
     wrong_answers: int
     accuracy: float
     last_attempt: str | None
+    rank: int | None = None
 
 
 class RecentActivity(BaseModel):
@@ -50,7 +52,15 @@ class OverallStatistics(BaseModel):
     overall_accuracy: float
 
 
+class SetProgress(BaseModel):
+    question_set: str
+    total_questions: int
+    answered: int
+    correct: int  # questions whose latest answer was correct
+
+
 class DashboardData(BaseModel):
     overall: OverallStatistics
+    rank: UserRank
     by_category: List[CategoryStatistics]
     recent_activity: List[RecentActivity]
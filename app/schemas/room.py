@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+
+class RoomCreate(BaseModel):
+    category: str
+    question_set: str = "Default"  # "Default" is the set of questions without one
+
+
+class RoomOut(BaseModel):
+    """A quiz room; members connect to /api/v1/rooms/{code}/ws"""
+    code: str
+    host_id: int
+    category: str
+    question_set: str
+    total_questions: int
+    position: int  # index of the last question asked, -1 before the first
+    members: int
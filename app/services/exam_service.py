@@ -0,0 +1,130 @@
+# app/services/exam_service.py
+"""
+Exam sessions: one row per attempt at a question set.
+
+Starting a session stores its question order; each answer rewrites the
+session's packed answer array in place (no `responses` rows yet); finishing
+scores the answers against the answer key and writes all of them as
+responses in one bulk insert, together with the session's totals, in a
+single transaction.
+"""
+import random
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.exam_sessions import ExamSession
+from app.repository import exam_repo
+from app.schemas.exam import ExamStart
+from app.schemas.response import ResponseCreate
+from app.services import response_service
+
+
+def _set_filter(question_set: Optional[str]) -> Optional[str]:
+    # Same convention as the catalog routes: "Default" is the set of questions without one
+    return None if question_set in (None, "Default") else question_set
+
+
+def _owned_session(db: Session, user_id: int, session_id: int, for_update: bool = False) -> ExamSession:
+    session = exam_repo.get_session(db, session_id, for_update=for_update)
+    if session is None or session.user_id != user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Exam session not found")
+    return session
+
+
+def _open_session(db: Session, user_id: int, session_id: int) -> ExamSession:
+    session = _owned_session(db, user_id, session_id, for_update=True)
+    if session.finished_at is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Exam session is already finished")
+    return session
+
+
+def session_out(session: ExamSession) -> dict:
+    selected = session.selected_ids
+    answered = sum(1 for s in selected if s)
+    return {
+        'id': session.id,
+        'category': session.category,
+        'question_set': session.question_set,
+        'attempt': session.attempt,
+        'question_ids': session.question_ids,
+        'selected_option_ids': [s or None for s in selected],
+        'answered': answered,
+        'total': len(selected),
+        'next_index': next((i for i, s in enumerate(selected) if not s), None),
+        'started_at': session.started_at,
+        'finished_at': session.finished_at,
+        'correct': session.correct,
+    }
+
+
+def start_session(db: Session, user_id: int, data: ExamStart) -> dict:
+    """Start a new attempt at a question set; questions are asked in id order unless shuffled."""
+    question_set = _set_filter(data.question_set)
+    question_ids = exam_repo.get_question_ids(db, data.category, question_set)
+    if not question_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No questions found for category: {data.category}, set: {data.question_set or 'Default'}"
+        )
+    if data.shuffle:
+        random.shuffle(question_ids)
+
+    attempt = exam_repo.count_attempts(db, user_id, data.category, question_set) + 1
+    session = exam_repo.create_session(db, user_id, data.category, question_set, attempt, question_ids)
+    return session_out(session)
+
+
+def get_session(db: Session, user_id: int, session_id: int) -> dict:
+    """Resume a session: one primary-key read."""
+    return session_out(_owned_session(db, user_id, session_id))
+
+
+def record_answer(db: Session, user_id: int, session_id: int, question_id: int, selected_option_id: int) -> dict:
+    """Store (or change) the answer to one question of an open session."""
+    session = _open_session(db, user_id, session_id)
+    try:
+        position = session.question_ids.index(question_id)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Question is not part of this exam session")
+    if exam_repo.get_answer_question_id(db, selected_option_id) != question_id:
+        raise HTTPException(status_code=422, detail="Answer option does not belong to this question")
+
+    selected = list(session.selected_ids)
+    selected[position] = selected_option_id
+    session.selected_ids = selected
+    session.updated_at = func.now()
+    progress = {'session_id': session.id, 'answered': sum(1 for s in selected if s), 'total': len(selected)}
+    db.commit()
+    return progress
+
+
+def finish_session(db: Session, user_id: int, session_id: int) -> dict:
+    """Score an open session and write its answers as responses, all in one transaction."""
+    session = _open_session(db, user_id, session_id)
+    answers = [(q, s) for q, s in zip(session.question_ids, session.selected_ids) if s]
+    correct_ids = exam_repo.get_correct_answer_ids(db, [s for _, s in answers])
+    responses = [
+        ResponseCreate(question_id=q, selected_option_id=s, is_correct=s in correct_ids)
+        for q, s in answers
+    ]
+    correct = sum(1 for r in responses if r.is_correct)
+
+    session.answered = len(responses)
+    session.correct = correct
+    session.finished_at = func.now()
+    result = {
+        'session_id': session.id,
+        'attempt': session.attempt,
+        'total': len(session.question_ids),
+        'answered': len(responses),
+        'correct': correct,
+        'accuracy': round(correct / len(responses) * 100, 1) if responses else 0,
+    }
+
+    if responses:
+        # Commits the session totals together with the responses and leaderboard rollups
+        response_service.submit_responses_bulk(db, user_id, responses)
+    else:
+        db.commit()
+    return result
@@ -0,0 +1,131 @@
+# app/services/export_service.py
+import csv
+import io
+import json
+import logging
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator
+from sqlalchemy.orm import Session
+from app.repository import export_repo
+from app.repository.export_repo import EXPORT_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "ndjson")
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# Encoded output is handed out in chunks of roughly this many characters
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class ExportStats:
+    rows: int = 0
+    bytes_written: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    finished: float | None = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def export_filename(fmt: str, compress: bool) -> str:
+    """File name offered to clients for an export."""
+    return f"responses.{fmt}" + (".gz" if compress else "")
+
+
+def _row_values(row) -> list:
+    values = list(row)
+    answered_at = values[-1]
+    values[-1] = answered_at.isoformat() if answered_at else None
+    return values
+
+
+def encode_rows(
+    rows: Iterable,
+    fmt: str,
+    compress: bool = False,
+    stats: ExportStats | None = None,
+    chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Encode export rows as CSV or NDJSON, optionally gzipped on the fly.
+
+    Only one chunk of output is held in memory at a time.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    stats = stats or ExportStats()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    # wbits=31 produces a gzip container rather than a raw zlib stream
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def drain() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        if compressor is not None:
+            data = compressor.compress(data)
+        stats.bytes_written += len(data)
+        return data
+
+    if writer is not None:
+        writer.writerow(EXPORT_COLUMNS)
+
+    for row in rows:
+        values = _row_values(row)
+        if writer is not None:
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values)), ensure_ascii=False))
+            buffer.write("\n")
+        stats.rows += 1
+
+        if buffer.tell() >= chunk_size:
+            chunk = drain()
+            if chunk:
+                yield chunk
+
+    chunk = drain()
+    if compressor is not None:
+        tail = compressor.flush()
+        stats.bytes_written += len(tail)
+        chunk += tail
+    stats.finished = time.perf_counter()
+    if chunk:
+        yield chunk
+
+
+def stream_export(
+    session_factory: Callable[[], Session],
+    fmt: str,
+    compress: bool = False,
+    stats: ExportStats | None = None,
+    **filters
+) -> Iterator[bytes]:
+    """
+    Stream an export using its own session.
+
+    The session lives as long as the generator, so the export can outlive
+    the request-scoped session that FastAPI closes before streaming starts.
+    """
+    stats = stats or ExportStats()
+    db = session_factory()
+    try:
+        rows = export_repo.iter_responses(db, **filters)
+        yield from encode_rows(rows, fmt, compress, stats)
+        logger.info(
+            "response export finished: format=%s gzip=%s rows=%d bytes=%d seconds=%.2f rows_per_second=%.0f",
+            fmt, compress, stats.rows, stats.bytes_written, stats.elapsed, stats.rows_per_second
+        )
+    finally:
+        db.close()
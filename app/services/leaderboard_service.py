@@ -0,0 +1,256 @@
+# app/services/leaderboard_service.py
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.repository import leaderboard_repo
+from app.utils.skiplist import IndexableSkipList
+
+# Boards keep at most this many users per (category, metric); lower ranks are reported as unranked
+LEADERBOARD_MAX_ENTRIES = int(os.getenv("LEADERBOARD_MAX_ENTRIES", "10000"))
+# Users need this many answers in a scope before they appear on its accuracy board
+LEADERBOARD_MIN_ATTEMPTS = int(os.getenv("LEADERBOARD_MIN_ATTEMPTS", "20"))
+
+METRIC_CORRECT = "correct"
+METRIC_ACCURACY = "accuracy"
+METRICS = (METRIC_CORRECT, METRIC_ACCURACY)
+
+# Board scope for totals across every category
+GLOBAL = None
+
+
+class _Board:
+    """
+    One ranking (scope + metric) held in an indexable skip list.
+
+    Correct-answer totals only grow, so evicting the tail keeps the board exact.
+    Accuracy can drop, so the tail of a full accuracy board is best-effort.
+    """
+
+    def __init__(self, metric: str, max_entries: int, min_attempts: int):
+        self.metric = metric
+        self.max_entries = max_entries
+        self.min_attempts = min_attempts
+        self._ranked = IndexableSkipList()
+        self._keys: Dict[int, tuple] = {}
+        self._stats: Dict[int, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ranked)
+
+    def _key(self, user_id: int, answered: int, correct: int) -> tuple:
+        if self.metric == METRIC_ACCURACY:
+            return (-(correct / answered), -correct, user_id)
+        return (-correct, answered, user_id)
+
+    def _discard(self, user_id: int):
+        key = self._keys.pop(user_id, None)
+        if key is not None:
+            self._ranked.remove(key)
+            del self._stats[user_id]
+
+    def update(self, user_id: int, answered: int, correct: int):
+        """Place a user on the board according to their current totals."""
+        self._discard(user_id)
+
+        if answered <= 0:
+            return
+        if self.metric == METRIC_ACCURACY and answered < self.min_attempts:
+            return
+
+        key = self._key(user_id, answered, correct)
+        if len(self._ranked) >= self.max_entries:
+            worst = self._ranked[-1]
+            if key > worst:
+                return
+            self._discard(worst[-1])
+
+        self._ranked.insert(key)
+        self._keys[user_id] = key
+        self._stats[user_id] = (answered, correct)
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """1-based rank of a user, or None if they are not on the board."""
+        key = self._keys.get(user_id)
+        if key is None:
+            return None
+        return self._ranked.rank(key) + 1
+
+    def top(self, limit: int) -> List[Tuple[int, int, int, int]]:
+        """Return (rank, user_id, answered, correct) for the first `limit` users."""
+        result = []
+        for position, key in enumerate(self._ranked.islice(0, limit), start=1):
+            user_id = key[-1]
+            answered, correct = self._stats[user_id]
+            result.append((position, user_id, answered, correct))
+        return result
+
+
+class Leaderboards:
+    """All leaderboards, keyed by (category or GLOBAL, metric)."""
+
+    def __init__(self, max_entries: int = LEADERBOARD_MAX_ENTRIES, min_attempts: int = LEADERBOARD_MIN_ATTEMPTS):
+        self.max_entries = max_entries
+        self.min_attempts = min_attempts
+        self._boards: Dict[Tuple[Optional[str], str], _Board] = {}
+        self._lock = threading.Lock()
+
+    def _board(self, category: Optional[str], metric: str) -> _Board:
+        board = self._boards.get((category, metric))
+        if board is None:
+            board = _Board(metric, self.max_entries, self.min_attempts)
+            self._boards[(category, metric)] = board
+        return board
+
+    def update_user(self, user_id: int, scores: Dict[str, Tuple[int, int]], categories: Iterable[str]):
+        """
+        Re-rank a user.
+
+        `scores` holds the user's full per-category (answered, correct) totals;
+        only the boards for `categories` and the global boards are touched.
+        """
+        total_answered = sum(answered for answered, _ in scores.values())
+        total_correct = sum(correct for _, correct in scores.values())
+
+        with self._lock:
+            for category in categories:
+                answered, correct = scores.get(category, (0, 0))
+                for metric in METRICS:
+                    self._board(category, metric).update(user_id, answered, correct)
+            for metric in METRICS:
+                self._board(GLOBAL, metric).update(user_id, total_answered, total_correct)
+
+    def top(self, category: Optional[str], metric: str, limit: int):
+        with self._lock:
+            board = self._boards.get((category, metric))
+            if board is None:
+                return [], 0
+            return board.top(limit), len(board)
+
+    def rank(self, category: Optional[str], metric: str, user_id: int) -> Optional[int]:
+        with self._lock:
+            board = self._boards.get((category, metric))
+            return board.rank(user_id) if board is not None else None
+
+    def ranked_users(self, category: Optional[str], metric: str) -> int:
+        with self._lock:
+            board = self._boards.get((category, metric))
+            return len(board) if board is not None else 0
+
+
+leaderboards = Leaderboards()
+
+
+def rebuild(db: Session) -> Leaderboards:
+    """Rebuild every leaderboard from the rollup table and swap it in."""
+    global leaderboards
+
+    fresh = Leaderboards()
+    current_user = None
+    scores: Dict[str, Tuple[int, int]] = {}
+
+    # Rows arrive ordered by user, so each user's totals can be folded without buffering everyone
+    for row in leaderboard_repo.iter_all_scores(db):
+        if row.user_id != current_user:
+            if current_user is not None:
+                fresh.update_user(current_user, scores, scores.keys())
+            current_user = row.user_id
+            scores = {}
+        scores[row.category] = (row.answered, row.correct)
+
+    if current_user is not None:
+        fresh.update_user(current_user, scores, scores.keys())
+
+    leaderboards = fresh
+    return fresh
+
+
+def stage_responses(db: Session, user_id: int, responses) -> List[str]:
+    """
+    Add new responses to the user's rollup rows inside the current transaction.
+
+    Call before the responses are committed so both land atomically, then
+    call `refresh_user` once committed. Returns the categories touched.
+    """
+    return stage_responses_for_users(db, {user_id: responses})
+
+
+def stage_responses_for_users(db: Session, responses_by_user: Dict[int, list]) -> List[str]:
+    """stage_responses for several users at once: one category lookup and one upsert in all."""
+    question_ids = {r.question_id for responses in responses_by_user.values() for r in responses}
+    if not question_ids:
+        return []
+
+    categories = leaderboard_repo.get_question_categories(db, question_ids)
+
+    deltas_by_user = {}
+    for user_id, responses in responses_by_user.items():
+        deltas = deltas_by_user.setdefault(user_id, defaultdict(lambda: [0, 0]))
+        for r in responses:
+            delta = deltas[categories.get(r.question_id, "")]
+            delta[0] += 1
+            delta[1] += 1 if r.is_correct else 0
+
+    leaderboard_repo.apply_score_deltas_for_users(db, {
+        user_id: {c: tuple(d) for c, d in deltas.items()} for user_id, deltas in deltas_by_user.items()
+    })
+    return sorted({c for deltas in deltas_by_user.values() for c in deltas})
+
+
+def refresh_user(db: Session, user_id: int, categories: Iterable[str]) -> None:
+    """Re-rank a user on the in-memory boards from their committed rollup rows."""
+    categories = list(categories)
+    if not categories:
+        return
+
+    scores = {
+        row.category: (row.answered, row.correct)
+        for row in leaderboard_repo.get_user_scores(db, user_id)
+    }
+    leaderboards.update_user(user_id, scores, categories)
+
+
+def refresh_users(db: Session, user_ids: Iterable[int], categories: Iterable[str]) -> None:
+    """refresh_user for several users, reading all their rollup rows in one query."""
+    categories = list(categories)
+    if not categories:
+        return
+
+    scores_by_user = {user_id: {} for user_id in user_ids}
+    for row in leaderboard_repo.get_scores_for_users(db, scores_by_user):
+        scores_by_user[row.user_id][row.category] = (row.answered, row.correct)
+    for user_id, scores in scores_by_user.items():
+        leaderboards.update_user(user_id, scores, categories)
+
+
+def get_leaderboard(db: Session, category: Optional[str], metric: str, limit: int):
+    """Get the top `limit` users for a category (or globally) by metric."""
+    entries, total_ranked = leaderboards.top(category, metric, limit)
+    names = leaderboard_repo.get_account_names(db, (user_id for _, user_id, _, _ in entries))
+
+    return {
+        'category': category,
+        'metric': metric,
+        'total_ranked': total_ranked,
+        'entries': [
+            {
+                'rank': rank,
+                'user_id': user_id,
+                'account_name': names.get(user_id, ""),
+                'total_answered': answered,
+                'correct_answers': correct,
+                'accuracy': round(correct / answered * 100, 1) if answered > 0 else 0
+            }
+            for rank, user_id, answered, correct in entries
+        ]
+    }
+
+
+def get_user_rank(user_id: int, category: Optional[str] = GLOBAL):
+    """Get a user's rank on both metrics for a category (or globally)."""
+    return {
+        'correct_rank': leaderboards.rank(category, METRIC_CORRECT, user_id),
+        'accuracy_rank': leaderboards.rank(category, METRIC_ACCURACY, user_id),
+        'ranked_users': leaderboards.ranked_users(category, METRIC_CORRECT)
+    }
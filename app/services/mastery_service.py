@@ -0,0 +1,293 @@
+# app/services/mastery_service.py
+"""
+Per-user mastery bitsets: which questions a user has answered, and whether
+their latest answer to each was correct.
+
+A question's ordinal is its id: the importer numbers questions densely from
+1, so a user's bitsets are about (highest id answered) / 8 bytes each. They
+are held as bytearrays: a lookup reads one byte, and a set's progress is
+the popcount of the bytes the set spans, masked to its questions.
+
+Submits update the stored row inside their own transaction (read it FOR
+UPDATE, apply the answers in order, write it back). A user's first submit
+inserts an empty row before locking it, so two concurrent first submits
+serialize on that row instead of both writing bits built without the
+other's answers. Each worker caches bitsets for MASTERY_CACHE_TTL_SECONDS,
+so an answer submitted through another worker can take that long to show
+up in cached reads.
+
+Rows for the history before this table existed are built once by its
+migration (and by `backfill` for seeded benchmark data); a user without a
+row has not answered anything since. Responses already compacted into
+daily totals carry no per-question detail and are not counted.
+"""
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from sqlalchemy.orm import Session
+from app.repository import mastery_repo
+
+MASTERY_CACHE_TTL_SECONDS = float(os.getenv("MASTERY_CACHE_TTL_SECONDS", "60"))
+MASTERY_CACHE_MAX_USERS = int(os.getenv("MASTERY_CACHE_MAX_USERS", "10000"))
+# Bitsets never grow past this many bits (512 KiB); larger ids are not tracked
+MASTERY_MAX_ORDINAL = int(os.getenv("MASTERY_MAX_ORDINAL", str(1 << 22)))
+
+
+class SetMask(NamedTuple):
+    """The questions of one set as a slice of bitset bytes: `bits` covers bytes offset.. of a bitset."""
+    offset: int
+    length: int
+    bits: int
+    size: int
+
+
+def _set_bit(buffer: bytearray, n: int, value: bool = True):
+    if n >= len(buffer) * 8:
+        if not value:
+            return
+        buffer.extend(bytes(n // 8 + 1 - len(buffer)))
+    if value:
+        buffer[n >> 3] |= 1 << (n & 7)
+    else:
+        buffer[n >> 3] &= ~(1 << (n & 7)) & 0xFF
+
+
+def _mask(question_ids: Iterable[int]) -> SetMask:
+    """Mask over the bytes spanned by `question_ids` (ids out of range are left out)."""
+    ids = [q for q in question_ids if 0 <= q < MASTERY_MAX_ORDINAL]
+    if not ids:
+        return SetMask(0, 0, 0, 0)
+    offset = min(ids) >> 3
+    buffer = bytearray()
+    for question_id in ids:
+        _set_bit(buffer, question_id - offset * 8)
+    return SetMask(offset, len(buffer), int.from_bytes(buffer, "little"), len(set(ids)))
+
+
+class Mastery:
+    """
+    A user's answered and last-correct bitsets; bit n (byte n // 8, bit n % 8)
+    is question ordinal n. Lookups index one byte; set progress converts only
+    the slice of bytes the set spans.
+    """
+
+    __slots__ = ("answered", "correct")
+
+    def __init__(self, answered: bytes = b"", correct: bytes = b""):
+        self.answered = bytearray(answered)
+        self.correct = bytearray(correct)
+
+    @classmethod
+    def from_history(cls, history: Iterable[tuple]) -> "Mastery":
+        """Bitsets from (question_id, is_correct) pairs, oldest first."""
+        mastery = cls()
+        for question_id, is_correct in history:
+            mastery.record(question_id, is_correct)
+        return mastery
+
+    def to_bytes(self) -> tuple:
+        return bytes(self.answered).rstrip(b"\0"), bytes(self.correct).rstrip(b"\0")
+
+    def record(self, question_id: int, is_correct: bool):
+        if not 0 <= question_id < MASTERY_MAX_ORDINAL:
+            return
+        _set_bit(self.answered, question_id)
+        _set_bit(self.correct, question_id, bool(is_correct))
+
+    def has_answered(self, question_id: int) -> bool:
+        byte = question_id >> 3
+        return 0 <= byte < len(self.answered) and (self.answered[byte] >> (question_id & 7)) & 1 == 1
+
+    def last_correct(self, question_id: int) -> Optional[bool]:
+        """Whether the latest answer was correct; None when never answered."""
+        byte, bit = question_id >> 3, 1 << (question_id & 7)
+        if not (0 <= byte < len(self.answered) and self.answered[byte] & bit):
+            return None
+        return byte < len(self.correct) and self.correct[byte] & bit != 0
+
+    def progress(self, mask: SetMask) -> tuple:
+        """(answered, correct) among the questions of a set."""
+        end = mask.offset + mask.length
+        answered = int.from_bytes(self.answered[mask.offset:end], "little") & mask.bits
+        correct = int.from_bytes(self.correct[mask.offset:end], "little") & mask.bits
+        return answered.bit_count(), correct.bit_count()
+
+    def nbytes(self) -> int:
+        """Size of the bitsets as stored in the user_mastery row."""
+        return sum(len(b) for b in self.to_bytes())
+
+
+class MasteryCache:
+    """Bounded LRU of users' bitsets, each kept for `ttl` seconds."""
+
+    def __init__(self, ttl: float = MASTERY_CACHE_TTL_SECONDS, max_users: int = MASTERY_CACHE_MAX_USERS):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[Mastery]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            mastery, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return mastery
+
+    def put(self, user_id: int, mastery: Mastery):
+        with self._lock:
+            self._entries[user_id] = (mastery, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            masteries = [mastery for mastery, _ in self._entries.values()]
+        return {
+            'entries': len(masteries),
+            'max_entries': self.max_users,
+            'bitset_bytes': sum(m.nbytes() for m in masteries),
+        }
+
+
+cache = MasteryCache()
+
+# category -> {question_set: mask}; dropped whenever the catalog changes
+_set_masks: Dict[str, Dict[str, SetMask]] = {}
+
+
+def invalidate_set_masks(*args):
+    """Forget the per-set masks (usable directly as a catalog version subscriber)."""
+    _set_masks.clear()
+
+
+def _load(db: Session, user_id: int, for_update: bool = False) -> Mastery:
+    """A user's bitsets from their stored row (empty without one); `for_update` creates and locks the row."""
+    row = mastery_repo.get_mastery(db, user_id, for_update=for_update)
+    if row is None and for_update:
+        mastery_repo.create_empty_masteries(db, [user_id])
+        row = mastery_repo.get_mastery(db, user_id, for_update=True)
+    if row is None:
+        return Mastery()
+    return Mastery(row.answered, row.correct)
+
+
+def get_mastery(db: Session, user_id: int) -> Mastery:
+    """The user's bitsets, from this worker's cache when it has them (up to MASTERY_CACHE_TTL_SECONDS old)."""
+    mastery = cache.get(user_id)
+    if mastery is None:
+        mastery = _load(db, user_id)
+        cache.put(user_id, mastery)
+    return mastery
+
+
+def read_mastery(db: Session, user_id: int) -> Mastery:
+    """
+    The user's bitsets as stored now: one primary-key read that skips the
+    cache, for answers that must reflect submits made through any worker.
+    The result refreshes this worker's cache entry.
+    """
+    mastery = _load(db, user_id)
+    cache.put(user_id, mastery)
+    return mastery
+
+
+def stage_responses(db: Session, user_id: int, responses: Iterable) -> Mastery:
+    """
+    Apply new responses to the user's stored bitsets inside the current transaction.
+
+    Call before the responses are committed, then `remember` the result
+    once the commit went through.
+    """
+    mastery = _load(db, user_id, for_update=True)
+    for r in responses:
+        mastery.record(r.question_id, r.is_correct)
+    mastery_repo.save_mastery(db, user_id, *mastery.to_bytes())
+    return mastery
+
+
+def stage_responses_for_users(db: Session, responses_by_user: Dict[int, Iterable]) -> Dict[int, Mastery]:
+    """
+    stage_responses for several users: their rows are read and written back
+    in one statement each (plus an insert and a read for users without one).
+    """
+    rows = mastery_repo.get_masteries(db, responses_by_user, for_update=True)
+    missing = [user_id for user_id in responses_by_user if user_id not in rows]
+    if missing:
+        mastery_repo.create_empty_masteries(db, missing)
+        rows.update(mastery_repo.get_masteries(db, missing, for_update=True))
+    masteries = {}
+    for user_id, responses in responses_by_user.items():
+        row = rows[user_id]
+        mastery = Mastery(row.answered, row.correct)
+        for r in responses:
+            mastery.record(r.question_id, r.is_correct)
+        masteries[user_id] = mastery
+    mastery_repo.save_masteries(db, {user_id: m.to_bytes() for user_id, m in masteries.items()})
+    return masteries
+
+
+def backfill(db: Session, batch_size: int = 1000) -> int:
+    """
+    Store every user's bitsets built from their raw responses, as the
+    user_mastery migration does (no commit). Returns the users written.
+    """
+    users = 0
+    batch = {}
+    for user_id, history in itertools.groupby(mastery_repo.iter_answer_histories(db), key=lambda row: row[0]):
+        batch[user_id] = Mastery.from_history((question_id, is_correct) for _, question_id, is_correct in history).to_bytes()
+        if len(batch) >= batch_size:
+            mastery_repo.save_masteries(db, batch)
+            users += len(batch)
+            batch = {}
+    mastery_repo.save_masteries(db, batch)
+    return users + len(batch)
+
+
+def remember(user_id: int, mastery: Mastery):
+    """Cache bitsets that were just committed."""
+    cache.put(user_id, mastery)
+
+
+def _masks(db: Session, category: str) -> Dict[str, SetMask]:
+    masks = _set_masks.get(category)
+    if masks is None:
+        ids_by_set: Dict[str, List[int]] = {}
+        for question_set, question_id in mastery_repo.get_set_question_ids(db, category):
+            ids_by_set.setdefault(question_set or "Default", []).append(question_id)
+        masks = _set_masks[category] = {name: _mask(ids) for name, ids in ids_by_set.items()}
+    return masks
+
+
+def get_set_progress(db: Session, user_id: int, category: str, catalog_db: Optional[Session] = None) -> List[dict]:
+    """
+    Answered and (last answer) correct counts for every set of a category.
+
+    The set masks are kept until the catalog version changes, so a miss
+    builds them from `catalog_db` (the primary) when given: a lagging
+    replica right after a bump would otherwise keep stale sets until the
+    next one.
+    """
+    mastery = get_mastery(db, user_id)
+    progress = []
+    for question_set, mask in sorted(_masks(catalog_db or db, category).items()):
+        answered, correct = mastery.progress(mask)
+        progress.append({
+            'question_set': question_set,
+            'total_questions': mask.size,
+            'answered': answered,
+            'correct': correct,
+        })
+    return progress
@@ -1,32 +1,27 @@
 # app/services/question_service.py
+from typing import Callable, FrozenSet, Optional
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from app.repository import question_repo
+from app.repository.question_repo import OPTIONAL_FIELDS
+from app.schemas.question import QuestionBatchRequest
+from app.services import mastery_service
 
 
 def get_categories_with_counts(db: Session):
     """Get all categories with their question counts."""
-    categories = question_repo.get_all_categories(db)
-
-    result = []
-    for category in categories:
-        count = question_repo.count_questions_by_category(db, category)
-        result.append({
-            'category': category,
-            'question_count': count
-        })
-
-    return result
+    return [
+        {'category': category, 'question_count': count}
+        for category, count in question_repo.count_questions_per_category(db)
+    ]
 
 
 def get_categories_with_sets(db: Session):
     """Get all categories with their question sets/dumps."""
-    categories = question_repo.get_all_categories(db)
+    sets_by_category = question_repo.get_question_sets_per_category(db)
 
     result = []
-    for category in categories:
-        # Get all question sets for this category
-        sets_info = question_repo.get_question_sets_by_category(db, category)
-
+    for category, sets_info in sets_by_category.items():
         total_questions = sum(s['question_count'] for s in sets_info)
 
         result.append({
@@ -38,11 +33,76 @@ def get_categories_with_sets(db: Session):
     return result
 
 
-def get_questions_by_category(db: Session, category: str):
-    """Get all questions with answers for a specific category."""
-    return question_repo.get_questions_by_category(db, category)
+def _progress_filter(db: Session, user_id: Optional[int], progress: str) -> Optional[Callable[[int], bool]]:
+    """
+    Which question ids a progress filter keeps, read from the user's mastery
+    bitsets: never answered ("unanswered"), or latest answer wrong
+    ("incorrect").
+
+    The bitsets come straight from the user's user_mastery row on `db`, not
+    the per-worker cache, so an answer submitted through any worker counts
+    at once. That is one primary-key read however many responses the user
+    has. Responses already compacted into daily totals no longer count as
+    answered.
+    """
+    if progress == "all":
+        return None
+    mastery = mastery_service.read_mastery(db, user_id)
+    if progress == "unanswered":
+        return lambda question_id: not mastery.has_answered(question_id)
+    return lambda question_id: mastery.last_correct(question_id) is False
+
+
+def get_questions_by_category(db: Session, category: str, user_id: Optional[int] = None, progress: str = "all",
+                              fields: FrozenSet[str] = OPTIONAL_FIELDS, mastery_db: Optional[Session] = None):
+    """
+    Get all questions with answers for a specific category (`progress` filters
+    by the user's answers, read on `mastery_db` when given; `fields` picks the
+    optional fields to include).
+    """
+    keep = _progress_filter(mastery_db or db, user_id, progress)
+    return question_repo.get_questions_by_category(db, category, fields, keep=keep)
+
+
+def get_questions_by_category_and_set(db: Session, category: str, question_set: str,
+                                      user_id: Optional[int] = None, progress: str = "all",
+                                      fields: FrozenSet[str] = OPTIONAL_FIELDS, mastery_db: Optional[Session] = None):
+    """Get all questions with answers for a specific category and question set (other arguments as above)."""
+    keep = _progress_filter(mastery_db or db, user_id, progress)
+    return question_repo.get_questions_by_category_and_set(db, category, question_set, fields, keep=keep)
+
+
+def get_question_explanation(db: Session, question_id: int):
+    """Get the correctness and explanation of a question's answers."""
+    explanation = question_repo.get_question_explanation(db, question_id)
+    if explanation is None:
+        raise HTTPException(status_code=404, detail=f"Question not found: {question_id}")
+    return explanation
+
+
+def get_questions_batch(db: Session, request: QuestionBatchRequest, fields: FrozenSet[str] = OPTIONAL_FIELDS):
+    """
+    Load several sets and/or individual questions in two queries.
+
+    Each question is returned once, under its own set: groups for the
+    requested sets come first in request order (empty when the set has no
+    questions), followed by the sets that only explicit ids pulled in.
+    """
+    if not request.sets and not request.question_ids:
+        raise HTTPException(status_code=422, detail="Request at least one question set or question id")
+
+    requested = list(dict.fromkeys((ref.category, ref.question_set) for ref in request.sets))
+    questions = question_repo.get_questions_in_sets_or_ids(db, requested, request.question_ids, fields)
 
+    groups = {key: [] for key in requested}
+    for question in questions:
+        groups.setdefault((question['category'], question.pop('question_set')), []).append(question)
 
-def get_questions_by_category_and_set(db: Session, category: str, question_set: str):
-    """Get all questions with answers for a specific category and question set."""
-    return question_repo.get_questions_by_category_and_set(db, category, question_set)
+    found = {question['id'] for question in questions}
+    return {
+        'sets': [
+            {'category': category, 'question_set': question_set, 'questions': group}
+            for (category, question_set), group in groups.items()
+        ],
+        'missing_ids': sorted(set(request.question_ids) - found),
+    }
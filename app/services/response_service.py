@@ -1,29 +1,81 @@
 # app/services/response_service.py
+import os
+from datetime import date, datetime, time, timedelta
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List, Optional
 from app.repository import response_repo
+from app.services import leaderboard_service, mastery_service
 from app.schemas.response import ResponseCreate
 from app.models.responses import Response
 
+# Recent activity is looked up in this many days first; on Postgres the older partitions are pruned
+RECENT_ACTIVITY_WINDOW_DAYS = int(os.getenv("RECENT_ACTIVITY_WINDOW_DAYS", "30"))
+RECENT_ACTIVITY_LIMIT = 10
+
+
+def _recent_activity_since() -> datetime:
+    # Midnight, so the bound (and the pruned partition set) only changes once a day
+    return datetime.combine(date.today() - timedelta(days=RECENT_ACTIVITY_WINDOW_DAYS), time())
+
 
 def submit_response(db: Session, user_id: int, response_data: ResponseCreate) -> Response:
     """Submit a single quiz response."""
-    return response_repo.create_response(db, user_id, response_data)
+    categories = leaderboard_service.stage_responses(db, user_id, [response_data])
+    mastery = mastery_service.stage_responses(db, user_id, [response_data])
+    response = response_repo.create_response(db, user_id, response_data)
+    mastery_service.remember(user_id, mastery)
+    leaderboard_service.refresh_user(db, user_id, categories)
+    return response
 
 
 def submit_responses_bulk(db: Session, user_id: int, responses: List[ResponseCreate]) -> List[Response]:
     """Submit multiple quiz responses at once."""
-    return response_repo.create_responses_bulk(db, user_id, responses)
+    categories = leaderboard_service.stage_responses(db, user_id, responses)
+    mastery = mastery_service.stage_responses(db, user_id, responses)
+    created = response_repo.create_responses_bulk(db, user_id, responses)
+    mastery_service.remember(user_id, mastery)
+    leaderboard_service.refresh_user(db, user_id, categories)
+    return created
+
+
+def submit_responses_for_users(db: Session, responses_by_user: Dict[int, List[ResponseCreate]]) -> None:
+    """
+    Submit several users' responses in one transaction, e.g. a quiz room's
+    answers when a question closes. Statement count does not depend on the
+    number of users (except for users whose mastery row is built first).
+    """
+    categories = leaderboard_service.stage_responses_for_users(db, responses_by_user)
+    masteries = mastery_service.stage_responses_for_users(db, responses_by_user)
+    response_repo.create_responses_for_users(db, responses_by_user)
+    db.commit()
+    for user_id, mastery in masteries.items():
+        mastery_service.remember(user_id, mastery)
+    leaderboard_service.refresh_users(db, responses_by_user, categories)
+
+
+def get_set_progress(db: Session, user_id: int, category: str, catalog_db: Optional[Session] = None):
+    """Per-set progress in a category, from the user's mastery bitsets (set masks built from `catalog_db`)."""
+    return mastery_service.get_set_progress(db, user_id, category, catalog_db)
 
 
 def get_user_dashboard_data(db: Session, user_id: int):
     """Get comprehensive dashboard data for user."""
-    statistics = response_repo.get_user_statistics(db, user_id)
-    recent_activity = response_repo.get_user_recent_activity(db, user_id, limit=10)
+    dashboard = response_repo.get_user_dashboard(db, user_id, recent_limit=RECENT_ACTIVITY_LIMIT, since=_recent_activity_since())
+    statistics = dashboard['by_category']
+
+    total_answered = dashboard['overall']['total_answered']
+    total_correct = dashboard['overall']['total_correct']
+
+    # Users who were quiet during the window still get their last answers, from the full history
+    recent_activity = dashboard['recent_activity']
+    if len(recent_activity) < min(RECENT_ACTIVITY_LIMIT, total_answered):
+        recent_activity = response_repo.get_user_recent_activity(db, user_id, limit=RECENT_ACTIVITY_LIMIT)
 
-    # Calculate overall statistics
-    total_answered = sum(stat['total_answered'] for stat in statistics)
-    total_correct = sum(stat['correct_answers'] for stat in statistics)
+    # Ranks come from the in-memory leaderboards, not from the database
+    for stat in statistics:
+        stat['rank'] = leaderboard_service.leaderboards.rank(
+            stat['category'] or "", leaderboard_service.METRIC_CORRECT, user_id
+        )
 
     return {
         'overall': {
@@ -32,6 +84,7 @@ def get_user_dashboard_data(db: Session, user_id: int):
             'total_wrong': total_answered - total_correct,
             'overall_accuracy': round(total_correct / total_answered * 100, 1) if total_answered > 0 else 0
         },
+        'rank': leaderboard_service.get_user_rank(user_id),
         'by_category': statistics,
         'recent_activity': recent_activity
     }
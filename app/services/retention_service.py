@@ -0,0 +1,107 @@
+# app/services/retention_service.py
+"""
+Compaction of old responses into daily per-user, per-category totals.
+
+Responses answered before the horizon (midnight RESPONSE_RETENTION_DAYS ago)
+are processed in id-ordered batches. Each batch is one short transaction:
+its totals are added to daily_user_category_stats, the raw rows are
+optionally archived to a gzipped NDJSON file, and then deleted. Locks are
+held only on one batch's rows at a time, and an interrupted run just
+resumes with the next batch.
+"""
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as day_start, timedelta
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+from app.repository import export_repo, retention_repo
+from app.services import export_service
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_RETENTION_DAYS = int(os.getenv("RESPONSE_RETENTION_DAYS", "180"))
+COMPACTION_BATCH_SIZE = int(os.getenv("COMPACTION_BATCH_SIZE", "5000"))
+
+
+@dataclass
+class CompactionStats:
+    cutoff: datetime
+    batches: int = 0
+    rows: int = 0
+    rollup_rows: int = 0
+    archived_files: list = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+def retention_cutoff(days: int = RESPONSE_RETENTION_DAYS, today: Optional[date] = None) -> datetime:
+    """Midnight `days` days ago; whole days are compacted, never part of one."""
+    return datetime.combine((today or date.today()) - timedelta(days=days), day_start())
+
+
+def _archive_batch(db: Session, directory: str, cutoff: datetime, first_id: int, last_id: int) -> str:
+    path = os.path.join(directory, f"responses-{first_id}-{last_id}.ndjson.gz")
+    rows = export_repo.iter_responses(db, end=cutoff, min_id=first_id, max_id=last_id)
+    with open(path, "wb") as f:
+        for chunk in export_service.encode_rows(rows, "ndjson", compress=True):
+            f.write(chunk)
+        f.flush()
+        # The rows are deleted right after; make sure the archive is on disk first
+        os.fsync(f.fileno())
+    return path
+
+
+def compact_responses(
+    db: Session,
+    cutoff: Optional[datetime] = None,
+    batch_size: int = COMPACTION_BATCH_SIZE,
+    archive_dir: Optional[str] = None,
+    pause: float = 0.0,
+    max_batches: Optional[int] = None,
+    progress: Optional[Callable[[CompactionStats], None]] = None
+) -> CompactionStats:
+    """
+    Fold responses answered before `cutoff` into the daily stats and delete them.
+
+    With `archive_dir`, every batch is first written there as
+    `responses-<first_id>-<last_id>.ndjson.gz` (the export format). `pause`
+    sleeps between batches to leave room for regular traffic.
+    """
+    stats = CompactionStats(cutoff=cutoff or retention_cutoff())
+    if archive_dir:
+        os.makedirs(archive_dir, exist_ok=True)
+
+    after_id = 0
+    while max_batches is None or stats.batches < max_batches:
+        bounds = retention_repo.next_batch(db, stats.cutoff, after_id, batch_size)
+        if bounds is None:
+            break
+        first_id, last_id = bounds
+
+        try:
+            stats.rollup_rows += retention_repo.roll_up_batch(db, stats.cutoff, first_id, last_id)
+            if archive_dir:
+                stats.archived_files.append(_archive_batch(db, archive_dir, stats.cutoff, first_id, last_id))
+            stats.rows += retention_repo.delete_batch(db, stats.cutoff, first_id, last_id)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        stats.batches += 1
+        after_id = last_id
+        if progress:
+            progress(stats)
+        if pause:
+            time.sleep(pause)
+
+    logger.info(
+        "response compaction finished: cutoff=%s batches=%d rows=%d seconds=%.2f",
+        stats.cutoff.isoformat(), stats.batches, stats.rows, stats.elapsed
+    )
+    return stats
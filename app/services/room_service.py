@@ -0,0 +1,419 @@
+# app/services/room_service.py
+"""
+Live quiz rooms: a host pushes the questions of one set to everyone in the
+room over WebSockets and sees the answers come in.
+
+Rooms live in this process's `rooms` registry, so every member of a room has
+to reach the same worker (run one worker, or route /api/v1/rooms/{code} by
+code). A question is serialized once when it is opened and the same text is
+queued for every member; answers only update in-memory tallies, which are
+broadcast at most every ROOM_TALLY_INTERVAL_SECONDS. When the host closes a
+question its answers are written as responses in one transaction.
+
+Each member has its own sender task and a bounded queue
+(ROOM_SEND_QUEUE_SIZE). Tallies are not queued: a member that has not been
+sent the previous tally yet just gets the newer one instead. A member whose
+queue of questions and results is full is too slow to follow the room and is
+disconnected (close code 1013); reconnecting resends the room's state.
+"""
+import asyncio
+import logging
+import os
+import secrets
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.schemas.response import ResponseCreate
+from app.services import question_service, response_service
+from app.utils.metrics import registry
+from app.utils.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+ROOM_MAX_ROOMS = int(os.getenv("ROOM_MAX_ROOMS", "100"))
+ROOM_MAX_MEMBERS = int(os.getenv("ROOM_MAX_MEMBERS", "500"))
+ROOM_SEND_QUEUE_SIZE = int(os.getenv("ROOM_SEND_QUEUE_SIZE", "16"))
+ROOM_TALLY_INTERVAL_SECONDS = float(os.getenv("ROOM_TALLY_INTERVAL_SECONDS", "0.5"))
+# Rooms nobody is connected to are dropped after this long
+ROOM_IDLE_SECONDS = float(os.getenv("ROOM_IDLE_SECONDS", "3600"))
+
+CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+
+# WebSocket close codes
+CLOSE_NORMAL = 1000
+CLOSE_POLICY = 1008
+CLOSE_TRY_AGAIN = 1013
+
+MESSAGES_SENT = registry.counter(
+    "room_messages_sent_total",
+    "Messages sent to quiz room members, by type.",
+    ("type",)
+)
+TALLIES_COALESCED = registry.counter(
+    "room_tallies_coalesced_total",
+    "Tally updates replaced by a newer one before the member was sent them."
+)
+SLOW_MEMBERS = registry.counter(
+    "room_slow_members_total",
+    "Members disconnected because their send queue was full."
+)
+PERSIST_SECONDS = registry.histogram(
+    "room_persist_seconds",
+    "Time to write a closed question's answers as responses."
+)
+
+
+class RoomError(Exception):
+    """A message a member is not allowed to send right now; the detail is sent back to them."""
+
+
+def _message(kind: str, **fields) -> str:
+    return dumps({'type': kind, **fields}).decode("utf-8")
+
+
+def error_message(detail: str) -> str:
+    return _message("error", detail=detail)
+
+
+class Member:
+    """One connection to a room, with its own bounded send queue."""
+
+    def __init__(self, user_id: int, send_text: Callable, close: Callable, queue_size: int = ROOM_SEND_QUEUE_SIZE):
+        self.user_id = user_id
+        self._send_text = send_text
+        self._close = close
+        self._queue: Deque[tuple] = deque()
+        self._queue_size = queue_size
+        self._tally: Optional[str] = None
+        self._wake = asyncio.Event()
+        self._close_code: Optional[int] = None
+        self.closed = False
+
+    def send(self, kind: str, text: str) -> bool:
+        """Queue a message; False when the member is too far behind to take it."""
+        if self.closed:
+            return True
+        if len(self._queue) >= self._queue_size:
+            return False
+        self._queue.append((kind, text))
+        self._wake.set()
+        return True
+
+    def send_tally(self, text: str):
+        """Send the latest tally, replacing one that has not gone out yet."""
+        if self._tally is not None:
+            TALLIES_COALESCED.inc()
+        self._tally = text
+        self._wake.set()
+
+    def close_after_send(self, code: int = CLOSE_NORMAL):
+        """Close the connection once everything queued so far has been sent."""
+        self._close_code = code
+        self._wake.set()
+
+    async def run_sender(self):
+        """Drain the queue, then the pending tally, until the connection closes."""
+        try:
+            while not self.closed:
+                await self._wake.wait()
+                self._wake.clear()
+                while not self.closed and (self._queue or self._tally is not None):
+                    if self._queue:
+                        kind, text = self._queue.popleft()
+                    else:
+                        kind, text, self._tally = "tally", self._tally, None
+                    await self._send_text(text)
+                    MESSAGES_SENT.inc((kind,))
+                if self._close_code is not None:
+                    await self.close(self._close_code)
+        except Exception:
+            # The socket went away; the receive loop notices and leaves the room
+            self.closed = True
+
+    async def close(self, code: int = CLOSE_NORMAL):
+        if self.closed:
+            return
+        self.closed = True
+        self._wake.set()
+        try:
+            await self._close(code)
+        except Exception:
+            pass
+
+
+class OpenQuestion:
+    """The question currently asked: its answer key and everyone's latest choice."""
+
+    def __init__(self, question: dict):
+        self.question_id = question['id']
+        self.category = question['category']
+        self.option_ids = [answer['id'] for answer in question['answers']]
+        self.correct_ids = sorted(answer['id'] for answer in question['answers'] if answer['is_correct'])
+        self.choices: Dict[int, int] = {}
+        self.tallies: Dict[int, int] = dict.fromkeys(self.option_ids, 0)
+        self.open = True
+
+    def answer(self, user_id: int, option_id: int):
+        if option_id not in self.tallies:
+            raise RoomError("Answer option does not belong to the current question")
+        previous = self.choices.get(user_id)
+        if previous is not None:
+            self.tallies[previous] -= 1
+        self.choices[user_id] = option_id
+        self.tallies[option_id] += 1
+
+    def tally(self) -> dict:
+        return {
+            'question_id': self.question_id,
+            'answered': len(self.choices),
+            'tallies': [{'option_id': option_id, 'count': count} for option_id, count in self.tallies.items()],
+        }
+
+
+class Room:
+    """A host, its members and the position in the question set."""
+
+    def __init__(self, code: str, host_id: int, category: str, question_set: str, questions: List[dict],
+                 tally_interval: float = ROOM_TALLY_INTERVAL_SECONDS):
+        self.code = code
+        self.host_id = host_id
+        self.category = category
+        self.question_set = question_set
+        self.questions = questions
+        self.tally_interval = tally_interval
+        self.position = -1
+        self.current: Optional[OpenQuestion] = None
+        self.members: Dict[int, Member] = {}
+        self.ended = False
+        self.idle_since: Optional[float] = time.monotonic()
+        # Messages of the open question, serialized once for every member
+        self._question_text: Optional[str] = None
+        self._tally_handle: Optional[asyncio.TimerHandle] = None
+        self._lock = asyncio.Lock()
+
+    def info(self) -> dict:
+        return {
+            'code': self.code,
+            'host_id': self.host_id,
+            'category': self.category,
+            'question_set': self.question_set,
+            'total_questions': len(self.questions),
+            'position': self.position,
+            'members': len(self.members),
+        }
+
+    def join(self, member: Member) -> bool:
+        """Add a member (replacing their previous connection) and send them the room's state."""
+        if self.ended or (member.user_id not in self.members and len(self.members) >= ROOM_MAX_MEMBERS):
+            return False
+        previous = self.members.get(member.user_id)
+        if previous is not None:
+            asyncio.ensure_future(previous.close(CLOSE_NORMAL))
+        self.members[member.user_id] = member
+        self.idle_since = None
+
+        member.send("room", _message("room", room=self.info(), host=member.user_id == self.host_id))
+        if self.current is not None and self.current.open:
+            member.send("question", self._question_text)
+            member.send_tally(_message("tally", **self.current.tally()))
+        return True
+
+    def leave(self, member: Member):
+        if self.members.get(member.user_id) is member:
+            del self.members[member.user_id]
+        if not self.members:
+            self.idle_since = time.monotonic()
+
+    def _broadcast(self, kind: str, text: str):
+        for member in list(self.members.values()):
+            if not member.send(kind, text):
+                SLOW_MEMBERS.inc()
+                self.leave(member)
+                asyncio.ensure_future(member.close(CLOSE_TRY_AGAIN))
+
+    def _schedule_tally(self):
+        if self._tally_handle is None:
+            self._tally_handle = asyncio.get_running_loop().call_later(self.tally_interval, self._flush_tally)
+
+    def _flush_tally(self):
+        self._tally_handle = None
+        if self.current is None:
+            return
+        text = _message("tally", **self.current.tally())
+        for member in self.members.values():
+            member.send_tally(text)
+
+    async def handle(self, member: Member, message: dict, db: Session):
+        """Apply one message from a member."""
+        kind = message.get('type') if isinstance(message, dict) else None
+        if kind == "answer":
+            self._answer(member, message)
+            return
+        if kind not in ("next", "close", "end"):
+            raise RoomError(f"Unknown message type: {kind}")
+        if member.user_id != self.host_id:
+            raise RoomError("Only the host can do that")
+
+        async with self._lock:
+            if kind == "next":
+                self._next()
+            elif kind == "close":
+                await self._close_question(db)
+            else:
+                await self.end(db)
+
+    def _answer(self, member: Member, message: dict):
+        if self.current is None or not self.current.open:
+            raise RoomError("No question is open")
+        if message.get('question_id') != self.current.question_id:
+            raise RoomError("That question is closed")
+        option_id = message.get('selected_option_id')
+        if not isinstance(option_id, int):
+            raise RoomError("selected_option_id must be an integer")
+        self.current.answer(member.user_id, option_id)
+        member.send("ack", _message("ack", question_id=self.current.question_id, selected_option_id=option_id))
+        self._schedule_tally()
+
+    def _next(self):
+        if self.current is not None and self.current.open:
+            raise RoomError("Close the current question first")
+        if self.position + 1 >= len(self.questions):
+            raise RoomError("No questions left")
+        self.position += 1
+        question = self.questions[self.position]
+        self.current = OpenQuestion(question)
+        # Answer keys and explanations stay on the server until the question closes
+        self._question_text = _message(
+            "question",
+            position=self.position,
+            total=len(self.questions),
+            question={
+                'id': question['id'],
+                'content': question['content'],
+                'image_url': question['image_url'],
+                'answers': [{'id': a['id'], 'content': a['content']} for a in question['answers']],
+            }
+        )
+        self._broadcast("question", self._question_text)
+
+    async def _close_question(self, db: Session):
+        current = self.current
+        if current is None or not current.open:
+            raise RoomError("No question is open")
+        current.open = False
+        if self._tally_handle is not None:
+            self._tally_handle.cancel()
+            self._tally_handle = None
+
+        persisted = True
+        if current.choices:
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(persist_answers, db, current)
+            except Exception:
+                logger.exception("Could not save the answers of room %s, question %s", self.code, current.question_id)
+                persisted = False
+            PERSIST_SECONDS.observe((), time.perf_counter() - started)
+
+        question = self.questions[self.position]
+        self._broadcast("results", _message(
+            "results",
+            correct_option_ids=current.correct_ids,
+            explanations=[
+                {'option_id': a['id'], 'explanation': a['explanation']}
+                for a in question['answers'] if a['explanation']
+            ],
+            persisted=persisted,
+            **current.tally()
+        ))
+
+    async def end(self, db: Optional[Session] = None):
+        """Close the open question (saving its answers), tell everyone, and disconnect them."""
+        if self.ended:
+            return
+        if self.current is not None and self.current.open and db is not None:
+            await self._close_question(db)
+        self.ended = True
+        self._broadcast("ended", _message("ended", code=self.code))
+        for member in self.members.values():
+            member.close_after_send()
+        rooms.remove(self.code)
+
+
+def persist_answers(db: Session, question: OpenQuestion):
+    """Write a closed question's answers as one response per member (runs in a worker thread)."""
+    try:
+        response_service.submit_responses_for_users(db, {
+            user_id: [ResponseCreate(
+                question_id=question.question_id,
+                selected_option_id=option_id,
+                is_correct=option_id in question.correct_ids
+            )]
+            for user_id, option_id in question.choices.items()
+        })
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        # The connection goes back to the pool until the next question closes
+        db.close()
+
+
+class RoomRegistry:
+    """The rooms hosted by this process, by code."""
+
+    def __init__(self, max_rooms: int = ROOM_MAX_ROOMS):
+        self.max_rooms = max_rooms
+        self._rooms: Dict[str, Room] = {}
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def get(self, code: str) -> Optional[Room]:
+        return self._rooms.get(code.upper())
+
+    def create(self, host_id: int, category: str, question_set: str, questions: List[dict]) -> Optional[Room]:
+        """A new room, or None when this process already hosts max_rooms."""
+        self.prune()
+        if len(self._rooms) >= self.max_rooms:
+            return None
+        code = "".join(secrets.choice(CODE_ALPHABET) for _ in range(6))
+        while code in self._rooms:
+            code = "".join(secrets.choice(CODE_ALPHABET) for _ in range(6))
+        room = self._rooms[code] = Room(code, host_id, category, question_set, questions)
+        return room
+
+    def remove(self, code: str):
+        self._rooms.pop(code, None)
+
+    def prune(self, idle_seconds: float = ROOM_IDLE_SECONDS):
+        """Drop rooms nobody has been connected to for `idle_seconds`."""
+        now = time.monotonic()
+        for code, room in list(self._rooms.items()):
+            if room.idle_since is not None and now - room.idle_since >= idle_seconds:
+                del self._rooms[code]
+
+    def clear(self):
+        self._rooms.clear()
+
+    def member_count(self) -> int:
+        return sum(len(room.members) for room in list(self._rooms.values()))
+
+
+rooms = RoomRegistry()
+
+registry.function("room_count", "Quiz rooms hosted by this process.", (), lambda: {(): len(rooms)})
+registry.function("room_members", "Connections to quiz rooms in this process.", (), lambda: {(): rooms.member_count()})
+
+
+def create_room(db: Session, host_id: int, category: str, question_set: str) -> Room:
+    """Open a room over one question set; its questions and answer keys are loaded once here."""
+    questions = question_service.get_questions_by_category_and_set(db, category, question_set)
+    if not questions:
+        raise HTTPException(status_code=404, detail=f"No questions found for category: {category}, set: {question_set}")
+    room = rooms.create(host_id, category, question_set, questions)
+    if room is None:
+        raise HTTPException(status_code=503, detail="Too many quiz rooms are open, try again later")
+    return room
@@ -0,0 +1,103 @@
+# app/settings.py
+"""
+Application settings.
+
+`.env` is loaded once, by `load_env()` (called from the `app` package
+itself, so it runs before any module reads its own os.getenv defaults).
+`Settings` holds what the app factory needs to build a worker: the primary
+database and its read replicas, CORS, admission limits and the startup
+warmup. `create_app()` takes one explicitly; otherwise `get_settings()`
+reads it from the environment once per process.
+"""
+import os
+import re
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from dotenv import load_dotenv
+
+_env_loaded = False
+_settings: Optional["Settings"] = None
+
+
+def load_env():
+    """Load `.env` into os.environ (existing variables win); later calls do nothing."""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
+
+def _flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() == "true"
+
+
+def _list(name: str) -> Tuple[str, ...]:
+    return tuple(item.strip() for item in os.getenv(name, "").split(",") if item.strip())
+
+
+def _per_class(suffix: str) -> Tuple[Tuple[str, int], ...]:
+    """(class, value) for every ADMISSION_<CLASS>_<suffix> variable set."""
+    pattern = re.compile(f"ADMISSION_([A-Z]+)_{suffix}")
+    return tuple(sorted(
+        (match.group(1).lower(), int(value))
+        for name, value in os.environ.items() if (match := pattern.fullmatch(name))
+    ))
+
+
+@dataclass(frozen=True)
+class Settings:
+    database_url: Optional[str] = None
+    database_echo: bool = False
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    # Read replicas for read-only routes (see app.db.replicas)
+    database_replica_urls: Tuple[str, ...] = ()
+    replica_max_lag_seconds: float = 10
+    replica_health_interval_seconds: float = 5
+    read_your_writes_seconds: float = 10
+    # Admission control (see app.middleware.admission); classes without an explicit
+    # (class, limit) override get their share of the pool
+    admission_control: bool = True
+    admission_queue_timeout_seconds: float = 5
+    admission_concurrency: Tuple[Tuple[str, int], ...] = ()
+    admission_queue: Tuple[Tuple[str, int], ...] = ()
+    cors_origins: Tuple[str, ...] = ("http://localhost:5173", "http://localhost:5174")  # Vite dev server ports
+    # Lifespan warmup: configure mappers, open pool connections, build schemas, prime catalog caches
+    warmup: bool = True
+    warmup_connections: int = 5
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        load_env()
+        pool_size = int(os.getenv("DATABASE_POOL_SIZE", str(cls.database_pool_size)))
+        origins = os.getenv("CORS_ORIGINS")
+        return cls(
+            database_url=os.getenv("DATABASE_URL") or None,
+            database_echo=_flag("DATABASE_ECHO", "false"),
+            database_pool_size=pool_size,
+            database_max_overflow=int(os.getenv("DATABASE_MAX_OVERFLOW", str(cls.database_max_overflow))),
+            database_replica_urls=_list("DATABASE_REPLICA_URLS"),
+            replica_max_lag_seconds=float(os.getenv("REPLICA_MAX_LAG_SECONDS", str(cls.replica_max_lag_seconds))),
+            replica_health_interval_seconds=float(
+                os.getenv("REPLICA_HEALTH_INTERVAL_SECONDS", str(cls.replica_health_interval_seconds))
+            ),
+            read_your_writes_seconds=float(os.getenv("READ_YOUR_WRITES_SECONDS", str(cls.read_your_writes_seconds))),
+            admission_control=_flag("ADMISSION_CONTROL", "true"),
+            admission_queue_timeout_seconds=float(
+                os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", str(cls.admission_queue_timeout_seconds))
+            ),
+            admission_concurrency=_per_class("CONCURRENCY"),
+            admission_queue=_per_class("QUEUE"),
+            cors_origins=tuple(o.strip() for o in origins.split(",") if o.strip()) if origins is not None else cls.cors_origins,
+            warmup=_flag("STARTUP_WARMUP", "true"),
+            # Never more than the pool keeps open; extra connections would be closed again right away
+            warmup_connections=min(int(os.getenv("WARMUP_CONNECTIONS", str(pool_size))), pool_size),
+        )
+
+
+def get_settings() -> Settings:
+    """The process-wide settings, read from the environment on first use."""
+    global _settings
+    if _settings is None:
+        _settings = Settings.from_env()
+    return _settings
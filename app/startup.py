@@ -0,0 +1,98 @@
+# app/startup.py
+"""
+Startup warmup and boot timings.
+
+`warm_up()` runs in the lifespan, before the worker accepts traffic, and
+does the work the first requests would otherwise pay for:
+
+- configure the SQLAlchemy mappers;
+- open `connections` pool connections (returned to the pool, still open);
+- build the TypeAdapter of every route's response model;
+- fill catalog_cache with the category listings.
+
+Each phase, the import of app.main and the time to the first served
+request (both counted from the first `import app`) are logged and exported
+as `app_startup_seconds{phase}`.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import configure_mappers, sessionmaker
+from app import IMPORT_STARTED
+from app.api.v1.question import prime_catalog_cache
+from app.utils.metrics import registry
+from app.utils.serialization import get_adapter
+
+logger = logging.getLogger(__name__)
+
+_timings: Dict[str, float] = {}
+
+registry.function(
+    "app_startup_seconds",
+    "Seconds spent in each startup phase; import, ready and first_request count from the first `import app`.",
+    ("phase",),
+    lambda: {(phase,): seconds for phase, seconds in list(_timings.items())}
+)
+
+
+def record(phase: str, seconds: float):
+    _timings[phase] = seconds
+    logger.info("startup %s: %.3fs", phase, seconds)
+
+
+def record_since_import(phase: str):
+    """Record `phase` as the time elapsed since the first `import app`."""
+    record(phase, time.perf_counter() - IMPORT_STARTED)
+
+
+def timings() -> Dict[str, float]:
+    return dict(_timings)
+
+
+@contextmanager
+def timed_phase(phase: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase, time.perf_counter() - started)
+
+
+def open_connections(engine: Engine, count: int) -> int:
+    """Check out `count` connections at once, then return them to the pool still open."""
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for conn in connections:
+            conn.close()
+    return len(connections)
+
+
+def compile_response_schemas(app: FastAPI) -> int:
+    """Build (and cache) the TypeAdapter for every route's response model."""
+    models = {route.response_model for route in app.routes if isinstance(route, APIRoute) and route.response_model is not None}
+    for model in models:
+        get_adapter(model)
+    return len(models)
+
+
+def warm_up(app: FastAPI, engine: Engine, session_factory: sessionmaker, connections: int):
+    with timed_phase("warmup"):
+        with timed_phase("warmup_mappers"):
+            configure_mappers()
+        with timed_phase("warmup_pool"):
+            open_connections(engine, connections)
+        with timed_phase("warmup_schemas"):
+            compile_response_schemas(app)
+        with timed_phase("warmup_catalog"):
+            db = session_factory()
+            try:
+                prime_catalog_cache(db)
+            finally:
+                db.close()
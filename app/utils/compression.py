@@ -0,0 +1,165 @@
+# app/utils/compression.py
+import gzip
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+from app.utils.metrics import registry
+from app.utils.request_stats import timed
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+# Bodies smaller than this are sent as-is; compressing them costs more than it saves
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+ZSTD_LEVEL = int(os.getenv("ZSTD_LEVEL", "3"))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def _gzip(data: bytes) -> bytes:
+    # mtime=0 keeps the output deterministic so cached bodies and ETags are stable
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+ENCODERS: Dict[str, Callable[[bytes], bytes]] = {}
+if brotli is not None:
+    ENCODERS["br"] = lambda data: brotli.compress(data, quality=BROTLI_QUALITY)
+if zstandard is not None:
+    _zstd = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    ENCODERS["zstd"] = lambda data: _zstd.compress(data)
+ENCODERS["gzip"] = _gzip
+
+# Server preference when the client rates several encodings equally
+PREFERENCE = tuple(name for name in ("br", "zstd", "gzip") if name in ENCODERS)
+
+
+class CompressionStats:
+    """Bytes in/out and CPU time spent compressing, per encoding."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, list] = {}
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float):
+        with self._lock:
+            totals = self._totals.setdefault(encoding, [0, 0, 0, 0.0])
+            totals[0] += 1
+            totals[1] += bytes_in
+            totals[2] += bytes_out
+            totals[3] += cpu_seconds
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                encoding: {
+                    'count': count,
+                    'bytes_in': bytes_in,
+                    'bytes_out': bytes_out,
+                    'ratio': round(bytes_out / bytes_in, 4) if bytes_in else 0,
+                    'cpu_seconds': round(cpu, 6),
+                    'cpu_ms_per_call': round(cpu / count * 1000, 4) if count else 0
+                }
+                for encoding, (count, bytes_in, bytes_out, cpu) in self._totals.items()
+            }
+
+
+stats = CompressionStats()
+
+registry.function(
+    "http_compression_bytes_total",
+    "Bytes fed to and produced by response compression.",
+    ("encoding", "direction"),
+    lambda: {
+        key: value
+        for encoding, totals in stats.snapshot().items()
+        for key, value in (((encoding, "in"), totals['bytes_in']), ((encoding, "out"), totals['bytes_out']))
+    },
+    type_name="counter"
+)
+registry.function(
+    "http_compression_cpu_seconds_total",
+    "CPU time spent compressing responses.",
+    ("encoding",),
+    lambda: {(encoding,): totals['cpu_seconds'] for encoding, totals in stats.snapshot().items()},
+    type_name="counter"
+)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a body with the given content-coding, recording size and CPU time."""
+    started = time.thread_time()
+    with timed("compress"):
+        compressed = ENCODERS[encoding](data)
+    stats.record(encoding, len(data), len(compressed), time.thread_time() - started)
+    return compressed
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    result: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = max(0.0, min(1.0, float(value)))
+                except ValueError:
+                    q = 0.0
+        if coding == "x-gzip":
+            coding = "gzip"
+        result[coding] = max(q, result.get(coding, 0.0))
+    return result
+
+
+def negotiate(header: Optional[str], available=PREFERENCE) -> Optional[str]:
+    """
+    Pick the content-coding to use for a response, or None for identity.
+
+    Codings with q=0 are never chosen; `*` covers codings the client did not
+    list. Among equal q-values the server preference order wins, and a
+    coding is only used when it is rated at least as high as an explicitly
+    listed `identity`.
+    """
+    if not header:
+        return None
+
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*")
+    best, best_q = None, 0.0
+
+    for coding in available:
+        q = accepted.get(coding, wildcard if wildcard is not None else 0.0)
+        if q > best_q:
+            best, best_q = coding, q
+
+    if best is not None and best_q < accepted.get("identity", 0.0):
+        return None
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def add_vary(headers, value: str = "Accept-Encoding"):
+    """Add a token to the Vary header of a MutableHeaders without duplicating it."""
+    existing = headers.get("vary")
+    if not existing:
+        headers["vary"] = value
+    elif value.lower() not in [v.strip().lower() for v in existing.split(",")]:
+        headers["vary"] = f"{existing}, {value}"
@@ -0,0 +1,220 @@
+# app/utils/memory.py
+"""
+Memory diagnostics for a running worker: RSS, gc, live ORM objects, cache
+sizes and tracemalloc snapshots with top-site and diff reports.
+
+All state is per process; with several uvicorn workers each one answers
+for itself.
+"""
+import gc
+import itertools
+import linecache
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+# Keep at most this many snapshots; the oldest is dropped first
+MEMORY_MAX_SNAPSHOTS = int(os.getenv("MEMORY_MAX_SNAPSHOTS", "5"))
+# tracemalloc is switched off again after this long, so a forgotten trace cannot run forever
+MEMORY_TRACE_MAX_SECONDS = float(os.getenv("MEMORY_TRACE_MAX_SECONDS", "900"))
+
+KEY_TYPES = ("lineno", "filename", "traceback")
+
+_IGNORED_FILES = (
+    tracemalloc.__file__,
+    linecache.__file__,
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    "<unknown>",
+)
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """Current and peak resident set size of this process, in bytes."""
+    result: Dict[str, Optional[int]] = {'rss_bytes': None, 'peak_rss_bytes': None}
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    result['rss_bytes'] = int(line.split()[1]) * 1024
+                elif line.startswith("VmHWM:"):
+                    result['peak_rss_bytes'] = int(line.split()[1]) * 1024
+    except OSError:
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # ru_maxrss is KiB on Linux but bytes on macOS
+            result['peak_rss_bytes'] = peak if sys.platform == "darwin" else peak * 1024
+        except ImportError:
+            pass
+    return result
+
+
+def gc_stats() -> dict:
+    """Collections, collected and uncollectable objects per generation, plus current counts."""
+    return {
+        'enabled': gc.isenabled(),
+        'thresholds': list(gc.get_threshold()),
+        'counts': list(gc.get_count()),
+        'generations': gc.get_stats(),
+        'garbage': len(gc.garbage),
+    }
+
+
+def orm_object_counts() -> dict:
+    """
+    Live instances of every mapped model, and the sessions holding them.
+
+    Walks the gc-tracked heap once, so it costs a few hundred milliseconds
+    on a large worker; meant for on-demand diagnostics only.
+    """
+    from sqlalchemy.orm import Session
+    from app.db.base import Base
+
+    classes = {mapper.class_: mapper.class_.__name__ for mapper in Base.registry.mappers}
+    counts = dict.fromkeys(sorted(classes.values()), 0)
+    sessions = 0
+    identity_map_size = 0
+
+    for obj in gc.get_objects():
+        cls = type(obj)
+        name = classes.get(cls)
+        if name is not None:
+            counts[name] += 1
+        elif isinstance(obj, Session):
+            sessions += 1
+            identity_map_size += len(obj.identity_map)
+
+    return {'models': counts, 'sessions': sessions, 'identity_map_objects': identity_map_size}
+
+
+def _frame_filter(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+    return snapshot.filter_traces([tracemalloc.Filter(False, name) for name in _IGNORED_FILES])
+
+
+def _stat_dict(stat) -> dict:
+    frames = [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+    result = {'site': frames[0] if frames else "?", 'size_bytes': stat.size, 'count': stat.count}
+    if len(frames) > 1:
+        result['traceback'] = frames
+    if hasattr(stat, "size_diff"):
+        result['size_diff_bytes'] = stat.size_diff
+        result['count_diff'] = stat.count_diff
+    return result
+
+
+class MemoryTracer:
+    """tracemalloc on/off switch plus a small store of labelled snapshots."""
+
+    def __init__(self, max_snapshots: int = MEMORY_MAX_SNAPSHOTS, max_seconds: float = MEMORY_TRACE_MAX_SECONDS):
+        self.max_snapshots = max_snapshots
+        self.max_seconds = max_seconds
+        self._snapshots: "OrderedDict[int, dict]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._started_at: Optional[float] = None
+
+    def start(self, frames: int = 1) -> dict:
+        """Start tracing with `frames` frames per allocation (1 is cheapest)."""
+        with self._lock:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            tracemalloc.start(frames)
+            self._started_at = time.time()
+            if self._timer is not None:
+                self._timer.cancel()
+            if self.max_seconds > 0:
+                self._timer = threading.Timer(self.max_seconds, self.stop)
+                self._timer.daemon = True
+                self._timer.start()
+        return self.status()
+
+    def stop(self) -> dict:
+        """Stop tracing; snapshots already taken are kept."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            tracemalloc.stop()
+            self._started_at = None
+        return self.status()
+
+    def status(self) -> dict:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            'tracing': tracing,
+            'frames': tracemalloc.get_traceback_limit() if tracing else None,
+            'started_at': self._started_at,
+            'stops_at': self._started_at + self.max_seconds if tracing and self._started_at and self.max_seconds > 0 else None,
+            'traced_bytes': current,
+            'traced_peak_bytes': peak,
+            'overhead_bytes': tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            'snapshots': self.snapshots(),
+        }
+
+    def take_snapshot(self, label: Optional[str] = None) -> dict:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running")
+        snapshot = _frame_filter(tracemalloc.take_snapshot())
+        info = {
+            'id': next(self._ids),
+            'label': label,
+            'taken_at': time.time(),
+            'traced_bytes': sum(stat.size for stat in snapshot.statistics("filename")),
+            'rss_bytes': process_memory()['rss_bytes'],
+        }
+        with self._lock:
+            self._snapshots[info['id']] = {'info': info, 'snapshot': snapshot}
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return info
+
+    def snapshots(self) -> List[dict]:
+        with self._lock:
+            return [entry['info'] for entry in self._snapshots.values()]
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+
+    def _get(self, snapshot_id: int) -> Optional[tracemalloc.Snapshot]:
+        with self._lock:
+            entry = self._snapshots.get(snapshot_id)
+        return entry['snapshot'] if entry else None
+
+    def top(self, snapshot_id: int, key_type: str = "lineno", limit: int = 25) -> Optional[List[dict]]:
+        """Largest allocation sites in a snapshot, or None if it does not exist."""
+        snapshot = self._get(snapshot_id)
+        if snapshot is None:
+            return None
+        return [_stat_dict(stat) for stat in snapshot.statistics(key_type)[:limit]]
+
+    def diff(self, old_id: int, new_id: int, key_type: str = "lineno", limit: int = 25) -> Optional[List[dict]]:
+        """Allocation sites that grew (or shrank) the most between two snapshots."""
+        old, new = self._get(old_id), self._get(new_id)
+        if old is None or new is None:
+            return None
+        return [_stat_dict(stat) for stat in new.compare_to(old, key_type)[:limit]]
+
+
+tracer = MemoryTracer()
+
+
+def summary() -> dict:
+    """Everything cheap enough to compute on request: RSS, gc, ORM objects, caches, tracing state."""
+    from app.services import mastery_service
+    from app.utils.payload_cache import catalog_cache
+
+    return {
+        'process': process_memory(),
+        'gc': gc_stats(),
+        'orm': orm_object_counts(),
+        'caches': {'catalog': catalog_cache.stats(), 'mastery': mastery_service.cache.stats()},
+        'tracemalloc': tracer.status(),
+    }
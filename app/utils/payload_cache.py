@@ -0,0 +1,144 @@
+# app/utils/payload_cache.py
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+from fastapi import Request, Response
+from app.utils import compression
+from app.utils.serialization import render
+from app.utils.single_flight import SingleFlight
+
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "60"))
+CATALOG_CACHE_MAX_ENTRIES = int(os.getenv("CATALOG_CACHE_MAX_ENTRIES", "256"))
+
+
+class CachedPayload:
+    """
+    A serialized JSON body plus its compressed variants.
+
+    Each encoding is computed at most once, on first request, and kept next
+    to the uncompressed bytes for as long as the payload stays cached.
+    """
+
+    __slots__ = ("body", "etag", "_encoded", "_lock")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = 'W/"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest()
+        self._encoded: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding: str) -> bytes:
+        data = self._encoded.get(encoding)
+        if data is None:
+            with self._lock:
+                data = self._encoded.get(encoding)
+                if data is None:
+                    data = self._encoded[encoding] = compression.compress(self.body, encoding)
+        return data
+
+
+class PayloadCache:
+    """
+    Bounded LRU of serialized payloads, each kept for `ttl` seconds.
+
+    `invalidate()` drops every entry and bumps the generation, so a payload
+    that was being built from pre-invalidation data is not stored afterwards.
+    Concurrent misses on one key are coalesced: one request runs the producer
+    and serializes, the others wait for and share its payload (or its error).
+    """
+
+    def __init__(self, ttl: float = CATALOG_CACHE_TTL_SECONDS, max_entries: int = CATALOG_CACHE_MAX_ENTRIES, name: str = "payload_cache"):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.generation = 0
+        self.flight = SingleFlight(name)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CachedPayload]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def put(self, key: Hashable, payload: CachedPayload, generation: Optional[int] = None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (payload, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self, *args):
+        """Drop everything cached so far (usable directly as a catalog version subscriber)."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Entry count and bytes held, uncompressed bodies and compressed variants separately."""
+        with self._lock:
+            payloads = [payload for payload, _ in self._entries.values()]
+        return {
+            'entries': len(payloads),
+            'max_entries': self.max_entries,
+            'body_bytes': sum(len(p.body) for p in payloads),
+            'encoded_bytes': sum(len(data) for p in payloads for data in list(p._encoded.values())),
+        }
+
+    def get_or_create(self, key: Hashable, producer: Callable[[], bytes]) -> CachedPayload:
+        payload = self.get(key)
+        if payload is None:
+            generation = self.generation
+            # Keyed by generation too: requests arriving after an invalidation start a fresh build
+            payload = self.flight.do((generation, key), lambda: self._create(key, producer, generation))
+        return payload
+
+    def _create(self, key: Hashable, producer: Callable[[], bytes], generation: int) -> CachedPayload:
+        payload = CachedPayload(producer())
+        self.put(key, payload, generation)
+        return payload
+
+    def prime(self, key: Hashable, producer: Callable[[], Any], response_type) -> CachedPayload:
+        """Build and cache the payload `respond()` would serve for `key`, ahead of the first request."""
+        return self.get_or_create(key, lambda: render(response_type, producer()))
+
+    def respond(self, request: Request, key: Hashable, producer: Callable[[], Any], response_type) -> Response:
+        """
+        Serve a cached JSON payload, compressed for the client when worthwhile.
+
+        `producer` is only called on a miss; its result is validated against
+        `response_type` once and the bytes are reused until the entry expires.
+        """
+        payload = self.prime(key, producer, response_type)
+        headers = {"ETag": payload.etag, "Vary": "Accept-Encoding"}
+
+        if payload.etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+            return Response(status_code=304, headers=headers)
+
+        body = payload.body
+        if len(body) >= compression.COMPRESSION_MIN_SIZE:
+            encoding = compression.negotiate(request.headers.get("accept-encoding"))
+            if encoding is not None:
+                body = payload.encoded(encoding)
+                headers["Content-Encoding"] = encoding
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Question catalog payloads (categories, sets and their questions)
+catalog_cache = PayloadCache(name="catalog")
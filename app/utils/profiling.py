@@ -0,0 +1,224 @@
+# app/utils/profiling.py
+"""
+On-demand sampling profiler for single requests.
+
+A profiled request gets its own sampler thread that reads
+`sys._current_frames()` every PROFILE_INTERVAL_MS. A sample counts when
+the thread belongs to the request:
+
+- the event loop thread, while it is running the request's task (middleware,
+  async dependencies, routing, serialization of async routes);
+- a threadpool worker whose copied context carries the request's profile
+  (sync routes and dependencies such as get_current_user, sync serialization).
+
+Samples are folded into collapsed stacks (`frame;frame;frame count`), the
+input format of flamegraph.pl, speedscope and friends, and written to a
+bounded directory.
+"""
+import asyncio
+import hashlib
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/quiz-api-profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "100"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+# Fraction of all requests profiled at random (0 disables random sampling)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# Key for signed X-Profile headers; the header is ignored while this is unset
+PROFILE_SECRET = os.getenv("PROFILE_SECRET", "")
+PROFILE_HEADER = "x-profile"
+
+_active: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+def sign_token(secret: str, ttl_seconds: int = 300, now: Optional[float] = None) -> str:
+    """Create an X-Profile header value (`<expires>.<hmac>`) valid for `ttl_seconds`."""
+    expires = int((now or time.time()) + ttl_seconds)
+    digest = hmac.new(secret.encode(), str(expires).encode(), hashlib.sha256).hexdigest()
+    return f"{expires}.{digest}"
+
+
+def verify_token(secret: str, token: str, now: Optional[float] = None) -> bool:
+    """Check an X-Profile header value against the secret and its expiry."""
+    if not secret or not token:
+        return False
+    expires, _, digest = token.partition(".")
+    if not expires.isdigit() or int(expires) < (now or time.time()):
+        return False
+    expected = hmac.new(secret.encode(), expires.encode(), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, digest)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    # Shorten site-packages and project paths to something readable
+    for marker in ("site-packages" + os.sep, os.sep + "app" + os.sep):
+        index = filename.rfind(marker)
+        if index != -1:
+            filename = filename[index + len(marker):] if marker.startswith("site") else filename[index + 1:]
+            break
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({filename}:{frame.f_lineno})"
+
+
+try:
+    # The threadpool loop that Starlette's run_in_threadpool hands sync code to
+    from anyio._backends._asyncio import WorkerThread
+    _WORKER_CODE = WorkerThread.run.__code__
+except (ImportError, AttributeError):  # other anyio versions
+    _WORKER_CODE = None
+
+
+def _is_worker_frame(frame) -> bool:
+    if _WORKER_CODE is not None:
+        return frame.f_code is _WORKER_CODE
+    return frame.f_code.co_name == "run" and "context" in frame.f_code.co_varnames
+
+
+class RequestProfile:
+    """Samples the threads working on one request until `stop()` is called."""
+
+    def __init__(self, entry_code, interval: float = PROFILE_INTERVAL_MS / 1000):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._entry_code = entry_code
+        self._loop_thread = threading.get_ident()
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._token = _active.set(self)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        _active.reset(self._token)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == self._thread.ident:
+                continue
+            if thread_id == self._loop_thread:
+                if asyncio.current_task(self._loop) is not self._task:
+                    continue
+                stack = self._stack(frame, lambda f: f.f_code is self._entry_code, include_stop=True)
+            else:
+                stack = self._stack(frame, self._owns_worker_frame, include_stop=False)
+            if stack:
+                self.stacks[stack] += 1
+                self.samples += 1
+
+    def _owns_worker_frame(self, frame) -> bool:
+        if not _is_worker_frame(frame):
+            return False
+        context = frame.f_locals.get("context")
+        return context is not None and context.get(_active) is self
+
+    def _stack(self, frame, is_root, include_stop: bool) -> Optional[str]:
+        labels: List[str] = []
+        while frame is not None:
+            if is_root(frame):
+                if include_stop:
+                    labels.append(_frame_label(frame))
+                labels.reverse()
+                return ";".join(labels)
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        return None
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Directory of collapsed-stack files, pruned to the newest `max_files`."""
+
+    def __init__(self, directory: str = PROFILE_DIR, max_files: int = PROFILE_MAX_FILES):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def filename(self, method: str, path: str) -> str:
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_")[:80] or "root"
+        return f"{time.strftime('%Y%m%dT%H%M%S')}-{os.urandom(3).hex()}-{method}-{slug}.collapsed"
+
+    def write(self, name: str, content: str):
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, name), "w", encoding="utf-8") as f:
+                f.write(content)
+            files = self.list()
+            for stale in files[self.max_files:]:
+                try:
+                    os.remove(os.path.join(self.directory, stale['name']))
+                except FileNotFoundError:
+                    pass
+
+    def list(self) -> List[Dict]:
+        """Profile files, newest first."""
+        try:
+            entries = [e for e in os.scandir(self.directory) if e.name.endswith(".collapsed")]
+        except FileNotFoundError:
+            return []
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        return [{'name': e.name, 'size': e.stat().st_size, 'modified': e.stat().st_mtime} for e in entries]
+
+    def path(self, name: str) -> Optional[str]:
+        """Absolute path of a stored profile, or None for unknown/unsafe names."""
+        if os.path.basename(name) != name or not name.endswith(".collapsed"):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+
+class ProfilingControl:
+    """Admin toggle: profile the next N requests whose path starts with a prefix."""
+
+    def __init__(self):
+        self._armed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def arm(self, path_prefix: str, requests: int):
+        with self._lock:
+            if requests > 0:
+                self._armed[path_prefix] = requests
+            else:
+                self._armed.pop(path_prefix, None)
+
+    def armed(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._armed)
+
+    def take(self, path: str) -> bool:
+        """Consume one armed slot matching `path`, if any."""
+        if not self._armed:
+            return False
+        with self._lock:
+            for prefix, remaining in self._armed.items():
+                if path.startswith(prefix):
+                    if remaining <= 1:
+                        del self._armed[prefix]
+                    else:
+                        self._armed[prefix] = remaining - 1
+                    return True
+        return False
+
+
+store = ProfileStore()
+control = ProfilingControl()
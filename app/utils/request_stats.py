@@ -0,0 +1,61 @@
+# app/utils/request_stats.py
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+
+class RequestStats:
+    """Where one request spent its time: SQL plus any named phases (serialize, bcrypt, ...)."""
+
+    __slots__ = ("scope", "query_count", "db_seconds", "phases", "statements")
+
+    def __init__(self, scope: Optional[dict] = None):
+        # The ASGI scope of the request, once routing has run it holds the matched route
+        self.scope = scope
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.phases: Dict[str, float] = {}
+        # Executions per SQL string, for spotting the same statement issued in a loop
+        self.statements: Dict[str, int] = {}
+
+    def add_phase(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @property
+    def route(self) -> Optional[str]:
+        """Template of the matched route (`/by-category/{category}`), if routing has happened."""
+        route = self.scope.get("route") if self.scope else None
+        return getattr(route, "path_format", None) or getattr(route, "path", None)
+
+
+# Set by the metrics middleware; worker threads see the same object because
+# FastAPI copies the context into the threadpool for sync routes/dependencies.
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def start(scope: Optional[dict] = None) -> object:
+    """Attach fresh stats to the current context; returns a token for `reset`."""
+    return _current.set(RequestStats(scope))
+
+
+def reset(token) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the wall time of the block to the current request's `phase`."""
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_phase(phase, time.perf_counter() - started)
@@ -0,0 +1,75 @@
+# app/utils/serialization.py
+import json
+import os
+from typing import Any, Dict
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from app.utils.request_stats import timed
+
+try:
+    import orjson
+except ImportError:  # listed in requirements.txt; json (slower, same output shape) is the fallback
+    orjson = None
+
+# Re-validate trusted payloads and fail loudly if they drift from their schema (for tests/dev)
+VERIFY_TRUSTED_PAYLOADS = os.getenv("VERIFY_TRUSTED_PAYLOADS", "false").lower() == "true"
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def get_adapter(response_type) -> TypeAdapter:
+    """Return the TypeAdapter for a response type, building it only once."""
+    adapter = _adapters.get(response_type)
+    if adapter is None:
+        adapter = _adapters[response_type] = TypeAdapter(response_type)
+    return adapter
+
+
+def dumps(data: Any) -> bytes:
+    """Encode plain JSON-compatible data with the fastest encoder available."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def render(response_type, data: Any, trusted: bool = False) -> bytes:
+    """
+    Serialize `data` as `response_type` to JSON bytes.
+
+    Untrusted data is validated by the precompiled TypeAdapter and dumped by
+    pydantic-core. Trusted data (plain dicts the repositories already shaped
+    to the schema) skips validation and goes straight to the JSON encoder.
+    """
+    with timed("serialize"):
+        if not trusted:
+            adapter = get_adapter(response_type)
+            return adapter.dump_json(adapter.validate_python(data))
+
+        if VERIFY_TRUSTED_PAYLOADS:
+            adapter = get_adapter(response_type)
+            expected = adapter.dump_python(adapter.validate_python(data), mode="json")
+            if json.loads(dumps(data)) != expected:
+                raise ValueError(f"Trusted payload does not match {response_type}")
+
+        return dumps(data)
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson when it is installed."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def fast_response(response_type, data: Any, trusted: bool = True, status_code: int = 200) -> FastJSONResponse:
+    """
+    Build a response that bypasses FastAPI's response_model re-validation.
+
+    Routes keep declaring `response_model=` so the OpenAPI schema is unchanged;
+    returning a Response instance makes FastAPI send it as-is.
+    """
+    return FastJSONResponse(content=render(response_type, data, trusted=trusted), status_code=status_code)
@@ -0,0 +1,121 @@
+# app/utils/single_flight.py
+"""
+Request coalescing ("single-flight").
+
+While a computation for a key is running, other callers asking for the
+same key wait for it and share its result (or its exception) instead of
+starting their own. Only concurrent callers are coalesced; nothing is kept
+once the computation finishes, so results must be immutable or safe to
+share (bytes, cached payloads), not session-bound ORM objects.
+
+A follower that has waited `timeout` seconds stops waiting and runs the
+computation itself, so one stuck leader cannot hold every request for that
+key hostage. `do()` is for threads (sync routes run in the threadpool),
+`do_async()` for coroutines on an event loop; each has its own in-flight
+table.
+"""
+import asyncio
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from app.utils.metrics import registry
+
+SINGLE_FLIGHT_TIMEOUT_SECONDS = float(os.getenv("SINGLE_FLIGHT_TIMEOUT_SECONDS", "10"))
+
+CALLS = registry.counter(
+    "single_flight_calls_total",
+    "Single-flight calls by group and outcome: leader, coalesced, timeout (waited too long) or fallback (leader cancelled).",
+    ("group", "outcome")
+)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with equal keys onto one computation."""
+
+    def __init__(self, name: str, timeout: float = SINGLE_FLIGHT_TIMEOUT_SECONDS):
+        self.name = name
+        self.timeout = timeout
+        self._calls: Dict[Hashable, _Call] = {}
+        self._futures: Dict[tuple, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self) -> int:
+        return len(self._calls) + len(self._futures)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return `fn()`, sharing one call among threads that ask for `key` at the same time."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if leader:
+            CALLS.inc((self.name, "leader"))
+            try:
+                call.result = fn()
+                return call.result
+            except BaseException as exc:
+                call.error = exc
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if not call.done.wait(self.timeout):
+            CALLS.inc((self.name, "timeout"))
+            return fn()
+        CALLS.inc((self.name, "coalesced"))
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return `await fn()`, sharing one call among tasks on this loop that ask for `key` at the same time."""
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        future = self._futures.get(flight_key)
+
+        if future is None:
+            CALLS.inc((self.name, "leader"))
+            future = self._futures[flight_key] = loop.create_future()
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                # Followers run it themselves rather than inherit the leader's cancellation
+                future.cancel()
+                raise
+            except Exception as exc:
+                future.set_exception(exc)
+                future.exception()  # retrieved: followers re-raise it, nobody else has to
+                raise
+            else:
+                future.set_result(result)
+                return result
+            finally:
+                del self._futures[flight_key]
+                if not future.done():
+                    future.cancel()
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            CALLS.inc((self.name, "timeout"))
+            return await fn()
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            CALLS.inc((self.name, "fallback"))
+            return await fn()
+        CALLS.inc((self.name, "coalesced"))
+        return result
@@ -0,0 +1,150 @@
+# app/utils/skiplist.py
+import random
+from typing import Any, Iterator, List, Optional
+
+
+class _Node:
+    __slots__ = ("key", "forward", "span")
+
+    def __init__(self, key: Any, level: int):
+        self.key = key
+        self.forward: List[Optional["_Node"]] = [None] * level
+        # span[i] = number of positions skipped when following forward[i]
+        self.span: List[int] = [0] * level
+
+
+class IndexableSkipList:
+    """
+    Sorted container of unique, comparable keys.
+
+    Insert, remove, rank lookup and positional access all run in expected
+    O(log n); iterating k items from a position costs O(log n + k).
+    """
+
+    MAX_LEVEL = 32
+    P = 0.25
+
+    def __init__(self, seed: Optional[int] = None):
+        self._random = random.Random(seed)
+        self._head = _Node(None, self.MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < self.MAX_LEVEL and self._random.random() < self.P:
+            level += 1
+        return level
+
+    def insert(self, key: Any) -> None:
+        """Insert a key. Keys must be unique."""
+        update = [self._head] * self.MAX_LEVEL
+        rank = [0] * self.MAX_LEVEL
+        node = self._head
+
+        for i in range(self._level - 1, -1, -1):
+            rank[i] = 0 if i == self._level - 1 else rank[i + 1]
+            while node.forward[i] is not None and node.forward[i].key < key:
+                rank[i] += node.span[i]
+                node = node.forward[i]
+            update[i] = node
+
+        level = self._random_level()
+        if level > self._level:
+            for i in range(self._level, level):
+                rank[i] = 0
+                update[i] = self._head
+                self._head.span[i] = self._size
+            self._level = level
+
+        new = _Node(key, level)
+        for i in range(level):
+            new.forward[i] = update[i].forward[i]
+            update[i].forward[i] = new
+            new.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = (rank[0] - rank[i]) + 1
+
+        for i in range(level, self._level):
+            update[i].span[i] += 1
+
+        self._size += 1
+
+    def remove(self, key: Any) -> None:
+        """Remove a key, raising KeyError if it is not present."""
+        update = [self._head] * self.MAX_LEVEL
+        node = self._head
+
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and node.forward[i].key < key:
+                node = node.forward[i]
+            update[i] = node
+
+        target = node.forward[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+
+        for i in range(self._level):
+            if update[i].forward[i] is target:
+                update[i].span[i] += target.span[i] - 1
+                update[i].forward[i] = target.forward[i]
+            else:
+                update[i].span[i] -= 1
+
+        while self._level > 1 and self._head.forward[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+
+    def rank(self, key: Any) -> int:
+        """Return the 0-based position of a key, raising KeyError if it is not present."""
+        traversed = 0
+        node = self._head
+
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and node.forward[i].key <= key:
+                traversed += node.span[i]
+                node = node.forward[i]
+            if node is not self._head and node.key == key:
+                return traversed - 1
+
+        raise KeyError(key)
+
+    def _node_at(self, index: int) -> Optional[_Node]:
+        if index < 0 or index >= self._size:
+            return None
+
+        target = index + 1
+        traversed = 0
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and traversed + node.span[i] <= target:
+                traversed += node.span[i]
+                node = node.forward[i]
+            if traversed == target:
+                return node
+        return None
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += self._size
+        node = self._node_at(index)
+        if node is None:
+            raise IndexError(index)
+        return node.key
+
+    def islice(self, start: int, stop: int) -> Iterator[Any]:
+        """Iterate keys at positions [start, stop)."""
+        node = self._node_at(max(start, 0))
+        remaining = min(stop, self._size) - max(start, 0)
+        while node is not None and remaining > 0:
+            yield node.key
+            node = node.forward[0]
+            remaining -= 1
+
+    def __iter__(self) -> Iterator[Any]:
+        node = self._head.forward[0]
+        while node is not None:
+            yield node.key
+            node = node.forward[0]
@@ -0,0 +1,90 @@
+"""
+Minimal WebSocket client for driving an ASGI app in the same event loop.
+
+Lets one process hold hundreds of connections to the real app without a
+server or a WebSocket library. `receive_buffer` bounds the messages the app
+can send ahead of the client reading them, so a client that stops reading
+pushes back on the app like a full socket buffer would.
+"""
+import asyncio
+import itertools
+import json
+from typing import Any, Iterable, Optional, Tuple
+
+_ports = itertools.count(40000)
+
+
+class WebSocketClosed(Exception):
+    def __init__(self, code: Optional[int]):
+        super().__init__(f"WebSocket closed with code {code}")
+        self.code = code
+
+
+class AsgiWebSocket:
+    """One client connection to `app` at `path`."""
+
+    def __init__(self, app, path: str, query_string: str = "", headers: Iterable[Tuple[str, str]] = (),
+                 receive_buffer: int = 0):
+        self.app = app
+        self.scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "http_version": "1.1",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": query_string.encode(),
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+            "client": ("127.0.0.1", next(_ports)),
+            "server": ("test", 80),
+            "subprotocols": [],
+        }
+        self._to_app: asyncio.Queue = asyncio.Queue()
+        self._from_app: asyncio.Queue = asyncio.Queue(maxsize=receive_buffer)
+        self._task: Optional[asyncio.Task] = None
+        self.close_code: Optional[int] = None
+
+    async def connect(self, timeout: float = 5):
+        self._task = asyncio.ensure_future(self.app(self.scope, self._to_app.get, self._from_app.put))
+        await self._to_app.put({"type": "websocket.connect"})
+        message = await asyncio.wait_for(self._from_app.get(), timeout)
+        if message["type"] == "websocket.close":
+            self.close_code = message.get("code", 1000)
+            raise WebSocketClosed(self.close_code)
+        assert message["type"] == "websocket.accept", message
+        return self
+
+    async def send_json(self, data: Any):
+        await self._to_app.put({"type": "websocket.receive", "text": json.dumps(data)})
+
+    async def receive_json(self, timeout: float = 5) -> Any:
+        message = await asyncio.wait_for(self._from_app.get(), timeout)
+        if message["type"] == "websocket.close":
+            self.close_code = message.get("code", 1000)
+            raise WebSocketClosed(self.close_code)
+        return json.loads(message["text"])
+
+    async def receive_type(self, kind: str, timeout: float = 5) -> dict:
+        """The next message of type `kind`, skipping the others (tallies, acks...)."""
+        while True:
+            message = await self.receive_json(timeout)
+            if message["type"] == kind:
+                return message
+
+    async def close(self, timeout: float = 5):
+        """Disconnect and wait for the app's handler to return."""
+        await self._to_app.put({"type": "websocket.disconnect", "code": 1000})
+        if self._task is None:
+            return
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not self._task.done():
+            # Unblock an app that is waiting to send us something
+            while not self._from_app.empty():
+                self._from_app.get_nowait()
+            await asyncio.wait([self._task], timeout=0.01)
+            if asyncio.get_running_loop().time() > deadline:
+                self._task.cancel()
+                return
+        if not self._task.cancelled():
+            self._task.exception()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Bytes on the wire and CPU per request for question-set payloads, per
+content-coding, with and without the precompressed catalog cache.
+
+Runs the real app against a temporary SQLite database loaded with the
+DVA-C02 day files.
+
+Usage:
+    python -m benchmarks.bench_compression [--requests 200] [--json compression.json]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from urllib.parse import quote
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark response compression on DVA-C02 payloads')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per measurement (default: 200)')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_compression_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'quiz.db')}"
+
+    # The app builds its engine from DATABASE_URL on first use, read once per process
+    from fastapi.testclient import TestClient
+    from app.db.session import engine
+    from app.main import app
+    from app.utils import compression
+    from app.utils.payload_cache import catalog_cache
+    from benchmarks.seed import load_dva_sets
+    from benchmarks.timing import write_json
+    from app.db.base import Base
+
+    engine.echo = False
+    Base.metadata.create_all(engine)
+    set_names = load_dva_sets(engine)
+    category = quote("AWS Certified Developer - Associate DVA-C02")
+    encodings = ["identity", *compression.PREFERENCE]
+    results = []
+
+    with TestClient(app) as client:
+        for set_name in set_names:
+            url = f"/api/v1/questions/by-category/{category}/set/{set_name}"
+            row = {'set': set_name}
+
+            for encoding in encodings:
+                headers = {"Accept-Encoding": encoding}
+                response = client.get(url, headers=headers)
+                wire_bytes = len(response.content) if encoding == "identity" else int(response.headers["content-length"])
+                assert response.headers.get("content-encoding", "identity") == encoding
+
+                # Warm cache: compressed bytes are reused
+                started = time.process_time()
+                for _ in range(args.requests):
+                    client.get(url, headers=headers)
+                cached_ms = (time.process_time() - started) / args.requests * 1000
+
+                # Cold cache: serialize and compress on every request
+                started = time.process_time()
+                for _ in range(args.requests):
+                    catalog_cache.clear()
+                    client.get(url, headers=headers)
+                uncached_ms = (time.process_time() - started) / args.requests * 1000
+
+                row[encoding] = {
+                    'bytes': wire_bytes,
+                    'cpu_ms_cached': round(cached_ms, 3),
+                    'cpu_ms_uncached': round(uncached_ms, 3)
+                }
+            results.append(row)
+
+    print(f"{'set':<16}" + "".join(f"{e:>28}" for e in encodings))
+    print(f"{'':<16}" + "".join(f"{'bytes / cpu ms hit / miss':>28}" for _ in encodings))
+    for row in results:
+        cells = "".join(
+            f"{row[e]['bytes']:>10} {row[e]['cpu_ms_cached']:>7.2f} / {row[e]['cpu_ms_uncached']:>6.2f}"
+            for e in encodings
+        )
+        print(f"{row['set']:<16}{cells}")
+
+    print("\nCompression totals:", compression.stats.snapshot())
+    write_json(args.json, {'sets': results, 'compression': compression.stats.snapshot()})
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
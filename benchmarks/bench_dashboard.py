@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Dashboard latency versus history size: two queries + Python totals (before)
+against the single CTE statement (after).
+
+Usage:
+    python -m benchmarks.bench_dashboard
+    python -m benchmarks.bench_dashboard --sizes 1000 10000 100000 --json dashboard.json
+"""
+
+import argparse
+import sys
+from sqlalchemy.orm import sessionmaker
+from app.repository import response_repo
+from benchmarks.seed import create_sqlite_engine, seed
+from benchmarks.timing import measure, write_json
+
+
+def legacy_dashboard(db, user_id):
+    """The dashboard as it was built before the single-statement query."""
+    statistics = response_repo.get_user_statistics(db, user_id)
+    recent_activity = response_repo.get_user_recent_activity(db, user_id, limit=10)
+    total_answered = sum(stat['total_answered'] for stat in statistics)
+    total_correct = sum(stat['correct_answers'] for stat in statistics)
+    return total_answered, total_correct, statistics, recent_activity
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark dashboard latency versus history size')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='Responses per user')
+    parser.add_argument('--users', type=int, default=5, help='Users seeded per size (default: 5)')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per measurement (default: 20)')
+    parser.add_argument('--json', help='Write results to this JSON file')
+
+    args = parser.parse_args()
+    results = []
+
+    print(f"{'history':>10} {'before (ms)':>12} {'after (ms)':>12} {'speedup':>8}")
+    for size in args.sizes:
+        engine = create_sqlite_engine()
+        seed(engine, users=args.users, responses_per_user=size)
+        db = sessionmaker(bind=engine)()
+
+        before = measure(lambda: legacy_dashboard(db, 1), repeat=args.repeat)
+        after = measure(lambda: response_repo.get_user_dashboard(db, 1), repeat=args.repeat)
+        speedup = before['median_ms'] / after['median_ms'] if after['median_ms'] else 0
+
+        print(f"{size:>10} {before['median_ms']:>12.2f} {after['median_ms']:>12.2f} {speedup:>7.2f}x")
+        results.append({'history': size, 'before': before, 'after': after})
+
+        db.close()
+        engine.dispose()
+
+    write_json(args.json, results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Question-set payload size per ?fields= subset on the DVA-C02 day files,
+uncompressed and per content-coding, plus the explanations fetched lazily
+afterwards.
+
+Usage:
+    python -m benchmarks.bench_fields [--json fields.json]
+"""
+
+import argparse
+import sys
+from typing import List
+from sqlalchemy.orm import sessionmaker
+from app.repository import question_repo
+from app.repository.question_repo import OPTIONAL_FIELDS
+from app.schemas.question import QuestionExplanation, sparse_question_type
+from app.utils import compression
+from app.utils.serialization import render
+from benchmarks.seed import create_sqlite_engine, load_dva_sets
+from benchmarks.timing import run_metadata, write_json
+
+CATEGORY = "AWS Certified Developer - Associate DVA-C02"
+
+# ?fields= values compared against the full payload
+SUBSETS = {
+    'full': OPTIONAL_FIELDS,
+    'no explanation': frozenset({"is_correct", "image_url"}),
+    'quiz (image only)': frozenset({"image_url"}),
+    'bare': frozenset(),
+}
+
+
+def _sizes(body: bytes) -> dict:
+    sizes = {'identity': len(body)}
+    for encoding in compression.PREFERENCE:
+        sizes[encoding] = len(compression.compress(body, encoding))
+    return sizes
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Measure sparse question payloads on DVA-C02 sets')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    engine = create_sqlite_engine()
+    set_names = load_dva_sets(engine)
+    db = sessionmaker(bind=engine)()
+    encodings = ["identity", *compression.PREFERENCE]
+
+    totals = {name: dict.fromkeys(encodings, 0) for name in [*SUBSETS, 'explanations']}
+    try:
+        for set_name in set_names:
+            for name, fields in SUBSETS.items():
+                questions = question_repo.get_questions_by_category_and_set(db, CATEGORY, set_name, fields=fields)
+                for encoding, size in _sizes(render(List[sparse_question_type(fields)], questions)).items():
+                    totals[name][encoding] += size
+
+            # What a client then fetches one question at a time from /{id}/explanation
+            for question in question_repo.get_questions_by_category_and_set(db, CATEGORY, set_name, fields=frozenset()):
+                body = render(QuestionExplanation, question_repo.get_question_explanation(db, question['id']))
+                for encoding, size in _sizes(body).items():
+                    totals['explanations'][encoding] += size
+    finally:
+        db.close()
+
+    full = totals['full']
+    print(f"{len(set_names)} DVA-C02 sets")
+    print(f"{'fields':<20}" + "".join(f"{e:>18}" for e in encodings))
+    results = []
+    for name, sizes in totals.items():
+        row = {'fields': name, 'bytes': sizes, 'vs_full': {e: round(sizes[e] / full[e], 3) for e in encodings}}
+        results.append(row)
+        print(f"{name:<20}" + "".join(f"{sizes[e]:>10,} ({row['vs_full'][e]:>4.0%})" for e in encodings))
+
+    write_json(args.json, {'meta': run_metadata(sets=len(set_names)), 'results': results})
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Memory per user and lookup latency of the mastery bitsets, against the
+set-of-ids and dict-of-ids representations they replace in memory.
+
+Usage:
+    python -m benchmarks.bench_mastery [--questions 100000] [--answered 0.01 0.1 0.5] [--json mastery.json]
+"""
+
+import argparse
+import random
+import sys
+from app.services import mastery_service
+from app.services.mastery_service import Mastery
+from benchmarks.timing import measure, run_metadata, write_json
+
+LOOKUPS = 10_000
+
+
+def _deep_size(obj) -> int:
+    """Bytes held by a set/dict of ints (container plus the int objects above the small-int cache)."""
+    items = list(obj.items()) if isinstance(obj, dict) else [(k, None) for k in obj]
+    size = sys.getsizeof(obj)
+    for key, value in items:
+        size += sys.getsizeof(key) if key > 256 else 0
+    return size
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark per-user mastery bitsets')
+    parser.add_argument('--questions', type=int, default=100_000, help='Questions in the catalog (default: 100000)')
+    parser.add_argument('--answered', type=float, nargs='+', default=[0.01, 0.1, 0.5],
+                        help='Fractions of the catalog a user has answered (default: 0.01 0.1 0.5)')
+    parser.add_argument('--set-size', type=int, default=65, help='Questions per set for the progress lookup (default: 65)')
+    parser.add_argument('--repeat', type=int, default=30, help='Timed runs per measurement (default: 30)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    probes = [rnd.randrange(1, args.questions + 1) for _ in range(LOOKUPS)]
+    set_start = rnd.randrange(1, max(2, args.questions - args.set_size))
+    set_ids = range(set_start, set_start + args.set_size)
+    set_mask = mastery_service._mask(set_ids)
+
+    print(f"{args.questions:,} questions, {LOOKUPS:,} lookups per run")
+    print(f"{'answered':>9} {'stored B':>10} {'bitset B':>10} {'set B':>10} {'dict B':>10} "
+          f"{'lookup ns':>10} {'set ns':>8} {'progress us':>12}")
+
+    results = []
+    for fraction in args.answered:
+        history = [(q, rnd.random() < 0.7) for q in rnd.sample(range(1, args.questions + 1), int(args.questions * fraction))]
+        mastery = Mastery.from_history(history)
+        as_set = {q for q, _ in history}
+        as_dict = dict(history)
+
+        bitset_lookup = measure(lambda: [mastery.last_correct(q) for q in probes], repeat=args.repeat)
+        set_lookup = measure(lambda: [q in as_set for q in probes], repeat=args.repeat)
+        progress = measure(lambda: [mastery.progress(set_mask) for _ in range(1000)], repeat=args.repeat)
+
+        row = {
+            'answered_fraction': fraction,
+            'answered': len(history),
+            'stored_bytes': mastery.nbytes(),
+            'bitset_memory_bytes': sys.getsizeof(mastery.answered) + sys.getsizeof(mastery.correct) + sys.getsizeof(mastery),
+            'set_memory_bytes': _deep_size(as_set),
+            'dict_memory_bytes': _deep_size(as_dict),
+            'bitset_lookup_ns': round(bitset_lookup['median_ms'] * 1e6 / LOOKUPS, 1),
+            'set_lookup_ns': round(set_lookup['median_ms'] * 1e6 / LOOKUPS, 1),
+            'set_progress_us': round(progress['median_ms'], 3),
+        }
+        results.append(row)
+        print(f"{len(history):>9,} {row['stored_bytes']:>10,} {row['bitset_memory_bytes']:>10,} "
+              f"{row['set_memory_bytes']:>10,} {row['dict_memory_bytes']:>10,} "
+              f"{row['bitset_lookup_ns']:>10} {row['set_lookup_ns']:>8} {row['set_progress_us']:>12}")
+
+    write_json(args.json, {
+        'meta': run_metadata(questions=args.questions, set_size=args.set_size, repeat=args.repeat),
+        'results': results
+    })
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
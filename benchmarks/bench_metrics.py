@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Cost of the instrumentation in nanoseconds: counter increments, histogram
+observations, MetricsMiddleware per request and the SQL cursor hooks per
+statement.
+
+Usage:
+    python -m benchmarks.bench_metrics [--ops 200000] [--requests 50000] [--json metrics.json]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from sqlalchemy import create_engine, text
+from app.db.instrumentation import instrument_engine
+from app.middleware.metrics import MetricsMiddleware
+from app.utils import request_stats
+from app.utils.metrics import Registry
+from benchmarks.timing import write_json
+
+
+def per_op_ns(fn, ops: int) -> float:
+    started = time.perf_counter()
+    for _ in range(ops):
+        fn()
+    return (time.perf_counter() - started) / ops * 1e9
+
+
+class _Route:
+    path_format = "/api/v1/questions/by-category/{category}"
+
+
+async def _endpoint(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def per_request_ns(app, requests: int) -> float:
+    """Drive a bare ASGI app in one event loop, so only the middleware's own cost is timed."""
+    scope = {"type": "http", "method": "GET", "path": "/"}
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    async def run():
+        for _ in range(requests):
+            await app(dict(scope), receive, send)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run())  # warm up
+        started = time.perf_counter()
+        loop.run_until_complete(run())
+        return (time.perf_counter() - started) / requests * 1e9
+    finally:
+        loop.close()
+
+
+def per_query_ns(instrumented: bool, queries: int) -> float:
+    engine = create_engine("sqlite://")
+    if instrumented:
+        instrument_engine(engine)
+    token = request_stats.start()
+    try:
+        with engine.connect() as conn:
+            statement = text("SELECT 1")
+            return per_op_ns(lambda: conn.execute(statement).all(), queries)
+    finally:
+        request_stats.reset(token)
+        engine.dispose()
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark metrics instrumentation overhead')
+    parser.add_argument('--ops', type=int, default=200000, help='Operations per primitive (default: 200000)')
+    parser.add_argument('--requests', type=int, default=50000, help='Requests through the middleware (default: 50000)')
+    parser.add_argument('--queries', type=int, default=20000, help='SQL statements per engine variant (default: 20000)')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    registry = Registry()
+    counter = registry.counter("bench_total", "Bench.", ("route", "status"))
+    histogram = registry.histogram("bench_seconds", "Bench.", ("route",))
+    labels = ("/api/v1/questions/by-category/{category}", "200")
+
+    primitives = {
+        'counter_inc_ns': per_op_ns(lambda: counter.inc(labels), args.ops),
+        'histogram_observe_ns': per_op_ns(lambda: histogram.observe(labels[:1], 0.042), args.ops),
+    }
+    for name, value in primitives.items():
+        print(f"{name:<28} {value:>10.0f}")
+
+    request_baseline = per_request_ns(_endpoint, args.requests)
+    request_instrumented = per_request_ns(MetricsMiddleware(_endpoint), args.requests)
+    query_baseline = per_query_ns(False, args.queries)
+    query_instrumented = per_query_ns(True, args.queries)
+    overhead = {
+        'middleware_ns_per_request': request_instrumented - request_baseline,
+        'cursor_hooks_ns_per_query': query_instrumented - query_baseline,
+    }
+    for name, value in overhead.items():
+        print(f"{name:<28} {value:>10.0f}")
+
+    results = {
+        'primitives': {k: round(v, 1) for k, v in primitives.items()},
+        'overhead': {k: round(v, 1) for k, v in overhead.items()},
+    }
+    write_json(args.json, results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
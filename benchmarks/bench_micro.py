@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for repository and service functions on a seeded database,
+without HTTP in the way.
+
+Usage:
+    python -m benchmarks.bench_micro [--scale small] [--database-url URL] [--repeat 30] [--json micro.json]
+"""
+
+import argparse
+import sys
+from typing import List
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark repository and service functions')
+    parser.add_argument('--scale', choices=['small', 'medium', 'large'], default='small', help='Seed size (default: small)')
+    parser.add_argument('--database-url', help='Database to seed (default: an in-memory SQLite)')
+    parser.add_argument('--repeat', type=int, default=30, help='Timed runs per function (default: 30)')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    from sqlalchemy.orm import sessionmaker
+    from app.repository import export_repo, leaderboard_repo, question_repo, response_repo
+    from app.schemas.question import QuestionWithAnswers
+    from app.services import export_service, leaderboard_service, question_service, response_service
+    from app.utils import serialization
+    from benchmarks.seed import SCALES, create_engine_for, reset, seed
+    from benchmarks.timing import measure, run_metadata, write_json
+
+    engine = create_engine_for(args.database_url)
+    reset(engine)
+    counts = seed(engine, **SCALES[args.scale])
+    db = sessionmaker(bind=engine)()
+    leaderboard_service.rebuild(db)
+
+    category = "Category 1"
+    questions = question_repo.get_questions_by_category(db, category)
+    export_rows = list(export_repo.iter_responses(db, user_id=1))
+
+    functions = {
+        'question_repo.count_questions_per_category': lambda: question_repo.count_questions_per_category(db),
+        'question_repo.get_question_sets_per_category': lambda: question_repo.get_question_sets_per_category(db),
+        'question_repo.get_questions_by_category': lambda: question_repo.get_questions_by_category(db, category),
+        'question_repo.get_questions_by_category_and_set': lambda: question_repo.get_questions_by_category_and_set(db, category, "Set_1"),
+        'question_service.get_categories_with_sets': lambda: question_service.get_categories_with_sets(db),
+        'response_repo.get_user_dashboard': lambda: response_repo.get_user_dashboard(db, 1),
+        'response_service.get_user_dashboard_data': lambda: response_service.get_user_dashboard_data(db, 1),
+        'leaderboard_repo.get_user_scores': lambda: leaderboard_repo.get_user_scores(db, 1),
+        'leaderboard_service.get_leaderboard': lambda: leaderboard_service.get_leaderboard(db, None, "correct", 10),
+        'leaderboard_service.get_user_rank': lambda: leaderboard_service.get_user_rank(1),
+        'serialization.render (by-category payload)': lambda: serialization.render(List[QuestionWithAnswers], questions),
+        'export_service.encode_rows (ndjson)': lambda: sum(len(c) for c in export_service.encode_rows(export_rows, "ndjson")),
+    }
+
+    print(f"{'function':<52} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    results = {}
+    for name, fn in functions.items():
+        stats = measure(fn, repeat=args.repeat)
+        results[name] = stats
+        print(f"{name:<52} {stats['median_ms']:>9.3f} {stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f}")
+
+    db.close()
+    write_json(args.json, {
+        'meta': run_metadata(database=engine.dialect.name, scale=args.scale, repeat=args.repeat),
+        'seed': counts,
+        'functions': results
+    })
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
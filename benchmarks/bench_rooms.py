@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Load test for quiz rooms: one host and many WebSocket clients in one room.
+
+Runs the real app in-process (clients are benchmarks.asgi_ws connections on
+the same event loop) against a temporary SQLite file loaded with a DVA-C02
+day file. For every question it measures how long the broadcast takes to
+reach all members, how long closing the question (the batched response
+write) takes, and checks that a few clients which stop reading are
+disconnected without holding the others up.
+
+Usage:
+    python -m benchmarks.bench_rooms [--members 200] [--questions 10] [--slow 5] [--json rooms.json]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+async def _run(args, app, code, tokens, question_ids_by_position):
+    from app.services import room_service
+    from benchmarks.asgi_ws import AsgiWebSocket, WebSocketClosed
+
+    def connect(user_id, **kwargs):
+        return AsgiWebSocket(app, f"/api/v1/rooms/{code}/ws", f"token={tokens[user_id]}", **kwargs).connect()
+
+    host = await connect(1)
+    members = [await connect(user_id) for user_id in range(2, args.members + 2)]
+    # Never read: once their socket buffer and send queue are full they get disconnected
+    slow = [await connect(user_id, receive_buffer=1) for user_id in range(args.members + 2, args.members + 2 + args.slow)]
+    for ws in (host, *members):
+        await ws.receive_type("room")
+
+    rnd = random.Random(args.seed)
+    broadcast_ms, close_ms, answers = [], [], 0
+
+    async def answer(ws, question):
+        nonlocal answers
+        await asyncio.sleep(rnd.random() * args.think_ms / 1000)
+        option = rnd.choice(question["answers"])["id"]
+        await ws.send_json({"type": "answer", "question_id": question["id"], "selected_option_id": option})
+        await ws.receive_type("ack")
+        answers += 1
+
+    for position in range(args.questions):
+        started = time.perf_counter()
+        await host.send_json({"type": "next"})
+        received = await asyncio.gather(*(ws.receive_type("question") for ws in (host, *members)))
+        broadcast_ms.append((time.perf_counter() - started) * 1000)
+        question = received[0]["question"]
+        assert question["id"] == question_ids_by_position[position]
+
+        await asyncio.gather(*(answer(ws, question) for ws in members))
+
+        started = time.perf_counter()
+        await host.send_json({"type": "close"})
+        results = await asyncio.gather(*(ws.receive_type("results", timeout=30) for ws in (host, *members)))
+        close_ms.append((time.perf_counter() - started) * 1000)
+        assert results[0]["answered"] == len(members) and results[0]["persisted"]
+
+    slow_disconnected = 0
+    for ws in slow:
+        try:
+            while True:
+                await ws.receive_json(timeout=0.5)
+        except (WebSocketClosed, asyncio.TimeoutError):
+            slow_disconnected += ws.close_code == room_service.CLOSE_TRY_AGAIN
+
+    await host.send_json({"type": "end"})
+    for ws in (host, *members, *slow):
+        await ws.close()
+    return broadcast_ms, close_ms, answers, slow_disconnected
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Load-test quiz rooms with many in-process WebSocket clients')
+    parser.add_argument('--members', type=int, default=200, help='Learners in the room (default: 200)')
+    parser.add_argument('--questions', type=int, default=10, help='Questions to ask (default: 10)')
+    parser.add_argument('--slow', type=int, default=5, help='Extra learners that never read (default: 5)')
+    parser.add_argument('--think-ms', type=float, default=200, help='Max random delay before answering (default: 200)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_rooms_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'quiz.db')}"
+
+    # The app builds its engine from DATABASE_URL on first use, read once per process
+    from sqlalchemy import insert
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.main import app
+    from app.models import User
+    from app.services import room_service
+    from app.utils.metrics import registry
+    from app.utils.security import create_access_token
+    from benchmarks.seed import load_dva_sets
+    from benchmarks.timing import run_metadata, summarize, write_json
+
+    engine.echo = False
+    Base.metadata.create_all(engine)
+    set_name = load_dva_sets(engine)[0]
+    users = args.members + args.slow + 1
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {'id': n, 'user_email': f"user{n}@example.com", 'account_name': f"user{n}", 'user_password': "x"}
+            for n in range(1, users + 1)
+        ])
+    tokens = {n: create_access_token({'sub': f"user{n}@example.com"}) for n in range(1, users + 1)}
+
+    db = SessionLocal()
+    try:
+        room = room_service.create_room(db, 1, "AWS Certified Developer - Associate DVA-C02", set_name)
+    finally:
+        db.close()
+    args.questions = min(args.questions, len(room.questions))
+    question_ids = [q['id'] for q in room.questions]
+
+    started = time.perf_counter()
+    broadcast_ms, close_ms, answers, slow_disconnected = asyncio.run(_run(args, app, room.code, tokens, question_ids))
+    elapsed = time.perf_counter() - started
+
+    results = {
+        'members': args.members,
+        'questions': args.questions,
+        'answers': answers,
+        'seconds': round(elapsed, 2),
+        'broadcast': summarize(broadcast_ms),
+        'close_and_persist': summarize(close_ms),
+        'slow_members': args.slow,
+        'slow_members_disconnected': slow_disconnected,
+    }
+
+    print(f"{args.members} members + {args.slow} slow, {args.questions} questions, {answers} answers in {elapsed:.2f}s")
+    print(f"question fan-out to all members: median {results['broadcast']['median_ms']} ms, "
+          f"max {results['broadcast']['max_ms']} ms")
+    print(f"close (batched write of {args.members} responses + results fan-out): "
+          f"median {results['close_and_persist']['median_ms']} ms, max {results['close_and_persist']['max_ms']} ms")
+    print(f"slow members disconnected: {slow_disconnected}/{args.slow}")
+    metrics = [line for line in registry.render().splitlines() if line.startswith(("room_messages", "room_tallies", "room_slow"))]
+    print("\n".join(metrics))
+
+    write_json(args.json, {'meta': run_metadata(members=args.members, questions=args.questions), 'results': results, 'metrics': metrics})
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
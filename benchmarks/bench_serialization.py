@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Serialization time per 1,000 questions: FastAPI's response_model path
+against the precompiled TypeAdapter and the trusted fast path.
+
+Usage:
+    python -m benchmarks.bench_serialization [--questions 1000] [--json serialization.json]
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import List
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from app.schemas.question import QuestionWithAnswers
+from app.utils import serialization
+from benchmarks.timing import measure, write_json
+
+
+def build_questions(count: int) -> list:
+    """Question payloads shaped like question_repo output, with DVA-sized texts."""
+    content = "A developer is deploying a new application and needs to securely store configuration. " * 4
+    explanation = "Parameter Store SecureString values are encrypted with KMS and can be retrieved at runtime. " * 6
+    return [
+        {
+            'id': i,
+            'content': f"{i}. {content}",
+            'image_url': None,
+            'category': "AWS Certified Developer - Associate DVA-C02",
+            'answers': [
+                {
+                    'id': i * 4 + a,
+                    'content': f"Store the values in option {a} and retrieve them with the SDK",
+                    'is_correct': a == 0,
+                    'explanation': explanation if a == 0 else None
+                }
+                for a in range(4)
+            ]
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark question payload serialization')
+    parser.add_argument('--questions', type=int, default=1000, help='Questions per payload (default: 1000)')
+    parser.add_argument('--repeat', type=int, default=30, help='Timed runs per path (default: 30)')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    data = build_questions(args.questions)
+    response_type = List[QuestionWithAnswers]
+
+    app = FastAPI()
+
+    @app.get("/questions", response_model=response_type)
+    def questions():
+        return data
+
+    route = next(r for r in app.routes if getattr(r, "path", None) == "/questions")
+    loop = asyncio.new_event_loop()
+
+    def fastapi_default():
+        content = loop.run_until_complete(serialize_response(
+            field=route.response_field, response_content=data, is_coroutine=True
+        ))
+        return JSONResponse(content).body
+
+    paths = {
+        'fastapi_response_model': fastapi_default,
+        'type_adapter_validated': lambda: serialization.render(response_type, data),
+        'trusted_fast_path': lambda: serialization.render(response_type, data, trusted=True),
+    }
+
+    assert serialization.render(response_type, data) == serialization.get_adapter(response_type).dump_json(
+        serialization.get_adapter(response_type).validate_python(data)
+    )
+
+    print(f"JSON encoder for trusted path: {'orjson' if serialization.orjson else 'json (stdlib)'}")
+    print(f"{'path':<26} {'ms / ' + str(args.questions) + ' questions':>24}")
+    results = {'questions': args.questions, 'orjson': serialization.orjson is not None, 'paths': {}}
+    for name, fn in paths.items():
+        stats = measure(fn, repeat=args.repeat)
+        results['paths'][name] = stats
+        print(f"{name:<26} {stats['median_ms']:>24.2f}")
+
+    loop.close()
+    write_json(args.json, results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files (from load.py, bench_micro.py or any
+script writing {name: {"median_ms": ...}} sections) and flag regressions.
+
+Usage:
+    python -m benchmarks.compare base.json new.json [--threshold 10]
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = ("median_ms", "p95_ms", "p99_ms", "throughput_rps")
+
+
+def _rows(results: dict) -> dict:
+    """Flatten result sections into {"section/name": stats} for every dict that has latency stats."""
+    rows = {}
+
+    def walk(prefix: str, value):
+        if isinstance(value, dict):
+            if any(metric in value for metric in METRICS):
+                rows[prefix] = value
+                return
+            for key, child in value.items():
+                if key != "meta":
+                    walk(f"{prefix}/{key}" if prefix else key, child)
+
+    walk("", results)
+    return rows
+
+
+def compare(base: dict, new: dict, threshold: float) -> list:
+    """One line per shared benchmark and metric: (name, metric, base, new, change %, regressed)."""
+    base_rows, new_rows = _rows(base), _rows(new)
+    lines = []
+    for name in sorted(base_rows.keys() & new_rows.keys()):
+        for metric in METRICS:
+            old, current = base_rows[name].get(metric), new_rows[name].get(metric)
+            if not old or current is None:
+                continue
+            change = (current - old) / old * 100
+            # Higher is better for throughput, lower is better for latency
+            worse = -change if metric == "throughput_rps" else change
+            lines.append((name, metric, old, current, change, worse > threshold))
+    return lines
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Compare two benchmark JSON files')
+    parser.add_argument('base', help='Baseline results')
+    parser.add_argument('new', help='New results')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Percent change reported as a regression (default: 10)')
+    args = parser.parse_args()
+
+    with open(args.base, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.new, encoding='utf-8') as f:
+        new = json.load(f)
+
+    for label, results in (("base", base), ("new", new)):
+        meta = results.get('meta', {}) if isinstance(results, dict) else {}
+        print(f"{label}: commit={meta.get('commit')} at {meta.get('timestamp')} on {meta.get('database', '?')}")
+
+    lines = compare(base, new, args.threshold)
+    print(f"\n{'benchmark':<56} {'metric':<15} {'base':>10} {'new':>10} {'change':>8}")
+    for name, metric, old, current, change, regressed in lines:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<56} {metric:<15} {old:>10.2f} {current:>10.2f} {change:>+7.1f}%{flag}")
+
+    regressions = sum(1 for line in lines if line[-1])
+    print(f"\n{regressions} regression(s) above {args.threshold:.0f}%")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
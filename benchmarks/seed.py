@@ -0,0 +1,217 @@
+"""
+Seed a database with synthetic quiz data for benchmarks.
+
+Uses Core executemany inserts against the app's own tables, so it works
+on any engine the app supports (an in-memory SQLite by default).
+"""
+import contextlib
+import importlib.util
+import io
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy import case, create_engine, func, insert, select, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.base import Base
+from app.models import User, Question, Answer, Response, UserCategoryScore
+
+BATCH_SIZE = 10_000
+
+# Keyword arguments for seed() at named sizes
+SCALES = {
+    'small': {'users': 20, 'categories': 3, 'sets_per_category': 5, 'questions_per_set': 20, 'responses_per_user': 200},
+    'medium': {'users': 200, 'categories': 5, 'sets_per_category': 10, 'questions_per_set': 40, 'responses_per_user': 1000},
+    'large': {'users': 2000, 'categories': 10, 'sets_per_category': 20, 'questions_per_set': 50, 'responses_per_user': 2000},
+}
+
+DVA_DIR = Path(__file__).resolve().parent.parent / "data" / "CSV"
+
+
+def create_sqlite_engine(path: str | None = None):
+    """Create a SQLite engine (in-memory unless a file path is given) with the schema in place."""
+    if path:
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def create_engine_for(url: str | None = None, path: str | None = None):
+    """
+    Engine for a benchmark run: the given URL (e.g. a local Postgres) or a SQLite database.
+
+    The schema is created if it is missing; existing tables are left alone.
+    """
+    if not url:
+        return create_sqlite_engine(path)
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def reset(engine):
+    """Drop and recreate every table."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def _insert_batches(conn, table, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.execute(insert(table), batch)
+            batch = []
+    if batch:
+        conn.execute(insert(table), batch)
+
+
+def seed(
+    engine,
+    users: int = 10,
+    categories: int = 3,
+    sets_per_category: int = 5,
+    questions_per_set: int = 20,
+    answers_per_question: int = 4,
+    responses_per_user: int = 1000,
+    accuracy: float = 0.7,
+    seed: int = 0,
+    password: str | None = None
+) -> dict:
+    """
+    Insert users, questions with answers, and responses; returns the row counts.
+
+    Users are `user<N>@example.com`; give `password` to make them able to
+    log in (it is hashed once and shared). The leaderboard rollup is
+    backfilled from the inserted responses.
+    """
+    rnd = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    content = "Which AWS service should a developer use to meet these requirements? " * 4
+    explanation = "The correct option satisfies every requirement in the question stem. " * 6
+
+    question_ids = []
+    correct_answer = {}
+    wrong_answer = {}
+    question_rows = []
+    answer_rows = []
+    answer_id = 1
+
+    for c in range(categories):
+        for s in range(sets_per_category):
+            for _ in range(questions_per_set):
+                question_id = len(question_ids) + 1
+                question_ids.append(question_id)
+                question_rows.append({
+                    'id': question_id,
+                    'content': f"Q{question_id}. {content}",
+                    'category': f"Category {c + 1}",
+                    'question_set': f"Set_{s + 1}"
+                })
+                correct_index = rnd.randrange(answers_per_question)
+                wrong_index = (correct_index + 1) % answers_per_question
+                for a in range(answers_per_question):
+                    is_correct = a == correct_index
+                    answer_rows.append({
+                        'id': answer_id,
+                        'question_id': question_id,
+                        'content': f"Option {a + 1} for question {question_id}: use a managed service",
+                        'is_correct': is_correct,
+                        'explanation': explanation if is_correct else None
+                    })
+                    if is_correct:
+                        correct_answer[question_id] = answer_id
+                    elif a == wrong_index:
+                        wrong_answer[question_id] = answer_id
+                    answer_id += 1
+
+    def response_rows():
+        for user_id in range(1, users + 1):
+            for k in range(responses_per_user):
+                question_id = rnd.choice(question_ids)
+                is_correct = rnd.random() < accuracy
+                yield {
+                    'user_id': user_id,
+                    'question_id': question_id,
+                    'selected_option_id': (correct_answer if is_correct else wrong_answer)[question_id],
+                    'is_correct': is_correct,
+                    'answered_at': start + timedelta(minutes=k)
+                }
+
+    if password is not None:
+        from app.utils.security import get_password_hash
+        password_hash = get_password_hash(password)
+    else:
+        password_hash = "x"
+
+    with engine.begin() as conn:
+        _insert_batches(conn, User.__table__, (
+            {'id': u, 'user_email': f"user{u}@example.com", 'account_name': f"user{u}", 'user_password': password_hash}
+            for u in range(1, users + 1)
+        ))
+        _insert_batches(conn, Question.__table__, question_rows)
+        _insert_batches(conn, Answer.__table__, answer_rows)
+        _insert_batches(conn, Response.__table__, response_rows())
+        _backfill_scores(conn)
+        _backfill_mastery(conn)
+        if engine.dialect.name == "postgresql":
+            _sync_sequences(conn)
+
+    return {
+        'users': users,
+        'questions': len(question_rows),
+        'answers': len(answer_rows),
+        'responses': users * responses_per_user
+    }
+
+
+def _backfill_scores(conn):
+    """Fill the leaderboard rollup the way the migration does."""
+    conn.execute(insert(UserCategoryScore).from_select(
+        ['user_id', 'category', 'answered', 'correct'],
+        select(
+            Response.user_id,
+            func.coalesce(Question.category, ""),
+            func.count(Response.id),
+            func.sum(case((Response.is_correct == True, 1), else_=0))
+        ).join(
+            Question, Question.id == Response.question_id
+        ).group_by(Response.user_id, func.coalesce(Question.category, ""))
+    ))
+
+
+def _backfill_mastery(conn):
+    """Build the user_mastery bitsets the way the migration does."""
+    from app.services import mastery_service
+
+    mastery_service.backfill(Session(bind=conn))
+
+
+def _sync_sequences(conn):
+    """Move serial sequences past the explicit ids inserted above."""
+    for table in ("users", "answers", "responses"):
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+
+
+def load_dva_sets(engine) -> list:
+    """Import the DVA-C02 day files with the project's own importer; returns the set names."""
+    spec = importlib.util.spec_from_file_location("process_and_import", DVA_DIR / "process_and_import.py")
+    importer = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(importer)
+
+    db = sessionmaker(bind=engine)()
+    set_names = []
+    try:
+        csv_files = sorted((DVA_DIR / "split_days").glob("DVA-C02_Day_*.csv"), key=lambda p: int(p.stem.split("_")[-1]))
+        for csv_file in csv_files:
+            with contextlib.redirect_stdout(io.StringIO()):
+                importer.import_csv_to_database(csv_file, csv_file.stem, db, Question, Answer)
+            set_names.append(csv_file.stem)
+    finally:
+        db.close()
+
+    return set_names
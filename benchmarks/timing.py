@@ -0,0 +1,68 @@
+"""
+Small timing helpers shared by the benchmark scripts.
+"""
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+
+def percentile(sorted_samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * fraction))]
+
+
+def summarize(samples_ms: list) -> dict:
+    """Latency statistics in milliseconds for a list of samples."""
+    samples = sorted(samples_ms)
+    if not samples:
+        return {'median_ms': None, 'p95_ms': None, 'p99_ms': None, 'min_ms': None, 'max_ms': None, 'runs': 0}
+    return {
+        'median_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(percentile(samples, 0.95), 3),
+        'p99_ms': round(percentile(samples, 0.99), 3),
+        'min_ms': round(samples[0], 3),
+        'max_ms': round(samples[-1], 3),
+        'runs': len(samples)
+    }
+
+
+def measure(fn, repeat: int = 20, warmup: int = 2) -> dict:
+    """Call `fn` repeatedly and return latency statistics in milliseconds."""
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    return summarize(samples)
+
+
+def run_metadata(**extra) -> dict:
+    """Commit, time and interpreter of a run, so result files can be compared across commits."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        **extra
+    }
+
+
+def write_json(path: str | None, results) -> None:
+    """Write benchmark results as JSON when a path is given."""
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {path}")
@@ -0,0 +1,65 @@
+"""
+Shared fixtures: an isolated in-memory SQLite database per test.
+"""
+import os
+
+# The app's own engine (used where get_db is not overridden) is built from this on first use
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+# Query budget violations fail the test instead of only being logged
+os.environ.setdefault("QUERY_BUDGET_MODE", "raise")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.base import Base
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(engine):
+    """TestClient for the real app, with get_db (and the session factory) bound to the test database."""
+    from fastapi.testclient import TestClient
+    from app.db.instrumentation import instrument_engine
+    from app.db.session import get_db, get_session_factory
+    from app.main import app
+
+    instrument_engine(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        session = factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: factory
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_session_factory, None)
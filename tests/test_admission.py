@@ -0,0 +1,216 @@
+"""
+Admission control: per-class concurrency, bounded queue, fast 503 shedding.
+"""
+import asyncio
+import logging
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+from app.middleware.admission import (
+    AdmissionMiddleware, Limiter, PRIORITY_CHEAP, PRIORITY_NORMAL, default_limiters, limiters_for, pool_split,
+    priority, route_class
+)
+from app.settings import Settings
+from app.utils.payload_cache import CachedPayload, catalog_cache
+
+
+def _app(limiter: Limiter, gate: asyncio.Event) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, limiters={"dashboard": limiter}, enabled=True)
+
+    @app.get("/api/v1/responses/dashboard")
+    async def dashboard():
+        await gate.wait()
+        return {"ok": True}
+
+    @app.get("/api/v1/responses/export")
+    async def export():
+        await gate.wait()
+        return {"ok": True}
+
+    @app.get("/api/v1/health")
+    async def health():
+        return {"ok": True}
+
+    return app
+
+
+def test_route_classes():
+    assert route_class("/api/v1/auth/login") == "auth"
+    assert route_class("/api/v1/questions/categories") == "catalog"
+    assert route_class("/api/v1/responses/submit-bulk") == "submissions"
+    assert route_class("/api/v1/responses/dashboard") == "dashboard"
+    assert route_class("/api/v1/leaderboard/me") == "dashboard"
+    assert route_class("/api/v1/users/me") == "dashboard"
+    assert route_class("/api/v1/admin/slow-queries") == "dashboard"
+    assert route_class("/api/v1/rooms") == "catalog"
+    assert route_class("/api/v1/responses/export") == "exports"
+    assert route_class("/api/v1/health") is None
+    assert route_class("/metrics") is None
+
+
+def test_default_limits_fit_the_pool(monkeypatch, caplog):
+    # The default pool: 5 connections plus 10 overflow
+    assert pool_split(15) == {"auth": 3, "catalog": 6, "submissions": 3, "dashboard": 2, "exports": 1}
+    assert sum(pool_split(40).values()) == 40
+    with caplog.at_level(logging.WARNING, logger="app.middleware.admission"):
+        limiters = default_limiters(15)
+    assert sum(limiter.concurrency for limiter in limiters.values()) == 15
+    assert limiters["catalog"].queue_size == 24
+    assert not caplog.records
+
+    monkeypatch.setenv("ADMISSION_CATALOG_CONCURRENCY", "16")
+    monkeypatch.setenv("ADMISSION_CATALOG_QUEUE", "100")
+    settings = Settings.from_env()
+    assert settings.admission_concurrency == (("catalog", 16),)
+    with caplog.at_level(logging.WARNING, logger="app.middleware.admission"):
+        catalog = limiters_for(settings)["catalog"]
+    assert (catalog.concurrency, catalog.queue_size) == (16, 100)
+    assert "admit 25 concurrent requests" in caplog.text
+
+
+def test_small_pool_sheds_instead_of_timing_out(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=1, max_overflow=0, pool_timeout=0.5
+    )
+    gate = asyncio.Event()
+    app = FastAPI()
+    limiters = default_limiters(1, timeout=0.1)
+    app.add_middleware(AdmissionMiddleware, limiters=limiters, enabled=True)
+
+    @app.get("/api/v1/responses/dashboard")
+    async def dashboard():
+        conn = await asyncio.to_thread(engine.connect)
+        try:
+            await gate.wait()
+            return {"answer": conn.execute(text("SELECT 1")).scalar()}
+        finally:
+            conn.close()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            running = asyncio.ensure_future(client.get("/api/v1/responses/dashboard"))
+            await asyncio.sleep(0.05)
+            # Waiting on the pool would fail after its 0.5s timeout; these are shed after 0.1s in the queue
+            shed = await asyncio.gather(*(client.get("/api/v1/responses/dashboard") for _ in range(3)))
+            assert [r.status_code for r in shed] == [503, 503, 503]
+            gate.set()
+            assert (await running).json() == {"answer": 1}
+        assert engine.pool.checkedout() == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        engine.dispose()
+
+
+def test_cached_catalog_reads_are_cheap():
+    path = "/api/v1/questions/by-category/AWS/set/Set 1"
+    catalog_cache.clear()
+    try:
+        assert priority("catalog", path) == PRIORITY_NORMAL
+        catalog_cache.put(("by-set", "AWS", "Set 1"), CachedPayload(b"[]"))
+        assert priority("catalog", path) == PRIORITY_CHEAP
+        # Per-user filtered lists never come from the cache
+        assert priority("catalog", path, b"filter=incorrect") == PRIORITY_NORMAL
+        assert priority("catalog", path, b"filter=all") == PRIORITY_CHEAP
+    finally:
+        catalog_cache.clear()
+
+
+def test_full_queue_is_shed_with_retry_after():
+    async def scenario():
+        gate = asyncio.Event()
+        limiter = Limiter("dashboard", concurrency=1, queue_size=1, timeout=5)
+        transport = httpx.ASGITransport(app=_app(limiter, gate))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            running = asyncio.ensure_future(client.get("/api/v1/responses/dashboard"))
+            await asyncio.sleep(0.01)
+            queued = asyncio.ensure_future(client.get("/api/v1/responses/dashboard"))
+            await asyncio.sleep(0.01)
+            assert (limiter.active, limiter.waiting) == (1, 1)
+
+            shed = await client.get("/api/v1/responses/dashboard")
+            assert shed.status_code == 503
+            assert int(shed.headers["retry-after"]) >= 1
+            # Unclassified paths are never limited
+            assert (await client.get("/api/v1/health")).status_code == 200
+
+            gate.set()
+            assert (await running).status_code == 200
+            assert (await queued).status_code == 200
+        assert (limiter.active, limiter.waiting) == (0, 0)
+
+    asyncio.run(scenario())
+
+
+def test_exports_do_not_hold_dashboard_slots():
+    async def scenario():
+        gate = asyncio.Event()
+        limiter = Limiter("dashboard", concurrency=1, queue_size=1, timeout=5)
+        transport = httpx.ASGITransport(app=_app(limiter, gate))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            exports = [asyncio.ensure_future(client.get("/api/v1/responses/export")) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            assert (limiter.active, limiter.waiting) == (0, 0)
+            dashboard = asyncio.ensure_future(client.get("/api/v1/responses/dashboard"))
+            await asyncio.sleep(0.01)
+            assert limiter.active == 1
+            gate.set()
+            assert (await dashboard).status_code == 200
+            assert [r.status_code for r in await asyncio.gather(*exports)] == [200, 200, 200]
+
+    asyncio.run(scenario())
+
+
+def test_queued_request_times_out():
+    async def scenario():
+        gate = asyncio.Event()
+        limiter = Limiter("dashboard", concurrency=1, queue_size=4, timeout=0.05, initial_service_time=0.01)
+        transport = httpx.ASGITransport(app=_app(limiter, gate))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            running = asyncio.ensure_future(client.get("/api/v1/responses/dashboard"))
+            await asyncio.sleep(0.01)
+            assert (await client.get("/api/v1/responses/dashboard")).status_code == 503
+            gate.set()
+            assert (await running).status_code == 200
+        assert (limiter.active, limiter.waiting) == (0, 0)
+
+    asyncio.run(scenario())
+
+
+def test_deadline_that_cannot_be_met_is_shed_without_queueing():
+    async def scenario():
+        limiter = Limiter("dashboard", concurrency=1, queue_size=10, timeout=1, initial_service_time=2)
+        assert await limiter.acquire() is None
+        assert await limiter.acquire() == "deadline"
+        assert limiter.waiting == 0
+        limiter.release()
+        assert limiter.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_cheap_requests_jump_the_queue():
+    async def scenario():
+        limiter = Limiter("catalog", concurrency=1, queue_size=10, timeout=5)
+        order = []
+
+        async def request(label, prio):
+            assert await limiter.acquire(prio) is None
+            order.append(label)
+            limiter.release()
+
+        assert await limiter.acquire() is None
+        tasks = [asyncio.ensure_future(request("expensive", PRIORITY_NORMAL))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.ensure_future(request("cheap", PRIORITY_CHEAP)))
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*tasks)
+        assert order == ["cheap", "expensive"]
+        assert limiter.active == 0
+
+    asyncio.run(scenario())
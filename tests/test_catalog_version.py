@@ -0,0 +1,81 @@
+"""
+Catalog writes bump the version, and watchers invalidate in-process caches.
+"""
+import time
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from app.db.catalog_version import CatalogVersionWatcher
+from app.models import Question, Answer
+from app.utils.payload_cache import CachedPayload, PayloadCache
+
+
+def _version(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT version FROM catalog_version WHERE id = 1")).scalar()
+
+
+def test_catalog_writes_bump_the_version(engine, db):
+    start = _version(engine)
+
+    db.add(Question(id=1, content="q", category="AWS"))
+    db.commit()
+    db.add(Answer(id=1, question_id=1, content="a", is_correct=True))
+    db.commit()
+    db.query(Question).filter(Question.id == 1).update({"content": "q2"})
+    db.commit()
+
+    assert _version(engine) == start + 3
+
+
+def test_watcher_notifies_subscribers_once_per_change(engine, db):
+    cache = PayloadCache()
+    cache.put(("categories",), CachedPayload(b"[]"))
+    seen = []
+    watcher = CatalogVersionWatcher(engine)
+    watcher.subscribe(seen.append)
+    watcher.subscribe(cache.invalidate)
+
+    first = watcher.poll()
+    assert seen == [] and cache.get(("categories",)) is not None
+
+    db.add(Question(id=1, content="q", category="AWS"))
+    db.commit()
+    assert watcher.poll() == first + 1
+    assert watcher.poll() == first + 1
+    assert seen == [first + 1]
+    assert cache.get(("categories",)) is None
+
+
+def test_watcher_thread_converges_within_the_poll_interval(engine):
+    watcher = CatalogVersionWatcher(engine, poll_interval=0.02)
+    changed = []
+    watcher.subscribe(changed.append)
+    watcher.start()
+    try:
+        deadline = time.monotonic() + 2
+        while watcher.version is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        db = sessionmaker(bind=engine)()
+        db.add(Question(id=1, content="q"))
+        db.commit()
+        db.close()
+
+        while not changed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert changed == [watcher.version]
+    finally:
+        watcher.stop()
+
+
+def test_payload_built_before_an_invalidation_is_not_stored():
+    cache = PayloadCache()
+
+    def stale():
+        cache.invalidate()
+        return b"[]"
+
+    cache.get_or_create(("categories",), stale)
+    assert cache.get(("categories",)) is None
+    cache.get_or_create(("categories",), lambda: b"[]")
+    assert cache.get(("categories",)) is not None
@@ -0,0 +1,76 @@
+"""
+Tests for Accept-Encoding negotiation, the compression middleware and the
+precompressed payload cache.
+"""
+import gzip
+from typing import List
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.middleware.compression import CompressionMiddleware
+from app.utils import compression
+from app.utils.payload_cache import PayloadCache
+
+
+def test_negotiate_respects_q_values_and_wildcards():
+    available = ("br", "gzip")
+    assert compression.negotiate(None, available) is None
+    assert compression.negotiate("gzip, deflate, br", available) == "br"
+    assert compression.negotiate("br;q=0.5, gzip", available) == "gzip"
+    assert compression.negotiate("br;q=0, *", available) == "gzip"
+    assert compression.negotiate("*;q=0", available) is None
+    assert compression.negotiate("x-gzip", available) == "gzip"
+    assert compression.negotiate("gzip;q=0.5, identity", available) is None
+    assert compression.negotiate("deflate", available) is None
+
+
+def _app(cache: PayloadCache, calls: list) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/big")
+    def big():
+        return {"data": "x" * 1000}
+
+    @app.get("/small")
+    def small():
+        return {"data": "x"}
+
+    @app.get("/cached")
+    def cached(request: Request):
+        def load():
+            calls.append(1)
+            return ["question text " * 100]
+        return cache.respond(request, ("cached",), load, List[str])
+
+    return app
+
+
+def test_middleware_compresses_large_bodies_only():
+    client = TestClient(_app(PayloadCache(), []))
+
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == {"data": "x" * 1000}
+
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/big", headers={"Accept-Encoding": "identity"}).headers
+
+
+def test_cached_payload_is_compressed_once():
+    cache, calls = PayloadCache(), []
+    client = TestClient(_app(cache, calls))
+
+    before = compression.stats.snapshot().get("gzip", {}).get("count", 0)
+    for _ in range(3):
+        response = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+    assert compression.stats.snapshot()["gzip"]["count"] == before + 1
+    assert len(calls) == 1
+
+    raw = client.get("/cached", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers
+    assert gzip.decompress(cache.get(("cached",)).encoded("gzip")) == raw.content
+
+    etag = raw.headers["etag"]
+    assert client.get("/cached", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,75 @@
+"""
+The single-statement dashboard must match the per-query implementation.
+"""
+import random
+from datetime import datetime, timedelta
+from app.models import User, Question, Answer, Response
+from app.repository import response_repo
+
+
+def test_dashboard_statement_matches_separate_queries(db):
+    db.add(User(id=1, user_email="a@example.com", account_name="a", user_password="x"))
+    for i in range(1, 21):
+        db.add(Question(id=i, content="x" * i * 10, category=["AWS", "GCP", None][i % 3]))
+        db.add(Answer(id=i, question_id=i, content="a", is_correct=True))
+    rnd = random.Random(1)
+    for k in range(200):
+        db.add(Response(user_id=1, question_id=rnd.randint(1, 20), selected_option_id=1,
+                        is_correct=rnd.random() < 0.5, answered_at=datetime(2025, 1, 1) + timedelta(minutes=k)))
+    db.commit()
+
+    dashboard = response_repo.get_user_dashboard(db, 1)
+    statistics = response_repo.get_user_statistics(db, 1)
+
+    by_category = lambda stats: sorted(stats, key=lambda s: str(s['category']))
+    assert by_category(dashboard['by_category']) == by_category(statistics)
+    assert dashboard['recent_activity'] == response_repo.get_user_recent_activity(db, 1, limit=10)
+    assert dashboard['overall'] == {
+        'total_answered': 200,
+        'total_correct': sum(s['correct_answers'] for s in statistics)
+    }
+
+
+def test_dashboard_statement_for_user_without_history(db):
+    assert response_repo.get_user_dashboard(db, 42) == {
+        'overall': {'total_answered': 0, 'total_correct': 0},
+        'by_category': [],
+        'recent_activity': []
+    }
+
+
+def _seed_history(db, days_ago):
+    db.add(User(id=1, user_email="a@example.com", account_name="a", user_password="x"))
+    db.add(Question(id=1, content="q", category="AWS"))
+    db.add(Answer(id=1, question_id=1, content="a", is_correct=True))
+    now = datetime.now()
+    for k, days in enumerate(days_ago):
+        db.add(Response(user_id=1, question_id=1, selected_option_id=1, is_correct=True,
+                        answered_at=now - timedelta(days=days, minutes=k)))
+    db.commit()
+
+
+def test_dashboard_window_only_bounds_recent_activity(db):
+    _seed_history(db, [1, 2, 90, 91])
+
+    dashboard = response_repo.get_user_dashboard(db, 1, since=datetime.now() - timedelta(days=30))
+
+    assert dashboard['overall']['total_answered'] == 4
+    assert len(dashboard['recent_activity']) == 2
+
+
+def test_dashboard_falls_back_to_full_history_for_quiet_users(db):
+    from app.services import response_service
+
+    _seed_history(db, [90, 91, 120])
+
+    result = response_service.get_user_dashboard_data(db, 1)
+
+    assert result['overall']['total_answered'] == 3
+    assert [a['id'] for a in result['recent_activity']] == [1, 2, 3]
+
+
+def test_partition_upkeep_is_a_no_op_without_postgres(db):
+    from app.db import partitions
+
+    assert partitions.ensure_response_partitions(db) == 0
@@ -0,0 +1,85 @@
+"""
+Exam sessions: start, answer, resume and finish an attempt at a question set.
+"""
+from app.models import Answer, ExamSession, Question, Response, User
+from app.models.types import pack_ints, unpack_ints
+from app.services import leaderboard_service
+from app.utils.security import create_access_token
+
+
+def _seed(db):
+    leaderboard_service.leaderboards = leaderboard_service.Leaderboards()
+    db.add(User(id=1, user_email="a@example.com", account_name="a", user_password="x"))
+    db.add(User(id=2, user_email="b@example.com", account_name="b", user_password="x"))
+    for question_id in range(1, 6):
+        db.add(Question(id=question_id, content=f"Q{question_id}", category="AWS", question_set="Day 5"))
+        db.add_all([
+            Answer(id=question_id * 10 + i, question_id=question_id, content=str(i), is_correct=i == 0)
+            for i in range(3)
+        ])
+    db.add(Question(id=6, content="Q6", category="AWS", question_set=None))
+    db.commit()
+    return (
+        {"Authorization": f"Bearer {create_access_token({'sub': 'a@example.com'})}"},
+        {"Authorization": f"Bearer {create_access_token({'sub': 'b@example.com'})}"},
+    )
+
+
+def test_packed_ints_round_trip():
+    values = [1, 0, 2_000_000_000, 42]
+    assert len(pack_ints(values)) == 16
+    assert unpack_ints(pack_ints(values)) == values
+
+
+def test_exam_session_lifecycle(client, db):
+    headers, other = _seed(db)
+
+    started = client.post("/api/v1/exams/", json={"category": "AWS", "question_set": "Day 5"}, headers=headers)
+    assert started.status_code == 201
+    session = started.json()
+    assert session["attempt"] == 1
+    assert session["question_ids"] == [1, 2, 3, 4, 5]
+    assert session["selected_option_ids"] == [None] * 5
+    assert session["next_index"] == 0
+
+    sid = session["id"]
+    for question_id, option in ((1, 10), (2, 21), (3, 30), (2, 20)):
+        progress = client.post(f"/api/v1/exams/{sid}/answers", json={"question_id": question_id, "selected_option_id": option}, headers=headers)
+        assert progress.status_code == 200
+    assert progress.json() == {"session_id": sid, "answered": 3, "total": 5}
+
+    # Nothing is written to responses until the session is finished
+    assert db.query(Response).count() == 0
+
+    resumed = client.get(f"/api/v1/exams/{sid}", headers=headers).json()
+    assert resumed["selected_option_ids"] == [10, 20, 30, None, None]
+    assert resumed["next_index"] == 3
+    assert client.get(f"/api/v1/exams/{sid}", headers=other).status_code == 404
+
+    # Options of another question, and questions outside the session, are rejected
+    assert client.post(f"/api/v1/exams/{sid}/answers", json={"question_id": 4, "selected_option_id": 10}, headers=headers).status_code == 422
+    assert client.post(f"/api/v1/exams/{sid}/answers", json={"question_id": 6, "selected_option_id": 10}, headers=headers).status_code == 422
+
+    result = client.post(f"/api/v1/exams/{sid}/finish", headers=headers).json()
+    assert result == {"session_id": sid, "attempt": 1, "total": 5, "answered": 3, "correct": 3, "accuracy": 100.0}
+    assert sorted((r.question_id, r.selected_option_id, r.is_correct) for r in db.query(Response)) == [
+        (1, 10, True), (2, 20, True), (3, 30, True)
+    ]
+    assert client.post(f"/api/v1/exams/{sid}/finish", headers=headers).status_code == 409
+    assert client.post(f"/api/v1/exams/{sid}/answers", json={"question_id": 4, "selected_option_id": 40}, headers=headers).status_code == 409
+
+    finished = client.get(f"/api/v1/exams/{sid}", headers=headers).json()
+    assert finished["correct"] == 3 and finished["finished_at"] is not None
+
+    again = client.post("/api/v1/exams/", json={"category": "AWS", "question_set": "Day 5", "shuffle": True}, headers=headers).json()
+    assert again["attempt"] == 2
+    assert sorted(again["question_ids"]) == [1, 2, 3, 4, 5]
+
+    # "Default" is the set of questions without one
+    default = client.post("/api/v1/exams/", json={"category": "AWS", "question_set": "Default"}, headers=headers).json()
+    assert default["question_ids"] == [6]
+    assert client.post("/api/v1/exams/", json={"category": "GCP"}, headers=headers).status_code == 404
+
+    stored = db.get(ExamSession, sid)
+    db.refresh(stored)
+    assert (stored.answered, stored.correct) == (3, 3)
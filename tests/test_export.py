@@ -0,0 +1,76 @@
+"""
+Tests for the streaming response export.
+"""
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+from sqlalchemy.orm import sessionmaker
+from app.models import User, Question, Answer, Response
+from app.services import export_service
+
+
+def _seed(db):
+    db.add_all([
+        User(id=1, user_email="a@example.com", account_name="a", user_password="x"),
+        User(id=2, user_email="b@example.com", account_name="b", user_password="x"),
+        Question(id=1, content="Q1", category="AWS", question_set="Day_1"),
+        Question(id=2, content="Q2", category="GCP"),
+        Answer(id=1, question_id=1, content="Lambda", is_correct=True),
+        Answer(id=2, question_id=2, content="Pub/Sub", is_correct=False),
+    ])
+    db.add_all([
+        Response(user_id=1 + i % 2, question_id=1 + i % 2, selected_option_id=1 + i % 2,
+                 is_correct=i % 2 == 0, answered_at=datetime(2025, 1, 1 + i))
+        for i in range(20)
+    ])
+    db.commit()
+
+
+def test_csv_export_streams_in_chunks(db):
+    _seed(db)
+    stats = export_service.ExportStats()
+    rows = export_service.export_repo.iter_responses(db, batch_size=3)
+    chunks = list(export_service.encode_rows(rows, "csv", stats=stats, chunk_size=200))
+
+    assert len(chunks) > 1
+    parsed = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+    assert len(parsed) == stats.rows == 20
+    assert parsed[0]['selected_option'] == "Lambda"
+    assert parsed[0]['answered_at'] == "2025-01-01T00:00:00"
+
+
+def test_gzipped_ndjson_export_with_filters(engine):
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    _seed(db)
+    db.close()
+
+    data = b"".join(export_service.stream_export(
+        Session, "ndjson", compress=True, user_id=1, start=datetime(2025, 1, 5)
+    ))
+    records = [json.loads(line) for line in gzip.decompress(data).decode().splitlines()]
+
+    assert len(records) == 8
+    assert all(r['user_id'] == 1 and r['category'] == "AWS" for r in records)
+    assert records[0]['question_set'] == "Day_1"
+
+
+def test_export_route_limits_non_admins_to_their_own_responses(client, db, monkeypatch):
+    from app.api.dependencies import auth
+    from app.utils.security import create_access_token
+
+    _seed(db)
+    monkeypatch.setattr(auth, "ADMIN_EMAILS", {"b@example.com"})
+
+    def export(email, query=""):
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+        response = client.get(f"/api/v1/responses/export?format=ndjson{query}", headers=headers)
+        assert response.status_code == 200
+        return [json.loads(line) for line in response.text.splitlines()]
+
+    # Asking for someone else's responses still returns only the caller's own
+    assert {r['user_id'] for r in export("a@example.com", "&user_id=2")} == {1}
+    assert len(export("b@example.com")) == 20
+    assert {r['user_id'] for r in export("b@example.com", "&user_id=1")} == {1}
@@ -0,0 +1,46 @@
+"""
+The scale-data generator must be deterministic and keep every foreign key valid.
+"""
+from sqlalchemy import create_engine, text
+from app.db.base import Base
+from benchmarks.generate import Spec, finish, generate, generate_chunk
+
+SPEC = Spec(questions=50, categories=3, sets_per_category=4, users=30, responses=2_000, seed=7, chunk_size=500)
+
+
+def test_chunks_are_reproducible():
+    assert generate_chunk(SPEC, 'responses', 2) == generate_chunk(SPEC, 'responses', 2)
+    assert generate_chunk(SPEC, 'responses', 2) != generate_chunk(SPEC, 'responses', 3)
+
+
+def test_worker_count_does_not_change_output(tmp_path):
+    generate(SPEC, csv_dir=str(tmp_path / "one"), workers=1)
+    generate(SPEC, csv_dir=str(tmp_path / "two"), workers=2)
+
+    files = sorted(p.name for p in (tmp_path / "one").iterdir())
+    assert len(files) == 1 + 1 + 1 + 4
+    for name in files:
+        assert (tmp_path / "one" / name).read_bytes() == (tmp_path / "two" / name).read_bytes()
+
+
+def test_generated_rows_load_with_consistent_keys(tmp_path):
+    url = f"sqlite:///{tmp_path / 'scale.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+
+    counts = generate(SPEC, database_url=url)
+    finish(engine)
+    assert counts == {'users': 30, 'questions': 50, 'answers': 200, 'responses': 2_000}
+
+    with engine.connect() as conn:
+        scalar = lambda sql: conn.execute(text(sql)).scalar()
+        # The selected answer belongs to the question and agrees with is_correct
+        assert scalar(
+            "SELECT COUNT(*) FROM responses r JOIN answers a ON a.id = r.selected_option_id "
+            "WHERE a.question_id = r.question_id AND a.is_correct = r.is_correct"
+        ) == 2_000
+        assert scalar("SELECT COUNT(*) FROM answers WHERE is_correct") == 50
+        assert scalar("SELECT COUNT(DISTINCT category) FROM questions") == 3
+        assert 0.4 < scalar("SELECT AVG(is_correct) FROM responses") < 0.9
+        assert scalar("SELECT SUM(answered) FROM user_category_scores") == 2_000
+    engine.dispose()
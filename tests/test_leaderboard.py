@@ -0,0 +1,79 @@
+"""
+Tests for the skip-list backed leaderboards.
+"""
+import random
+from app.models import User, Question, Answer
+from app.schemas.response import ResponseCreate
+from app.services import leaderboard_service, response_service
+from app.services.leaderboard_service import Leaderboards, METRIC_ACCURACY, METRIC_CORRECT
+from app.utils.skiplist import IndexableSkipList
+
+
+def test_skiplist_matches_sorted_list():
+    skiplist = IndexableSkipList(seed=1)
+    reference = []
+    rnd = random.Random(2)
+
+    for _ in range(3000):
+        if reference and rnd.random() < 0.4:
+            key = rnd.choice(reference)
+            skiplist.remove(key)
+            reference.remove(key)
+        else:
+            key = rnd.randrange(10**9)
+            if key in reference:
+                continue
+            skiplist.insert(key)
+            reference.append(key)
+
+    reference.sort()
+    assert list(skiplist) == reference
+    assert list(skiplist.islice(5, 15)) == reference[5:15]
+    for index in range(0, len(reference), 13):
+        assert skiplist.rank(reference[index]) == index
+        assert skiplist[index] == reference[index]
+
+
+def test_board_is_bounded_and_ranks_by_metric():
+    boards = Leaderboards(max_entries=3, min_attempts=5)
+    for user_id, (answered, correct) in enumerate([(10, 9), (4, 4), (20, 12), (8, 2), (6, 6)], start=1):
+        boards.update_user(user_id, {"AWS": (answered, correct)}, ["AWS"])
+
+    top, total = boards.top("AWS", METRIC_CORRECT, 10)
+    assert total == 3
+    assert [user_id for _, user_id, _, _ in top] == [3, 1, 5]
+    assert boards.rank("AWS", METRIC_CORRECT, 4) is None
+
+    # User 2 has too few attempts for the accuracy board
+    top, _ = boards.top(None, METRIC_ACCURACY, 10)
+    assert [user_id for _, user_id, _, _ in top] == [5, 1, 3]
+
+
+def test_submissions_update_rollup_and_dashboard_rank(db):
+    db.add_all([
+        User(id=1, user_email="a@example.com", account_name="a", user_password="x"),
+        User(id=2, user_email="b@example.com", account_name="b", user_password="x"),
+        Question(id=1, content="Q1", category="AWS"),
+        Question(id=2, content="Q2", category="AWS"),
+        Answer(id=1, question_id=1, content="A", is_correct=True),
+        Answer(id=2, question_id=2, content="B", is_correct=False),
+    ])
+    db.commit()
+    leaderboard_service.rebuild(db)
+
+    response_service.submit_response(db, 1, ResponseCreate(question_id=1, selected_option_id=1, is_correct=True))
+    response_service.submit_responses_bulk(db, 2, [
+        ResponseCreate(question_id=1, selected_option_id=1, is_correct=True),
+        ResponseCreate(question_id=2, selected_option_id=2, is_correct=True),
+    ])
+
+    board = leaderboard_service.get_leaderboard(db, "AWS", METRIC_CORRECT, 10)
+    assert [(e['user_id'], e['correct_answers']) for e in board['entries']] == [(2, 2), (1, 1)]
+
+    dashboard = response_service.get_user_dashboard_data(db, 1)
+    assert dashboard['rank']['correct_rank'] == 2
+    assert dashboard['by_category'][0]['rank'] == 2
+
+    # A rebuild from the rollup table yields the same ranking
+    leaderboard_service.rebuild(db)
+    assert leaderboard_service.get_user_rank(2, "AWS")['correct_rank'] == 1
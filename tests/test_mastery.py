@@ -0,0 +1,110 @@
+"""
+Per-user mastery bitsets: answered / last-correct lookups and set progress.
+"""
+from datetime import datetime
+from app.models import Answer, Question, Response, User, UserMastery
+from app.services import leaderboard_service, mastery_service
+from app.services.mastery_service import Mastery
+from app.utils.security import create_access_token
+
+
+def test_bitset_lookups_and_progress():
+    mastery = Mastery()
+    mastery.record(3, True)
+    mastery.record(5, False)
+    mastery.record(3, False)
+    mastery.record(9, True)
+    mastery.record(-1, True)  # out of range ids are ignored
+
+    assert mastery.has_answered(3) and not mastery.has_answered(4)
+    assert mastery.last_correct(3) is False
+    assert mastery.last_correct(9) is True
+    assert mastery.last_correct(4) is None
+    assert mastery.progress(mastery_service._mask([3, 4, 5])) == (2, 0)
+    assert mastery.progress(mastery_service._mask(range(10))) == (3, 1)
+
+    restored = Mastery(*mastery.to_bytes())
+    assert [restored.last_correct(q) for q in range(12)] == [mastery.last_correct(q) for q in range(12)]
+    history = Mastery.from_history([(3, True), (5, False), (3, False), (9, True)])
+    assert history.to_bytes() == mastery.to_bytes() == (bytes([0b00101000, 0b10]), bytes([0, 0b10]))
+    assert mastery.nbytes() == 4
+
+
+def test_submits_update_bitsets_and_set_progress(client, db):
+    mastery_service.cache.clear()
+    mastery_service.invalidate_set_masks()
+    leaderboard_service.leaderboards = leaderboard_service.Leaderboards()
+    db.add(User(id=1, user_email="a@example.com", account_name="a", user_password="x"))
+    for question_id in range(1, 9):
+        db.add(Question(id=question_id, content=f"Q{question_id}", category="AWS", question_set="Day 1" if question_id <= 4 else None))
+        db.add(Answer(id=question_id * 10, question_id=question_id, content="a", is_correct=True))
+        db.add(Answer(id=question_id * 10 + 1, question_id=question_id, content="b", is_correct=False))
+    # Answered before bitsets existed: the user_mastery migration builds the row
+    db.add(Response(user_id=1, question_id=5, selected_option_id=50, is_correct=True))
+    db.commit()
+    assert mastery_service.backfill(db) == 1
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'a@example.com'})}"}
+
+    def submit(question_id, correct):
+        option = question_id * 10 if correct else question_id * 10 + 1
+        body = {"question_id": question_id, "selected_option_id": option, "is_correct": correct}
+        assert client.post("/api/v1/responses/submit", json=body, headers=headers).status_code == 200
+
+    submit(1, True)
+    submit(2, False)
+    bulk = {"responses": [
+        {"question_id": 2, "selected_option_id": 20, "is_correct": True},
+        {"question_id": 3, "selected_option_id": 31, "is_correct": False},
+    ]}
+    assert client.post("/api/v1/responses/submit-bulk", json=bulk, headers=headers).status_code == 200
+
+    stored = db.get(UserMastery, 1)
+    mastery = Mastery(stored.answered, stored.correct)
+    assert [q for q in range(1, 9) if mastery.has_answered(q)] == [1, 2, 3, 5]
+    assert [mastery.last_correct(q) for q in (1, 2, 3, 5)] == [True, True, False, True]
+
+    progress = client.get("/api/v1/responses/progress", params={"category": "AWS"}, headers=headers).json()
+    assert progress == [
+        {"question_set": "Day 1", "total_questions": 4, "answered": 3, "correct": 2},
+        {"question_set": "Default", "total_questions": 4, "answered": 1, "correct": 1},
+    ]
+    mastery_service.cache.clear()
+
+
+def test_backfill_and_first_submit_without_a_row(client, db):
+    mastery_service.cache.clear()
+    mastery_service.invalidate_set_masks()
+    leaderboard_service.leaderboards = leaderboard_service.Leaderboards()
+    db.add_all([
+        User(id=1, user_email="a@example.com", account_name="a", user_password="x"),
+        User(id=2, user_email="b@example.com", account_name="b", user_password="x"),
+        Question(id=1, content="Q1", category="AWS", question_set="Day 1"),
+        Question(id=2, content="Q2", category="AWS", question_set="Day 1"),
+        Answer(id=10, question_id=1, content="a", is_correct=True),
+        Answer(id=11, question_id=1, content="b", is_correct=False),
+        Answer(id=20, question_id=2, content="a", is_correct=True),
+    ])
+    db.add_all([
+        Response(user_id=1, question_id=1, selected_option_id=10, is_correct=True, answered_at=datetime(2026, 1, 1)),
+        Response(user_id=1, question_id=1, selected_option_id=11, is_correct=False, answered_at=datetime(2026, 1, 2)),
+    ])
+    db.commit()
+
+    # Only users with responses get a row, holding their latest answer per question
+    assert mastery_service.backfill(db, batch_size=1) == 1
+    db.commit()
+    stored = db.get(UserMastery, 1)
+    assert Mastery(stored.answered, stored.correct).last_correct(1) is False
+    assert db.get(UserMastery, 2) is None
+
+    # No row means nothing answered yet: progress reads nothing else, the first submit creates the row
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'b@example.com'})}"}
+    progress = client.get("/api/v1/responses/progress", params={"category": "AWS"}, headers=headers).json()
+    assert progress == [{"question_set": "Day 1", "total_questions": 2, "answered": 0, "correct": 0}]
+    body = {"question_id": 2, "selected_option_id": 20, "is_correct": True}
+    assert client.post("/api/v1/responses/submit", json=body, headers=headers).status_code == 200
+    db.expire_all()
+    stored = db.get(UserMastery, 2)
+    assert Mastery(stored.answered, stored.correct).last_correct(2) is True
+    mastery_service.cache.clear()
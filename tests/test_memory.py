@@ -0,0 +1,49 @@
+"""
+Tests for the admin memory diagnostics.
+"""
+from app.api.dependencies import auth
+from app.models import User, Question
+from app.utils import memory
+from app.utils.security import create_access_token
+
+_retained = []
+
+
+def allocate_payloads():
+    _retained.extend(bytearray(10_000) for _ in range(200))
+
+
+def test_tracemalloc_snapshots_and_diff(client, db, monkeypatch):
+    monkeypatch.setattr(auth, "ADMIN_EMAILS", {"admin@example.com"})
+    question = Question(id=1, content="Q1", category="AWS")
+    db.add_all([User(id=1, user_email="admin@example.com", account_name="admin", user_password="x"), question])
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'admin@example.com'})}"}
+    memory.tracer.clear()
+
+    try:
+        assert client.post("/api/v1/admin/memory/snapshots", json={}, headers=headers).status_code == 409
+        assert client.post("/api/v1/admin/memory/tracemalloc/start", json={"frames": 1}, headers=headers).json()["tracing"]
+
+        before = client.post("/api/v1/admin/memory/snapshots", json={"label": "before"}, headers=headers).json()
+        allocate_payloads()
+        after = client.post("/api/v1/admin/memory/snapshots", json={"label": "after"}, headers=headers).json()
+
+        diff = client.get(f"/api/v1/admin/memory/snapshots/{after['id']}/diff/{before['id']}", headers=headers).json()
+        top_site = diff["sites"][0]
+        assert "test_memory.py" in top_site["site"]
+        assert top_site["size_diff_bytes"] >= 2_000_000
+
+        top = client.get(f"/api/v1/admin/memory/snapshots/{after['id']}", params={"key_type": "filename"}, headers=headers)
+        assert top.status_code == 200 and top.json()["sites"]
+        assert client.get("/api/v1/admin/memory/snapshots/999", headers=headers).status_code == 404
+
+        summary = client.get("/api/v1/admin/memory", headers=headers).json()
+        assert summary["orm"]["models"]["Question"] >= 1
+        assert summary["gc"]["generations"][0]["collections"] >= 0
+        assert summary["caches"]["catalog"]["max_entries"] > 0
+        assert [s["label"] for s in summary["tracemalloc"]["snapshots"]] == ["before", "after"]
+    finally:
+        assert not client.post("/api/v1/admin/memory/tracemalloc/stop", headers=headers).json()["tracing"]
+        memory.tracer.clear()
+        _retained.clear()
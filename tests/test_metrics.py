@@ -0,0 +1,78 @@
+"""
+Tests for the metrics primitives, the metrics middleware and the SQL
+instrumentation.
+"""
+import threading
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.api import metrics as metrics_api
+from app.db.instrumentation import instrument_engine
+from app.middleware.metrics import DB_QUERIES, REQUESTS, REQUEST_SECONDS, MetricsMiddleware
+from app.utils import request_stats
+from app.utils.metrics import Registry
+
+
+def test_counter_sums_per_thread_shards():
+    registry = Registry()
+    counter = registry.counter("jobs_total", "Jobs.", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(("a",))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value(("a",)) == 4000
+    assert 'jobs_total{kind="a"} 4000' in registry.render()
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(("/x",), value)
+
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{route="/x",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/x",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/x"} 4' in lines
+    assert 'latency_seconds_sum{route="/x"} 3.65' in lines
+
+
+def test_middleware_labels_routes_by_template_and_counts_queries(engine):
+    instrument_engine(engine)
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_api.router)
+
+    @app.get("/metrics-test/items/{item_id}")
+    def item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        with request_stats.timed("serialize"), engine.connect() as conn:
+            conn.execute(text("SELECT 1")).all()
+            conn.execute(text("SELECT 2")).all()
+        return {"id": item_id}
+
+    route = "/metrics-test/items/{item_id}"
+    client = TestClient(app)
+    before = DB_QUERIES.count((route,))
+    client.get("/metrics-test/items/1")
+    client.get("/metrics-test/items/2")
+    client.get("/metrics-test/items/0")
+
+    assert REQUESTS.value(("GET", route, "200")) >= 2
+    assert REQUESTS.value(("GET", route, "404")) >= 1
+    assert REQUEST_SECONDS.count(("GET", route)) >= 3
+    assert DB_QUERIES.count((route,)) == before + 3
+
+    body = client.get("/metrics").text
+    assert 'http_request_db_queries_bucket{route="/metrics-test/items/{item_id}",le="2.0"}' in body
+    assert 'http_request_phase_seconds_count{route="/metrics-test/items/{item_id}",phase="serialize"} ' in body
+    assert "/metrics-test/items/1" not in body
@@ -0,0 +1,69 @@
+"""
+Tests for the on-demand request profiler.
+"""
+import time
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from app.middleware.profiling import ProfilingMiddleware
+from app.utils import profiling
+from app.utils.profiling import ProfileStore, ProfilingControl
+
+
+def slow_dependency():
+    time.sleep(0.05)
+    return 1
+
+
+def slow_endpoint_work():
+    time.sleep(0.05)
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/work")
+    def work(value: int = Depends(slow_dependency)):
+        slow_endpoint_work()
+        return {"value": value}
+
+    return app
+
+
+def test_tokens_are_signed_and_expire():
+    token = profiling.sign_token("secret", ttl_seconds=60, now=1000)
+    assert profiling.verify_token("secret", token, now=1030)
+    assert not profiling.verify_token("secret", token, now=1061)
+    assert not profiling.verify_token("other", token, now=1030)
+    assert not profiling.verify_token("secret", "9999999999.deadbeef")
+    assert not profiling.verify_token("", token, now=1030)
+
+
+def test_signed_header_profiles_dependencies_and_endpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_SECRET", "secret")
+    monkeypatch.setattr(profiling, "store", ProfileStore(str(tmp_path), max_files=2))
+    client = TestClient(_app())
+
+    assert "x-profile-file" not in client.get("/work").headers
+    assert "x-profile-file" not in client.get("/work", headers={"X-Profile": "1.bad"}).headers
+    assert profiling.store.list() == []
+
+    response = client.get("/work", headers={"X-Profile": profiling.sign_token("secret")})
+    assert response.json() == {"value": 1}
+    stacks = (tmp_path / response.headers["x-profile-file"]).read_text()
+    assert "slow_dependency" in stacks
+    assert "slow_endpoint_work" in stacks
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks.splitlines())
+
+
+def test_armed_paths_and_bounded_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "store", ProfileStore(str(tmp_path), max_files=2))
+    monkeypatch.setattr(profiling, "control", ProfilingControl())
+    client = TestClient(_app())
+
+    profiling.control.arm("/work", 3)
+    names = [client.get("/work").headers.get("x-profile-file") for _ in range(4)]
+    assert all(names[:3]) and names[3] is None
+    assert profiling.control.armed() == {}
+    assert len(profiling.store.list()) == 2
+    assert profiling.store.path("../etc/passwd") is None
@@ -0,0 +1,74 @@
+"""
+Tests for query budgets, the N+1 detector and the endpoints they guard.
+"""
+import logging
+import pytest
+from sqlalchemy import text
+from app.db.instrumentation import instrument_engine
+from app.db.query_budget import QueryBudget, QueryBudgetExceeded, statement_shape
+from app.models import User, Question, Answer
+from app.services import leaderboard_service
+from app.utils.payload_cache import catalog_cache
+from app.utils.security import create_access_token
+
+
+def test_statement_shape_collapses_parameter_lists():
+    assert statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == statement_shape("SELECT * FROM t WHERE id IN (?)")
+    assert statement_shape("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (...)"
+    assert statement_shape("SELECT 1 WHERE a = %(a_1)s") == "SELECT 1 WHERE a = %(a_1)s"
+
+
+def test_budget_raises_on_too_many_queries_and_repeats(engine):
+    instrument_engine(engine)
+    with engine.connect() as conn:
+        with QueryBudget(2):
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+        with pytest.raises(QueryBudgetExceeded, match="3 queries"):
+            with QueryBudget(2):
+                for i in range(3):
+                    conn.execute(text(f"SELECT {i}"))
+
+        with pytest.raises(QueryBudgetExceeded, match="N\\+1"):
+            with QueryBudget(10, max_repeats=3):
+                for i in range(4):
+                    conn.execute(text("SELECT :i"), {"i": i})
+
+
+def test_budget_only_logs_in_log_mode(engine, caplog):
+    instrument_engine(engine)
+    with caplog.at_level(logging.WARNING, logger="app.db.query_budget"):
+        with engine.connect() as conn, QueryBudget(0, name="report", mode="log"):
+            conn.execute(text("SELECT 1"))
+
+    assert "Query budget exceeded in report: 1 queries (budget 0)" in caplog.text
+
+
+def test_endpoint_query_counts_do_not_grow_with_data(client, db):
+    catalog_cache.clear()
+    leaderboard_service.leaderboards = leaderboard_service.Leaderboards()
+    db.add(User(id=1, user_email="a@example.com", account_name="a", user_password="x"))
+    for question_id in range(1, 41):
+        db.add(Question(id=question_id, content=f"Q{question_id}", category=f"C{question_id % 4}", question_set=f"S{question_id % 3}"))
+        db.add_all([
+            Answer(id=question_id * 10 + i, question_id=question_id, content=str(i), is_correct=i == 0)
+            for i in range(4)
+        ])
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'a@example.com'})}"}
+
+    # Each route raises QueryBudgetExceeded (QUERY_BUDGET_MODE=raise) if it regresses to N+1
+    assert len(client.get("/api/v1/questions/categories").json()) == 4
+    assert len(client.get("/api/v1/questions/categories-with-sets").json()) == 4
+    questions = client.get("/api/v1/questions/by-category/C1").json()
+    assert len(questions) == 10 and all(len(q["answers"]) == 4 for q in questions)
+    assert len(client.get("/api/v1/questions/by-category/C1/set/S1").json()) == 4
+
+    bulk = {"responses": [
+        {"question_id": question_id, "selected_option_id": question_id * 10, "is_correct": True}
+        for question_id in range(1, 41)
+    ]}
+    created = client.post("/api/v1/responses/submit-bulk", json=bulk, headers=headers).json()
+    assert [r["question_id"] for r in created] == list(range(1, 41))
+    assert client.get("/api/v1/responses/dashboard", headers=headers).json()["overall"]["total_answered"] == 40
@@ -0,0 +1,64 @@
+"""
+POST /api/v1/questions/batch: several sets and/or question ids in one round trip.
+"""
+from sqlalchemy import event
+from app.models import Answer, Question
+from app.schemas.question import QuestionBatchOut
+from app.utils.serialization import get_adapter
+
+
+def _seed(db):
+    for question_id in range(1, 10):
+        question_set = ("Set 1", "Set 2", None)[(question_id - 1) // 3]
+        db.add(Question(id=question_id, content=f"Q{question_id}", category="AWS", question_set=question_set))
+        db.add_all([
+            Answer(id=question_id * 10 + i, question_id=question_id, content=str(i), is_correct=i == 0)
+            for i in range(2)
+        ])
+    db.add(Question(id=10, content="Q10", category="GCP", question_set="Set 1"))
+    db.commit()
+
+
+def test_batch_groups_and_deduplicates(client, db, engine):
+    _seed(db)
+    body = {
+        "sets": [
+            {"category": "AWS", "question_set": "Set 2"},
+            {"category": "AWS", "question_set": "Set 1"},
+            {"category": "AWS", "question_set": "Set 2"},
+            {"category": "AWS", "question_set": "Nope"},
+        ],
+        # 4 is already part of Set 2; 7 and 10 pull in their own sets
+        "question_ids": [4, 7, 10, 404],
+    }
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = client.post("/api/v1/questions/batch", json=body)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert response.status_code == 200
+    assert len(statements) == 2
+
+    result = get_adapter(QuestionBatchOut).validate_python(response.json())
+    assert [(g.category, g.question_set, [q.id for q in g.questions]) for g in result.sets] == [
+        ("AWS", "Set 2", [4, 5, 6]),
+        ("AWS", "Set 1", [1, 2, 3]),
+        ("AWS", "Nope", []),
+        ("AWS", "Default", [7]),
+        ("GCP", "Set 1", [10]),
+    ]
+    assert result.missing_ids == [404]
+    assert [a.id for a in result.sets[0].questions[0].answers] == [40, 41]
+
+
+def test_batch_default_set_and_validation(client, db):
+    _seed(db)
+    default = client.post("/api/v1/questions/batch", json={"sets": [{"category": "AWS"}]}).json()
+    assert [q["id"] for q in default["sets"][0]["questions"]] == [7, 8, 9]
+
+    assert client.post("/api/v1/questions/batch", json={}).status_code == 422
+    too_many = {"sets": [{"category": "AWS", "question_set": f"Set {n}"} for n in range(51)]}
+    assert client.post("/api/v1/questions/batch", json=too_many).status_code == 422
@@ -0,0 +1,76 @@
+"""
+?fields= sparse question payloads and the lazy explanation endpoint.
+"""
+from sqlalchemy import event
+from app.api.v1.question import cache_key
+from app.models import Answer, Question
+from app.utils.payload_cache import catalog_cache
+
+
+def _seed(db):
+    catalog_cache.clear()
+    for question_id in (1, 2):
+        db.add(Question(id=question_id, content=f"Q{question_id}", category="AWS", question_set="Day 1", image_url="q.png"))
+        db.add_all([
+            Answer(id=question_id * 10 + i, question_id=question_id, content=str(i), is_correct=i == 0,
+                   explanation="Because." if i == 0 else None)
+            for i in range(2)
+        ])
+    db.commit()
+
+
+def _statements(engine, fn):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        return fn(), statements
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+
+def test_fields_select_and_send_only_requested_columns(client, db, engine):
+    _seed(db)
+    full = client.get("/api/v1/questions/by-category/AWS/set/Day 1").json()
+    assert full[0]["image_url"] == "q.png"
+    assert full[0]["answers"][0] == {"id": 10, "content": "0", "is_correct": True, "explanation": "Because."}
+
+    response, statements = _statements(engine, lambda: client.get("/api/v1/questions/by-category/AWS/set/Day 1?fields="))
+    bare = response.json()
+    assert bare[0] == {"id": 1, "content": "Q1", "category": "AWS", "answers": [{"id": 10, "content": "0"}, {"id": 11, "content": "1"}]}
+    assert len(statements) == 2
+    assert not any(column in sql for sql in statements for column in ("explanation", "is_correct", "image_url"))
+
+    quiz = client.get("/api/v1/questions/by-category/AWS?fields=is_correct,image_url").json()
+    assert quiz[1]["image_url"] == "q.png"
+    assert quiz[1]["answers"][1] == {"id": 21, "content": "1", "is_correct": False}
+
+    batch = client.post("/api/v1/questions/batch?fields=", json={"question_ids": [2]}).json()
+    assert batch["sets"][0]["questions"][0]["answers"][0] == {"id": 20, "content": "0"}
+
+    assert client.get("/api/v1/questions/by-category/AWS?fields=answers").status_code == 422
+
+
+def test_sparse_payloads_are_cached_per_field_set():
+    path = "/by-category/AWS/set/Day 1"
+    assert cache_key(path) == ("by-set", "AWS", "Day 1")
+    assert cache_key(path, b"fields=image_url,explanation,is_correct") == ("by-set", "AWS", "Day 1")
+    assert cache_key(path, b"fields=is_correct,image_url") == ("by-set", "AWS", "Day 1", ("image_url", "is_correct"))
+    assert cache_key(path, b"fields=") == ("by-set", "AWS", "Day 1", ())
+    assert cache_key(path, b"fields=bogus") is None
+    assert cache_key("/7/explanation") == ("explanation", 7)
+
+
+def test_explanation_endpoint(client, db, engine):
+    _seed(db)
+    response, statements = _statements(engine, lambda: client.get("/api/v1/questions/2/explanation"))
+    assert response.status_code == 200
+    assert len(statements) == 1
+    assert response.json() == {
+        "question_id": 2,
+        "answers": [
+            {"id": 20, "is_correct": True, "explanation": "Because."},
+            {"id": 21, "is_correct": False, "explanation": None},
+        ],
+    }
+    assert client.get("/api/v1/questions/99/explanation").status_code == 404
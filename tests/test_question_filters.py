@@ -0,0 +1,97 @@
+"""
+?filter=unanswered|incorrect on the catalog question lists.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from app.models import Answer, Question, Response, User
+from app.services import mastery_service
+from app.utils.payload_cache import catalog_cache
+from app.utils.security import create_access_token
+
+
+def _seed(db):
+    catalog_cache.clear()
+    mastery_service.cache.clear()
+    db.add(User(id=1, user_email="a@example.com", account_name="a", user_password="x"))
+    for question_id in range(1, 6):
+        db.add(Question(id=question_id, content=f"Q{question_id}", category="AWS", question_set="Day 5" if question_id < 5 else None))
+        db.add_all([
+            Answer(id=question_id * 10 + i, question_id=question_id, content=str(i), is_correct=i == 0)
+            for i in range(2)
+        ])
+    start = datetime(2026, 1, 1)
+    # Q1 wrong then right, Q2 right then wrong, Q3 wrong; Q4 and Q5 never answered
+    for n, (question_id, option) in enumerate([(1, 11), (2, 20), (3, 31), (1, 10), (2, 21)]):
+        db.add(Response(user_id=1, question_id=question_id, selected_option_id=option,
+                        is_correct=option % 10 == 0, answered_at=start + timedelta(minutes=n)))
+    db.commit()
+    mastery_service.backfill(db)
+    db.commit()
+    return {"Authorization": f"Bearer {create_access_token({'sub': 'a@example.com'})}"}
+
+
+def _ids(response):
+    assert response.status_code == 200
+    return [q["id"] for q in response.json()]
+
+
+def test_filters_follow_latest_answer(client, db):
+    headers = _seed(db)
+
+    assert _ids(client.get("/api/v1/questions/by-category/AWS?filter=unanswered", headers=headers)) == [4, 5]
+    assert _ids(client.get("/api/v1/questions/by-category/AWS?filter=incorrect", headers=headers)) == [2, 3]
+    assert _ids(client.get("/api/v1/questions/by-category/AWS?filter=all", headers=headers)) == [1, 2, 3, 4, 5]
+
+    assert _ids(client.get("/api/v1/questions/by-category/AWS/set/Day 5?filter=unanswered", headers=headers)) == [4]
+    assert _ids(client.get("/api/v1/questions/by-category/AWS/set/Default?filter=unanswered", headers=headers)) == [5]
+    assert _ids(client.get("/api/v1/questions/by-category/AWS/set/Default?filter=incorrect", headers=headers)) == []
+
+    # Answers come along with the filtered questions
+    filtered = client.get("/api/v1/questions/by-category/AWS?filter=incorrect", headers=headers).json()
+    assert [a["id"] for a in filtered[0]["answers"]] == [20, 21]
+
+
+def test_filters_need_authentication(client, db):
+    _seed(db)
+    assert client.get("/api/v1/questions/by-category/AWS?filter=unanswered").status_code == 401
+    bad = {"Authorization": "Bearer not-a-token"}
+    assert client.get("/api/v1/questions/by-category/AWS?filter=incorrect", headers=bad).status_code == 401
+    assert client.get("/api/v1/questions/by-category/AWS?filter=nope").status_code == 422
+    # Unfiltered lists stay anonymous
+    assert client.get("/api/v1/questions/by-category/AWS").status_code == 200
+
+
+def test_filtered_query_count_is_independent_of_history(client, db, engine):
+    headers = _seed(db)
+    start = datetime(2026, 2, 1)
+    db.add_all([
+        Response(user_id=1, question_id=3, selected_option_id=31, is_correct=False, answered_at=start + timedelta(seconds=n))
+        for n in range(500)
+    ])
+    db.commit()
+
+    counts = []
+    for _ in range(2):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            assert _ids(client.get("/api/v1/questions/by-category/AWS?filter=incorrect", headers=headers)) == [2, 3]
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        counts.append(len(statements))
+    # User lookup, mastery row (read every time, never from the cache), questions, answers
+    assert counts == [4, 4]
+
+
+def test_filters_see_submits_made_through_another_worker(client, db):
+    headers = _seed(db)
+    # This worker cached the bitsets before the submit below went through another worker
+    stale = mastery_service.read_mastery(db, 1)
+
+    body = {"question_id": 4, "selected_option_id": 41, "is_correct": False}
+    assert client.post("/api/v1/responses/submit", json=body, headers=headers).status_code == 200
+    mastery_service.cache.put(1, stale)
+
+    assert _ids(client.get("/api/v1/questions/by-category/AWS?filter=unanswered", headers=headers)) == [5]
+    assert _ids(client.get("/api/v1/questions/by-category/AWS?filter=incorrect", headers=headers)) == [2, 3, 4]
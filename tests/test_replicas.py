@@ -0,0 +1,125 @@
+"""
+Read-only routes go to a healthy replica; writers and broken replicas fall back to the primary.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db import replicas
+from app.db.base import Base
+from app.models import User, Question, Answer
+from app.utils.security import create_access_token
+
+
+@pytest.fixture
+def replica_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+def _install(monkeypatch, client, *engines, **kwargs):
+    router = replicas.ReplicaRouter(
+        [replicas.Replica(f"replica{i}", e) for i, e in enumerate(engines)], **kwargs
+    )
+    monkeypatch.setattr(client.app.state, "replica_router", router)
+    return router
+
+
+def _add_user(engine, email, account_name):
+    db = sessionmaker(bind=engine)()
+    db.add(User(id=1, user_email=email, account_name=account_name, user_password="x"))
+    db.add(Question(id=1, content="q", category="AWS"))
+    db.add(Answer(id=1, question_id=1, content="a", is_correct=True))
+    db.commit()
+    db.close()
+
+
+def test_reads_use_the_replica_and_writers_are_pinned_to_the_primary(client, engine, replica_engine, monkeypatch):
+    _add_user(engine, "a@example.com", "on-primary")
+    _add_user(replica_engine, "a@example.com", "on-replica")
+    _install(monkeypatch, client, replica_engine, pin_seconds=60)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'a@example.com'})}"}
+
+    assert client.get("/api/v1/users/1").json()["account_name"] == "on-replica"
+    assert client.get("/api/v1/responses/dashboard", headers=headers).json()["overall"]["total_answered"] == 0
+
+    submitted = client.post("/api/v1/responses/submit", headers=headers,
+                            json={"question_id": 1, "selected_option_id": 1, "is_correct": True})
+    assert submitted.status_code == 200
+
+    # The writer reads their own answer from the primary; everyone else still gets the replica
+    assert client.get("/api/v1/responses/dashboard", headers=headers).json()["overall"]["total_answered"] == 1
+    assert client.get("/api/v1/users/1").json()["account_name"] == "on-replica"
+
+
+def test_unhealthy_replica_falls_back_to_the_primary(client, engine, tmp_path, monkeypatch):
+    _add_user(engine, "a@example.com", "on-primary")
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = _install(monkeypatch, client, broken)
+
+    assert client.get("/api/v1/users/1").json()["account_name"] == "on-primary"
+    status, = router.status()
+    assert status['healthy'] is False and "unable to open" in status['error']
+
+
+def test_pick_round_robins_over_healthy_replicas(replica_engine):
+    second = create_engine("sqlite://", poolclass=StaticPool)
+    router = replicas.ReplicaRouter([replicas.Replica("a", replica_engine), replicas.Replica("b", second)])
+
+    assert {router.pick().name for _ in range(4)} == {"a", "b"}
+    router.replicas[1].mark_unhealthy("down")
+    router.health_interval = 3600
+    assert {router.pick().name for _ in range(4)} == {"a"}
+    second.dispose()
+
+
+def test_each_app_builds_its_router_from_its_settings(tmp_path):
+    from app.main import create_app
+    from app.settings import Settings
+
+    settings = Settings(database_url="sqlite://", database_replica_urls=(f"sqlite:///{tmp_path / 'replica.db'}",),
+                        read_your_writes_seconds=30, replica_max_lag_seconds=2)
+    first, second = create_app(settings), create_app(Settings(database_url="sqlite://"))
+    router = first.state.replica_router
+    assert [replica.name for replica in router.replicas] == ["replica0"]
+    assert (router.pin_seconds, router.max_lag) == (30, 2)
+    assert second.state.replica_router.replicas == []
+    assert create_app(settings).state.replica_router is not router
+    router.dispose()
+
+
+def test_catalog_cache_misses_are_filled_from_the_primary(client, engine, replica_engine, monkeypatch):
+    from app.utils.payload_cache import catalog_cache
+
+    _add_user(engine, "a@example.com", "on-primary")
+    # A lagging replica that has not seen the question yet
+    _install(monkeypatch, client, replica_engine)
+    catalog_cache.invalidate()
+    try:
+        assert [q["id"] for q in client.get("/api/v1/questions/by-category/AWS").json()] == [1]
+        assert client.get("/api/v1/questions/categories").json() == [{"category": "AWS", "question_count": 1}]
+        assert client.get("/api/v1/questions/1/explanation").status_code == 200
+    finally:
+        catalog_cache.invalidate()
+
+
+def test_progress_set_masks_are_built_from_the_primary(client, engine, replica_engine, monkeypatch):
+    from app.services import mastery_service
+
+    _add_user(engine, "a@example.com", "on-primary")
+    _install(monkeypatch, client, replica_engine)
+    mastery_service.invalidate_set_masks()
+    mastery_service.cache.clear()
+    token = create_access_token({"sub": "a@example.com"})
+    try:
+        # The replica has not seen the question: masks built there would stay empty until the next catalog bump
+        progress = client.get("/api/v1/responses/progress", params={"category": "AWS"},
+                              headers={"Authorization": f"Bearer {token}"}).json()
+        assert progress == [{"question_set": "Default", "total_questions": 1, "answered": 0, "correct": 0}]
+    finally:
+        mastery_service.invalidate_set_masks()
+        mastery_service.cache.clear()
@@ -0,0 +1,71 @@
+"""
+Compacting old responses must not change any statistics the user sees.
+"""
+import gzip
+import json
+import random
+from datetime import datetime, timedelta
+from app.models import User, Question, Answer, Response, DailyUserCategoryStat
+from app.repository import response_repo
+from app.services import retention_service
+
+CUTOFF = datetime(2025, 3, 1)
+
+
+def _seed(db):
+    db.add(User(id=1, user_email="a@example.com", account_name="a", user_password="x"))
+    for i, category in enumerate(["AWS", "GCP", None], start=1):
+        db.add(Question(id=i, content=f"question {i}", category=category))
+        db.add(Answer(id=i, question_id=i, content="a", is_correct=True))
+    rnd = random.Random(3)
+    for k in range(120):
+        db.add(Response(user_id=1, question_id=rnd.randint(1, 3), selected_option_id=1,
+                        is_correct=rnd.random() < 0.6, answered_at=datetime(2025, 1, 1) + timedelta(hours=k * 17)))
+    db.commit()
+
+
+def _by_category(stats):
+    return sorted(stats, key=lambda s: str(s['category']))
+
+
+def test_compaction_keeps_statistics_and_dashboard_totals(db, tmp_path):
+    _seed(db)
+    statistics = response_repo.get_user_statistics(db, 1)
+    dashboard = response_repo.get_user_dashboard(db, 1)
+
+    stats = retention_service.compact_responses(db, cutoff=CUTOFF, batch_size=7, archive_dir=str(tmp_path))
+
+    remaining = db.query(Response).count()
+    assert stats.rows == 120 - remaining > 0
+    assert db.query(Response).filter(Response.answered_at < CUTOFF).count() == 0
+    assert {row.category for row in db.query(DailyUserCategoryStat)} == {"AWS", "GCP", ""}
+
+    assert _by_category(response_repo.get_user_statistics(db, 1)) == _by_category(statistics)
+    compacted = response_repo.get_user_dashboard(db, 1)
+    assert compacted['overall'] == dashboard['overall']
+    assert _by_category(compacted['by_category']) == _by_category(dashboard['by_category'])
+
+    archived = [
+        json.loads(line)
+        for path in stats.archived_files
+        for line in gzip.decompress(open(path, "rb").read()).splitlines()
+    ]
+    assert len(archived) == stats.rows
+    assert all(row['answered_at'] < CUTOFF.isoformat() for row in archived)
+
+
+def test_compaction_resumes_and_is_idempotent(db):
+    _seed(db)
+    statistics = response_repo.get_user_statistics(db, 1)
+
+    first = retention_service.compact_responses(db, cutoff=CUTOFF, batch_size=5, max_batches=2)
+    assert first.rows == 10
+    rest = retention_service.compact_responses(db, cutoff=CUTOFF, batch_size=5)
+    again = retention_service.compact_responses(db, cutoff=CUTOFF, batch_size=5)
+
+    assert rest.rows > 0 and again.rows == 0
+    assert _by_category(response_repo.get_user_statistics(db, 1)) == _by_category(statistics)
+
+
+def test_retention_cutoff_is_midnight():
+    assert retention_service.retention_cutoff(30, today=datetime(2025, 5, 31).date()) == datetime(2025, 5, 1)
@@ -0,0 +1,164 @@
+"""
+Quiz rooms: broadcast, live tallies, batched persistence and slow members.
+"""
+import asyncio
+import pytest
+from app.main import app
+from app.models import Answer, Question, Response, User, UserCategoryScore, UserMastery
+from app.services import leaderboard_service, mastery_service, room_service
+from app.utils.security import create_access_token
+from benchmarks.asgi_ws import AsgiWebSocket, WebSocketClosed
+
+
+def _token(email):
+    return create_access_token({'sub': email})
+
+
+def _seed(db):
+    leaderboard_service.leaderboards = leaderboard_service.Leaderboards()
+    mastery_service.cache.clear()
+    room_service.rooms.clear()
+    for user_id in (1, 2, 3):
+        db.add(User(id=user_id, user_email=f"u{user_id}@example.com", account_name=f"u{user_id}", user_password="x"))
+    for question_id in (1, 2):
+        db.add(Question(id=question_id, content=f"Q{question_id}", category="AWS", question_set="Live"))
+        db.add_all([
+            Answer(id=question_id * 10 + i, question_id=question_id, content=str(i), is_correct=i == 0,
+                   explanation="Because." if i == 0 else None)
+            for i in range(3)
+        ])
+    db.commit()
+
+
+def _connect(code, user_id, **kwargs):
+    return AsgiWebSocket(app, f"/api/v1/rooms/{code}/ws", f"token={_token(f'u{user_id}@example.com')}", **kwargs).connect()
+
+
+def test_room_round_trip(client, db):
+    _seed(db)
+    headers = {"Authorization": f"Bearer {_token('u1@example.com')}"}
+    created = client.post("/api/v1/rooms/", json={"category": "AWS", "question_set": "Live"}, headers=headers)
+    assert created.status_code == 201
+    code = created.json()["code"]
+    assert created.json()["total_questions"] == 2
+    room_service.rooms.get(code).tally_interval = 0
+
+    async def scenario():
+        host = await _connect(code, 1)
+        learners = [await _connect(code, user_id) for user_id in (2, 3)]
+        for ws in (host, *learners):
+            assert (await ws.receive_type("room"))["room"]["code"] == code
+
+        await learners[0].send_json({"type": "next"})
+        assert (await learners[0].receive_type("error"))["detail"] == "Only the host can do that"
+
+        await host.send_json({"type": "next"})
+        questions = [await ws.receive_type("question") for ws in (host, *learners)]
+        assert questions[0] == questions[1] == questions[2]
+        assert questions[0]["question"]["answers"] == [{"id": 10, "content": "0"}, {"id": 11, "content": "1"}, {"id": 12, "content": "2"}]
+
+        await learners[0].send_json({"type": "answer", "question_id": 1, "selected_option_id": 10})
+        await learners[1].send_json({"type": "answer", "question_id": 1, "selected_option_id": 11})
+        await learners[1].send_json({"type": "answer", "question_id": 1, "selected_option_id": 12})
+        await learners[1].send_json({"type": "answer", "question_id": 1, "selected_option_id": 20})
+        assert (await learners[1].receive_type("error"))["detail"] == "Answer option does not belong to the current question"
+
+        tally = await host.receive_type("tally")
+        while tally["answered"] < 2:
+            tally = await host.receive_type("tally")
+        assert tally["tallies"] == [{"option_id": 10, "count": 1}, {"option_id": 11, "count": 0}, {"option_id": 12, "count": 1}]
+
+        # Nothing reaches the database before the question closes
+        assert db.query(Response).count() == 0
+        await host.send_json({"type": "close"})
+        results = [await ws.receive_type("results") for ws in (host, *learners)]
+        assert results[0] == results[2]
+        assert results[0]["correct_option_ids"] == [10]
+        assert results[0]["explanations"] == [{"option_id": 10, "explanation": "Because."}]
+        assert results[0]["persisted"] is True
+
+        await learners[0].send_json({"type": "answer", "question_id": 1, "selected_option_id": 11})
+        assert (await learners[0].receive_type("error"))["detail"] == "No question is open"
+
+        await host.send_json({"type": "end"})
+        for ws in (host, *learners):
+            await ws.receive_type("ended")
+            with pytest.raises(WebSocketClosed):
+                await ws.receive_json()
+        assert room_service.rooms.get(code) is None
+
+    asyncio.run(scenario())
+
+    assert sorted((r.user_id, r.question_id, r.selected_option_id, r.is_correct) for r in db.query(Response)) == [
+        (2, 1, 10, True), (3, 1, 12, False)
+    ]
+    assert sorted((s.user_id, s.answered, s.correct) for s in db.query(UserCategoryScore)) == [(2, 1, 1), (3, 1, 0)]
+    assert db.query(UserMastery).count() == 2
+    assert mastery_service.cache.get(2).last_correct(1) is True
+    assert leaderboard_service.get_user_rank(2)["correct_rank"] == 1
+
+
+def test_room_requires_a_valid_token_and_room(client, db):
+    _seed(db)
+    room = room_service.rooms.create(1, "AWS", "Live", [])
+
+    async def scenario():
+        with pytest.raises(WebSocketClosed) as closed:
+            await AsgiWebSocket(app, f"/api/v1/rooms/{room.code}/ws", "token=nope").connect()
+        assert closed.value.code == room_service.CLOSE_POLICY
+        with pytest.raises(WebSocketClosed):
+            await _connect("ZZZZZZ", 1)
+
+    asyncio.run(scenario())
+    assert client.get(f"/api/v1/rooms/{room.code.lower()}").json()["code"] == room.code
+    assert client.get("/api/v1/rooms/ZZZZZZ").status_code == 404
+    assert client.post("/api/v1/rooms/", json={"category": "GCP"}, headers={
+        "Authorization": f"Bearer {_token('u1@example.com')}"
+    }).status_code == 404
+
+
+def test_slow_member_is_disconnected_and_tallies_coalesce():
+    async def scenario():
+        sent = []
+        blocked = asyncio.Event()
+
+        async def stuck(text):
+            await blocked.wait()
+
+        closed = []
+
+        async def close(code):
+            closed.append(code)
+
+        fast = room_service.Member(2, lambda text: _append(sent, text), close, queue_size=2)
+        slow = room_service.Member(3, stuck, close, queue_size=2)
+        room = room_service.Room("ABCDEF", 1, "AWS", "Live", [
+            {'id': q, 'content': "Q", 'image_url': None, 'category': "AWS",
+             'answers': [{'id': q * 10, 'content': "A", 'is_correct': True, 'explanation': None}]}
+            for q in range(1, 5)
+        ])
+        tasks = [asyncio.ensure_future(m.run_sender()) for m in (fast, slow)]
+        room.join(fast)
+        room.join(slow)
+        await asyncio.sleep(0)
+
+        for _ in range(3):
+            room._next()
+            room.current.open = False
+            await asyncio.sleep(0)
+        # The slow member holds its first message forever: two more fill its queue, the next one drops it
+        assert closed == [room_service.CLOSE_TRY_AGAIN]
+        assert set(room.members) == {2}
+        assert [m for m in sent if '"question"' in m] and len(sent) == 4
+
+        for n in range(5):
+            fast.send_tally(f"tally {n}")
+        await asyncio.sleep(0)
+        assert sent[-1] == "tally 4" and "tally 3" not in sent
+        for task in tasks:
+            task.cancel()
+
+    async def _append(sent, text):
+        sent.append(text)
+
+    asyncio.run(scenario())
@@ -0,0 +1,40 @@
+"""
+The trusted serialization path must produce the same JSON as validation.
+"""
+import json
+from typing import List
+import pytest
+from app.schemas.question import QuestionWithAnswers
+from app.utils import serialization
+
+QUESTIONS = [
+    {
+        'id': 1,
+        'content': "Which service stores secrets?",
+        'image_url': None,
+        'category': "AWS",
+        'answers': [
+            {'id': 1, 'content': "Secrets Manager", 'is_correct': True, 'explanation': "Rotates secrets."},
+            {'id': 2, 'content': "S3", 'is_correct': False, 'explanation': None},
+        ]
+    }
+]
+
+
+def test_trusted_and_validated_paths_agree():
+    validated = serialization.render(List[QuestionWithAnswers], QUESTIONS)
+    trusted = serialization.render(List[QuestionWithAnswers], QUESTIONS, trusted=True)
+    assert json.loads(validated) == json.loads(trusted)
+
+
+def test_fast_response_sends_rendered_bytes():
+    response = serialization.fast_response(List[QuestionWithAnswers], QUESTIONS)
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == QUESTIONS
+
+
+def test_verify_mode_rejects_payloads_that_drift_from_the_schema(monkeypatch):
+    monkeypatch.setattr(serialization, "VERIFY_TRUSTED_PAYLOADS", True)
+    drifted = [dict(QUESTIONS[0], internal_note="not in the schema")]
+    with pytest.raises(ValueError):
+        serialization.render(List[QuestionWithAnswers], drifted, trusted=True)
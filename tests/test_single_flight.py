@@ -0,0 +1,130 @@
+"""
+Single-flight coalescing of identical concurrent computations.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.utils.payload_cache import PayloadCache
+from app.utils.single_flight import SingleFlight
+
+
+def _run_concurrently(count, fn):
+    with ThreadPoolExecutor(count) as pool:
+        futures = [pool.submit(fn) for _ in range(count)]
+        return [f.exception() or f.result() for f in futures]
+
+
+def test_concurrent_threads_share_one_call():
+    flight = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return b"payload"
+
+    def request():
+        return flight.do("set-1", compute)
+
+    with ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(request) for _ in range(8)]
+        while flight.in_flight() == 0:
+            pass
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert results == [b"payload"] * 8
+    # Callers that arrived after the leader finished start their own flight
+    assert 1 <= len(calls) < 8
+    assert flight.in_flight() == 0
+
+
+def test_leader_error_reaches_followers():
+    flight = SingleFlight("test")
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute():
+        started.set()
+        release.wait(5)
+        raise LookupError("no such set")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flight.do, "k", compute)
+        started.wait(5)
+        follower = pool.submit(flight.do, "k", lambda: pytest.fail("follower ran its own call"))
+        time.sleep(0.05)  # let the follower join the leader's flight
+        release.set()
+        assert isinstance(leader.exception(), LookupError)
+        assert isinstance(follower.exception(), LookupError)
+
+
+def test_follower_gives_up_after_timeout():
+    flight = SingleFlight("test", timeout=0.05)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "leader"
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flight.do, "k", slow)
+        started.wait(5)
+        assert flight.do("k", lambda: "own") == "own"
+        release.set()
+        assert leader.result() == "leader"
+
+
+def test_async_tasks_share_one_call_and_errors():
+    flight = SingleFlight("test")
+
+    async def scenario():
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"questions": []}
+
+        results = await asyncio.gather(*(flight.do_async("set-1", compute) for _ in range(5)))
+        assert results == [{"questions": []}] * 5
+        assert len(calls) == 1
+
+        async def broken():
+            await asyncio.sleep(0.01)
+            raise LookupError("no such set")
+
+        outcomes = await asyncio.gather(*(flight.do_async("set-2", broken) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(o, LookupError) for o in outcomes)
+        assert flight.in_flight() == 0
+
+    asyncio.run(scenario())
+
+
+def test_payload_cache_builds_a_missing_payload_once():
+    cache = PayloadCache()
+    release = threading.Event()
+    calls = []
+
+    def producer():
+        calls.append(1)
+        release.wait(5)
+        return b"[]"
+
+    def request():
+        return cache.get_or_create(("by-set", "AWS", "Set 1"), producer)
+
+    with ThreadPoolExecutor(6) as pool:
+        futures = [pool.submit(request) for _ in range(6)]
+        while cache.flight.in_flight() == 0:
+            pass
+        release.set()
+        payloads = {id(f.result()) for f in futures}
+
+    assert len(calls) == 1
+    assert len(payloads) == 1
@@ -0,0 +1,54 @@
+"""
+Tests for the slow-query recorder and its admin endpoint.
+"""
+from app.api.dependencies import auth
+from app.db import slow_query_log
+from app.db.slow_query_log import redact_parameters
+from app.models import User, Question, Answer
+from app.utils.payload_cache import catalog_cache
+from app.utils.security import create_access_token
+
+
+def test_redaction_keeps_ids_and_safe_names_only():
+    assert redact_parameters({"user_id_1": 7, "category_1": "AWS", "user_email_1": "a@example.com"}) == {
+        "user_id_1": 7,
+        "category_1": "AWS",
+        "user_email_1": "<redacted str len=13>",
+    }
+    assert redact_parameters((3, "secret", None)) == [3, "<redacted str len=6>", None]
+    assert redact_parameters((3, "AWS"), ["user_id_1", "category_1"]) == {"user_id_1": 3, "category_1": "AWS"}
+
+
+def test_slow_statements_are_recorded_with_route_and_plan(client, db, monkeypatch):
+    recorder = slow_query_log.slow_query_log
+    recorder.clear()
+    catalog_cache.clear()
+    monkeypatch.setattr(auth, "ADMIN_EMAILS", {"admin@example.com"})
+
+    db.add_all([
+        User(id=1, user_email="admin@example.com", account_name="admin", user_password="x"),
+        User(id=2, user_email="user@example.com", account_name="user", user_password="x"),
+        Question(id=1, content="Q1", category="AWS"),
+        Answer(id=1, question_id=1, content="A", is_correct=True),
+    ])
+    db.commit()
+
+    # Record everything from here on
+    monkeypatch.setattr(slow_query_log, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    assert client.get("/api/v1/questions/by-category/AWS").status_code == 200
+    assert recorder.wait_idle()
+    # Keep the admin requests below from queueing more EXPLAINs on the shared test connection
+    monkeypatch.setattr(recorder, "explain", False)
+
+    user = {"Authorization": f"Bearer {create_access_token({'sub': 'user@example.com'})}"}
+    assert client.get("/api/v1/admin/slow-queries", headers=user).status_code == 403
+
+    admin = {"Authorization": f"Bearer {create_access_token({'sub': 'admin@example.com'})}"}
+    body = client.get("/api/v1/admin/slow-queries", params={"limit": 100}, headers=admin).json()
+    catalog = [e for e in body["entries"] if e["route"] == "/api/v1/questions/by-category/{category}"]
+    assert len(catalog) == 2
+    assert all(e["parameters"] == {"category_1": "AWS"} for e in catalog)
+    assert all(e["plan"] for e in catalog)
+
+    assert client.delete("/api/v1/admin/slow-queries", headers=admin).status_code == 204
+    assert recorder.entries() == []
@@ -0,0 +1,87 @@
+"""
+App factory, lazy engine creation and startup warmup.
+"""
+import os
+import subprocess
+import sys
+from typing import List
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app import startup
+from app.db import session
+from app.middleware.startup import FirstRequestMiddleware
+from app.models.questions import Question
+from app.schemas.question import CategoryOut
+from app.settings import Settings, get_settings
+from app.utils import serialization
+from app.utils.payload_cache import catalog_cache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_the_app_does_not_need_a_database():
+    env = {k: v for k, v in os.environ.items() if k != "DATABASE_URL"}
+    script = (
+        "import app.main\n"
+        "from app.db import session\n"
+        "assert session._engine is None\n"
+        "try:\n"
+        "    session.SessionLocal()\n"
+        "except RuntimeError as exc:\n"
+        "    assert 'DATABASE_URL' in str(exc)\n"
+        "else:\n"
+        "    raise AssertionError('no error without DATABASE_URL')\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_warm_up_primes_schemas_and_catalog(engine, db):
+    from app.main import app
+
+    db.add(Question(id=1, content="Q?", category="AWS", question_set="Set 1"))
+    db.commit()
+    catalog_cache.clear()
+    try:
+        startup.warm_up(app, engine, sessionmaker(bind=engine), connections=2)
+
+        assert catalog_cache.get(("categories",)) is not None
+        assert catalog_cache.get(("categories-with-sets",)) is not None
+        assert List[CategoryOut] in serialization._adapters
+        assert {"warmup", "warmup_mappers", "warmup_pool", "warmup_schemas", "warmup_catalog"} <= set(startup.timings())
+    finally:
+        catalog_cache.clear()
+
+
+def test_first_request_is_recorded_once():
+    app = FastAPI()
+    app.add_middleware(FirstRequestMiddleware)
+
+    @app.get("/")
+    def root():
+        return {}
+
+    client = TestClient(app)
+    client.get("/")
+    first = startup.timings()["first_request"]
+    client.get("/")
+    assert startup.timings()["first_request"] == first
+
+
+def test_create_app_uses_the_given_settings():
+    from app.main import create_app
+
+    app = create_app(Settings(database_url="sqlite://", cors_origins=("https://quiz.example",), warmup=False))
+    try:
+        client = TestClient(app)
+        allowed = client.options("/api/v1/health", headers={
+            "Origin": "https://quiz.example", "Access-Control-Request-Method": "GET"
+        })
+        denied = client.options("/api/v1/health", headers={
+            "Origin": "http://localhost:5173", "Access-Control-Request-Method": "GET"
+        })
+        assert allowed.headers.get("access-control-allow-origin") == "https://quiz.example"
+        assert "access-control-allow-origin" not in denied.headers
+    finally:
+        session.configure(get_settings())